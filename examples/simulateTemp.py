@@ -28,7 +28,7 @@ print("Temperature Dictionary")
 print(network.getNodeFeature('temperature'))
 
 #starts all nodes empty
-monte.emptyDictionary()
+monte.startEmpty()
 
 #Running simulation using temperature method
 for x in range(len(network)):
@@ -7,7 +7,6 @@ Provides key functions to setting up a game between senators.
 import csv
 import Cayley as cy
 import numpy as np
-import random
 import math
 import openpyxl
 import xlsxwriter
@@ -121,8 +120,8 @@ def payoff_matrix1(network,a,b,c,d,agent1,agent2):
     >>> cgt.payoff_matrix1(0.5,1.2,3.3,1.0,"Cruz","Sanders")
     """
     try:
-        a1 = float(network.getNodeFeature('ideology')[agent1])
-        a2 = float(network.getNodeFeature('ideology')[agent2])
+        a1 = float(network.getFeature('ideology')[agent1])
+        a2 = float(network.getFeature('ideology')[agent2])
         matrix1 = np.matrix([[a*abs(a1-a2),b*abs(a1-a2)],
                              [c*abs(a1-a2),d*abs(a1-a2)]],dtype = float)
         return matrix1
@@ -182,8 +181,8 @@ def payoff_matrix2(network,a,b,c,d,agent1,agent2):
     >>> cgt.payoff_matrix2(0.5,1.2,3.3,1.0,"Cruz","Sanders")
     """
     try:
-        a1 = float(network.getNodeFeature('ideology')[agent1])
-        a2 = float(network.getNodeFeature('ideology')[agent2])
+        a1 = float(network.getFeature('ideology')[agent1])
+        a2 = float(network.getFeature('ideology')[agent2])
         matrix2 = np.matrix([[d*abs(a1-a2),c*abs(a1-a2)],
                              [b*abs(a1-a2),a*abs(a1-a2)]],dtype = float)
         return matrix2
@@ -243,8 +242,8 @@ def payoff_matrix3(network,a,b,c,d,agent1,agent2):
     >>> cgt.payoff_matrix3(0.5,1.2,3.3,1.0,"Cruz","Sanders")
     """
     try:
-        a1 = float(network.getNodeFeature('ideology')[agent1])
-        a2 = float(network.getNodeFeature('ideology')[agent2])
+        a1 = float(network.getFeature('ideology')[agent1])
+        a2 = float(network.getFeature('ideology')[agent2])
         matrix3 = np.matrix([[d*abs(a1-a2),c*abs(a1-a2)],
                              [b*abs(a1-a2),a*abs(a1-a2)]],dtype = float)
         return matrix3
@@ -304,15 +303,15 @@ def payoff_matrix4(network,a,b,c,d,agent1,agent2):
     >>> cgt.payoff_matrix4(0.5,1.2,3.3,1.0,"Cruz","Sanders")
     """
     try:
-        a1 = float(network.getNodeFeature('ideology')[agent1])
-        a2 = float(network.getNodeFeature('ideology')[agent2])
+        a1 = float(network.getFeature('ideology')[agent1])
+        a2 = float(network.getFeature('ideology')[agent2])
         matrix4 = np.matrix([[a*abs(a1-a2),b*abs(a1-a2)],
                              [c*abs(a1-a2),d*abs(a1-a2)]],dtype = float)
         return matrix4
     except KeyError:
         return "Ideology feature not added to the entire network."
 
-def random_strat_start(network):
+def random_strat_start(network,rng = None):
     """
     Randomly chooses the strategy of the agent. A zero will represent no
     and a one will represent yes. Will add the strategy as a feature to
@@ -326,6 +325,8 @@ def random_strat_start(network):
     ----------
     network: Cayley network object
        A graph object (prefered) or lattice or cayley tree.
+    rng: numpy Generator or seed, optional
+       The source of the random numbers, see Cayley.networks.spawnSeeds.
 
     Examples
     --------
@@ -335,8 +336,9 @@ def random_strat_start(network):
     >>> senate(g)
     >>> cgt.randomStart(g)
     """
+    rng = np.random.default_rng(rng)
     for node in network:
-        network.add(node, strategy = random.randint(0,1))
+        network.add(node, strategy = int(rng.integers(2)))
 
 def game(network,payoff_matrix,agent1,agent2,strategy_d):
     """
@@ -399,7 +401,7 @@ def game(network,payoff_matrix,agent1,agent2,strategy_d):
     except KeyError:
         return "Strategy feature is not built into entire network"
 
-def random_agent(network,agent1):
+def random_agent(network,agent1,rng = None):
     """
     Chooses a random agent relative to another agent. Meaning, if one
     picks 'A' and wants another random agent to make a pair, 'A' will not
@@ -411,6 +413,8 @@ def random_agent(network,agent1):
        A graph object (prefered) or lattice or cayley tree.
     agent1: str
        Name of agent 1 as it appears in the network.
+    rng: numpy Generator or seed, optional
+       The source of the random numbers, see Cayley.networks.spawnSeeds.
 
     Returns
     -------
@@ -424,12 +428,14 @@ def random_agent(network,agent1):
     >>> cgt.senate(g)
     >>> cgt.random_agent(g,"Cruz")
     """
-    agent2 = random.choice(list(network))#chooses random senator
+    rng = np.random.default_rng(rng)
+    nodes = network.getNodes()
+    agent2 = nodes[rng.integers(len(nodes))]#chooses random senator
     if agent1 == agent2:
-        random_agent(network,agent1)
+        random_agent(network,agent1,rng)
     network.directedLink(agent1,agent2)
 
-def timestep(network,issue_rating,a,b,c,d,k):
+def timestep(network,issue_rating,a,b,c,d,k,rng = None):
     """
     Simulates a timestep of a game on an entire network. Currently it plays it
     goes through the network selects a random agent and plays a game between
@@ -454,6 +460,8 @@ def timestep(network,issue_rating,a,b,c,d,k):
     k: float
        A constant used in calculting the switching probabilty as discussed in
        the equation in J. Liu et al 2017 EPL119 68001.
+    rng: numpy Generator or seed, optional
+       The source of the random numbers, see Cayley.networks.spawnSeeds.
 
     Notes
     -----
@@ -470,10 +478,11 @@ def timestep(network,issue_rating,a,b,c,d,k):
     >>> cgt.randomStart(g)
     >>> cgt.timestep(g,0.4,1,5.23,100,0.3,20.2)
     """
-    strategy_d = network.getNodeFeature('strategy').copy()
-    ideology_d = network.getNodeFeature('ideology').copy()
+    rng = np.random.default_rng(rng)
+    strategy_d = network.getFeature('strategy').copy()
+    ideology_d = network.getFeature('ideology').copy()
     for node in network:
-        neighbors = network.getNodeFeature('neighbors')[node]
+        neighbors = network.getFeature('neighbors')[node]
         #print(neighbors)
         ideology_agent1 = float(ideology_d[node])
         agent1_strategy = strategy_d[node]
@@ -496,8 +505,8 @@ def timestep(network,issue_rating,a,b,c,d,k):
                     real_reward = real_payoff)
         #game(network,matrix,node,agent2,strategy_d)
         #using strat_d as arg ensures copy is used
-        imagined_d = network.getNodeFeature('imagined_reward').copy()
-        real_d = network.getNodeFeature('real_reward').copy()
+        imagined_d = network.getFeature('imagined_reward')
+        real_d = network.getFeature('real_reward')
         #print("senator: ",node)
         #print("Imagined: ",imagined_d[node])
         #print("Real: ",real_d[node])
@@ -505,9 +514,9 @@ def timestep(network,issue_rating,a,b,c,d,k):
             network.add(node,strategy = 1-strategy_d[node])
         else:
             switch_probability = math.e**(-1*(real_d[node]-imagined_d[node])/k)
-            if random.uniform(0,1) <= switch_probability:
+            if rng.random() <= switch_probability:
                 network.add(node,strategy = 1-strategy_d[node])
-    #print(network.getNodeFeature('strategy'))
+    #print(network.getFeature('strategy'))
 
 def data_export(name,network):
     """
@@ -527,9 +536,9 @@ def data_export(name,network):
     -> Best to export data to an excel sheet after running a timestep
     -> Inital strategies for agents are not exported to the spreadsheet.    
     """
-    strategy_d = network.getNodeFeature('strategy')
-    imagined_d = network.getNodeFeature('imagined_reward')
-    real_d = network.getNodeFeature('real_reward')
+    strategy_d = network.getFeature('strategy')
+    imagined_d = network.getFeature('imagined_reward')
+    real_d = network.getFeature('real_reward')
     try: #checks to see if excel sheet exists to add to existing simulation
         book = openpyxl.load_workbook(name+'.xlsx')
         sheet = book['Strategy']
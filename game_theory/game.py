@@ -13,6 +13,7 @@ Warnings
 from Cayley import Graph
 import Cayley.game_theory as cgt
 import csv
+import numpy as np
 
 issue_rating = 0.25
 a = 1
@@ -22,14 +23,15 @@ d = 1000
 k = 500
 timesteps = 2
 name_of_excel_sheet = '%da_%db_%dc_%dd' %(a,b,c,d)
+seed = None #set to an integer for a reproducible run
 
 
-def main():
+def main(rng = seed):
 
     # Issue occurs since the reps share the same last name
     # Entries in a python dictionary must be unique
     
-    import random
+    rng = np.random.default_rng(rng)
     with open("houseData.csv") as csvfile:
         readCSV = csv.reader(csvfile, delimiter=',')
         count = 0
@@ -38,7 +40,7 @@ def main():
             print(count);print(row[8])
             if row[8] in a:
                 print(row[8]," is a repeat")
-            a[row[8]] = random.randint(0,1)
+            a[row[8]] = int(rng.integers(2))
             count+=1
         print(len(a))
 ##    strategy_data_dump = list()
@@ -47,12 +49,12 @@ def main():
 ##    g = Graph()
 ##    cgt.make_senate(g)
 ####    g.completeGraph()
-##    for node in g: #adds one random agent
-##        cgt.random_agent(g,node)
-##    cgt.random_strat_start(g)
+##    for node in g.getNodes(): #adds one random agent
+##        cgt.random_agent(g,node,rng)
+##    cgt.random_strat_start(g,rng)
 ##    strategy_data_dump.append(g.getNodeFeature('strategy'))
 ##    for step in range(timesteps):
-##        cgt.timestep(g,issue_rating,a,b,c,d,k)
+##        cgt.timestep(g,issue_rating,a,b,c,d,k,rng)
 ##        strategy_data_dump.append(g.getNodeFeature('strategy'))
 ##        real_data_dump.append(g.getNodeFeature('real_reward'))
 ##        imagined_data_dump.append(g.getNodeFeature('imagined_reward'))
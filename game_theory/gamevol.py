@@ -10,7 +10,7 @@ import csv
 import Cayley as cy
 import Cayley.game_theory as cgt
 import Cayley.research as cr
-import xlsxwriter as xl
+import numpy as np
 import time
 a_list = cr.variable('a_list',list,float)
 b_list = cr.variable('b_list',list,float)
@@ -19,19 +19,21 @@ d_list = cr.variable('d_list',list,float)
 issue_list = cr.variable('issue_list',list,float)
 timesteps = cr.variable('timesteps',int)
 
-def simulate(ac,bc,cc,dc,kc,issue_rating,trials):
-    """The big one"""
+def simulate(ac,bc,cc,dc,kc,issue_rating,trials,excel = False,rng = None):
+    """The big one. Saves the averages as a Results directory, and with
+    excel writes the workbook from it as well. Every random choice is drawn
+    from rng, a numpy Generator or a seed, so seeded runs are
+    reproducible."""
     run_time = time.time()
-    endcol = xl.utility.xl_col_to_name(timesteps+1)
+    rng = np.random.default_rng(rng)
     name = '%.2fa_%.2fb_%.2fc_%.2fd_%.2fIV' %(ac,bc,cc,dc,issue_rating)
     graph = cgt.Senate('blank',1)
     vote_d = dict()
     real_d = dict()
     imag_d = dict()
-    workbook = xl.Workbook(name+'.xlsx')
-    overtime = workbook.add_worksheet("Over_Time")
-    realsheet = workbook.add_worksheet("Real_Reward")
-    imagesheet = workbook.add_worksheet("Imagined_Reward")
+    overtime = cy.Sheet("Over_Time")
+    realsheet = cy.Sheet("Real_Reward")
+    imagesheet = cy.Sheet("Imagined_Reward")
     for agent in graph:
         vote_d[agent] = [0]*(timesteps+1)
         real_d[agent] = [0]*(timesteps+1)
@@ -46,14 +48,14 @@ def simulate(ac,bc,cc,dc,kc,issue_rating,trials):
         real_data_dump = list()
         imagined_data_dump = list()
         for node in graph:
-            cgt.random_agent(graph, node)
-        cgt.random_strat_start(graph)
-        strategy_data_dump.append(graph.getNodeFeature('strategy'))
+            cgt.random_agent(graph, node, rng)
+        cgt.random_strat_start(graph, rng)
+        strategy_data_dump.append(graph.getFeature('strategy').copy())
         for t in range(timesteps):
-            cgt.timestep(graph,issue_rating,ac,bc,cc,dc,kc)
-            strategy_data_dump.append(graph.getNodeFeature('strategy'))
-            real_data_dump.append(graph.getNodeFeature('real_reward'))
-            imagined_data_dump.append(graph.getNodeFeature('imagined_reward'))
+            cgt.timestep(graph,issue_rating,ac,bc,cc,dc,kc,rng)
+            strategy_data_dump.append(graph.getFeature('strategy').copy())
+            real_data_dump.append(graph.getFeature('real_reward').copy())
+            imagined_data_dump.append(graph.getFeature('imagined_reward').copy())
 
 ##        print(graph)
 
@@ -75,47 +77,41 @@ def simulate(ac,bc,cc,dc,kc,issue_rating,trials):
             except NameError: pass
 
     graph = cgt.Senate('blank',1)
-    rank_d = graph.getNodeFeature('rank')
-
-    for agent in graph:
-        overtime.write(rank_d[agent]+4,0,agent)
-        realsheet.write(rank_d[agent],0,agent)
-        imagesheet.write(rank_d[agent],0,agent)
-        for t in range(timesteps+1):
-            vote_d[agent][t] = vote_d[agent][t]/trials
-            real_d[agent][t] = real_d[agent][t]/trials
-            imag_d[agent][t] = imag_d[agent][t]/trials
-            overtime.write(rank_d[agent]+4,t+1,vote_d[agent][t])
-            realsheet.write(rank_d[agent],t+1,real_d[agent][t])
-            imagesheet.write(rank_d[agent],t+1,imag_d[agent][t])
+    rank_d = graph.getFeature('rank')
+    agents = list(graph)
+    rows = [rank_d[agent] for agent in agents]
+    arrays = {'votes': [vote_d[agent] for agent in agents],
+              'real_reward': [real_d[agent] for agent in agents],
+              'imagined_reward': [imag_d[agent] for agent in agents]}
+    for key in arrays:
+        arrays[key] = np.array(arrays[key])/trials
+    arrays['total_votes'] = arrays['votes'].sum(axis = 0)
+
+    overtime.table(0,0,[agents],transpose = True,
+                   rows = [row+4 for row in rows])
+    overtime.table(0,1,'votes',rows = [row+4 for row in rows])
+    for sheet,key in ((realsheet,'real_reward'),(imagesheet,'imagined_reward')):
+        sheet.table(0,0,[agents],transpose = True,rows = rows)
+        sheet.table(0,1,key,rows = rows)
+        sheet.write(0,0,"Timestep")
+        sheet.row(0,1,list(range(timesteps+1)))
     overtime.write(0,0,"Timestep")
     overtime.write(1,0,"Average votes")
-    realsheet.write(0,0,"Timestep")
-    imagesheet.write(0,0,"Timestep")
-    for t in range(timesteps+1):
-        t_sum = 0
-        for agent in graph:
-            t_sum += vote_d[agent][t]
-        overtime.write(0,t+1,t)
-        overtime.write(1,t+1,t_sum)
-        realsheet.write(0,t+1,t)
-        imagesheet.write(0,t+1,t)
-
-    over_chart = workbook.add_chart({'type':'line'})
-    overtime.insert_chart('I8',over_chart)
-    over_chart.set_title({'name':'Does It Pass?'})
-    over_chart.set_x_axis({'name':'Timesteps'})
-    over_chart.set_y_axis({'name':'Votes'})
-    over_chart.add_series({'values':('=Over_Time!$B$2:$'+endcol+'$2'),
-                           'name':'=Over_Time!$A$2'})
-    over_chart.add_series({'values':('=Over_Time!$B$3:$'+endcol+'$3'),
-                           'name':'=Over_Time!$A$3'})
-    over_chart.add_series({'values':('=Over_Time!$B$4:$'+endcol+'$4'),
-                           'name':'=Over_Time!$A$4'})
-
-
-
-    workbook.close()
+    overtime.row(0,1,list(range(timesteps+1)))
+    overtime.row(1,1,'total_votes')
+
+    overtime.chart('I8','Does It Pass?','Timesteps','Votes',
+                   [{'values': overtime.reference(row,1,timesteps+1),
+                     'name': '=Over_Time!$A$%d' % (row+1)}
+                    for row in (1,2,3)])
+
+    params = {'a': ac, 'b': bc, 'c': cc, 'd': dc, 'k': kc,
+              'issue_rating': issue_rating, 'trials': trials,
+              'timesteps': timesteps}
+    results = cy.Results.save(name, arrays, params,
+                              [overtime, realsheet, imagesheet])
+    if excel:
+        results.toExcel(name+'.xlsx')
 
     print(str(time.time()-run_time) + " secs")
 
@@ -138,10 +134,11 @@ def main():
 ##        print(len(sets))
         trials = int(input("Number of trials: "))
         kc = float(input("K value: "))
+        excel = input("Also write the Excel workbooks? [Y/N] ").upper() == 'Y'
         start_time = time.time()
         for i in sets:
             for j in issue_list:
-                simulate(i[0],i[1],i[2],i[3],kc,j,trials)
+                simulate(i[0],i[1],i[2],i[3],kc,j,trials,excel)
         print("\nTOTAL TIME: "+str(time.time()-start_time)+" secs")
 
 if __name__ == '__main__':
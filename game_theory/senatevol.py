@@ -9,7 +9,6 @@ A file to run a large number of Senate network simulations.
 import Cayley as cy
 import Cayley.game_theory as cg
 import Cayley.research as cr
-import xlsxwriter as xl
 import time
 from math import sqrt
 timesteps = cr.variable('timesteps', int)
@@ -17,12 +16,13 @@ senate_corr = cr.variable('senate_corr',list,str)
 radius_of_connection = cr.variable('radius_of_connection', float)
 import csv
 
-def simulate(model, const, a_const, radius, issue, trials):
+def simulate(model, const, a_const, radius, issue, trials, excel = False):
+    """Saves the run as a Results directory, and with excel writes the
+    workbook from it as well."""
     network = cg.Senate(model, const, radius)
     polarity = issue-0.5
     senate = cy.MonteCarlo(network, 1/(a_const*abs(polarity)), 0, 1/(a_const*abs(polarity)))
     run_time = time.time()
-    endcol = xl.utility.xl_col_to_name(timesteps+1)
 
 
     bp_tag = "%.1d" %const
@@ -40,9 +40,9 @@ def simulate(model, const, a_const, radius, issue, trials):
 
     print("\n#### RUNNING SIMULATION %s ####\n"%(name))
 
-    workbook = xl.Workbook(name+'.xlsx')
-    overtime = workbook.add_worksheet("Over_Time")
-##    overall = workbook.add_worksheet("Overall")
+    arrays = dict() # saved as .npy files, see cy.Results
+    overtime = cy.Sheet("Over_Time")
+    sheets = [overtime]
 
     density_list = dict() #[trial][timestep] stores overall densities
     state_collect = dict() #[trial] stores final state dictionaries
@@ -61,7 +61,7 @@ def simulate(model, const, a_const, radius, issue, trials):
         state_collect[i] = senate.simData(senate.getTimesteps()-1)
 
         node_d[i] = list() ### NOT GONNA BE PRETTY ... ###
-        rank_d = network.getNodeFeature('rank')
+        rank_d = network.getFeature('rank')
         for n in range(len(senate_corr)):
             node_d[i].append({})
             for f in senate_corr[n]:
@@ -81,16 +81,17 @@ def simulate(model, const, a_const, radius, issue, trials):
             density_list[i][y] = dens_t
 
         if trials <= 10: # Trial-by-trial is best for small sets
-            worksheet = workbook.add_worksheet("Data trial %d" % (i+1))
+            arrays['history_%d' % (i+1)] = senate.history()
+            worksheet = cy.Sheet("Data trial %d" % (i+1))
             worksheet.write(0,0,"Timestep")
-            rank_d = network.getNodeFeature('rank')
-            for x in network:
-                worksheet.write(int(rank_d[x])+1,0,"Node "+str(network.keys[x]))
-            for y in range(senate.getTimesteps()):
-                worksheet.write(0,y+1,str(y))
-            for y in range(senate.getTimesteps()):
-                for x in network:
-                    worksheet.write(int(rank_d[x]),y+1,senate.simData(y)[x])
+            rank_d = network.getFeature('rank')
+            rows = [int(rank_d[x]) for x in network.getNodes()]
+            worksheet.table(0,0,[["Node "+str(x) for x in network.getNodes()]],
+                            transpose = True,rows = [r+1 for r in rows])
+            worksheet.row(0,1,[str(y) for y in range(senate.getTimesteps())])
+            worksheet.table(0,1,'history_%d' % (i+1),transpose = True,
+                            rows = rows)
+            sheets.append(worksheet)
 
         if (trials >= 100) and ((10*i)%trials == 0):
             try:
@@ -118,53 +119,47 @@ def simulate(model, const, a_const, radius, issue, trials):
 
     for n in range(len(senate_corr)): # For recording correlations
         sheetname = ("%s+%s" %(senate_corr[n][0],senate_corr[n][1]))
-        chartrange = '='+sheetname+'!$B$2:$'+endcol+'$2'
-        timerange = '='+sheetname+'!$B$2:$'+endcol+'$2'
-        corr_sheet = workbook.add_worksheet(sheetname)
+        arrays['correlation_%d' % n] = corr_t[n]
+        corr_sheet = cy.Sheet(sheetname)
         corr_sheet.write(0,0,"Timestep")
         corr_sheet.write(1,0,"Correlation")
-        corr_chart = workbook.add_chart({'type':'line'})
-        corr_sheet.insert_chart('I8', corr_chart)
-        corr_chart.set_title({'name':'Correlation'})
-        corr_chart.set_x_axis({'name':'Timesteps'})
-        corr_chart.set_y_axis({'name':'Correlation'})
-        corr_chart.add_series({'values':chartrange,
-                               'name':'Correlation'})
-        for t in range(timesteps+1):
-            corr_sheet.write(0,t+1,t)
-            corr_sheet.write(1,t+1,corr_t[n][t])
+        corr_sheet.chart('I8','Correlation','Timesteps','Correlation',
+                         [{'values': corr_sheet.reference(1,1,timesteps+1),
+                           'name': 'Correlation'}])
+        corr_sheet.row(0,1,list(range(timesteps+1)))
+        corr_sheet.row(1,1,'correlation_%d' % n)
+        sheets.append(corr_sheet)
 
     # Average density over time
     overtime.write(0,0,"Timestep")
     overtime.write(1,0,name)
-    chartrange = '=Over_Time!$B$2:$'+endcol+'$2'
-    over_chart = workbook.add_chart({'type':'line'})
-    overtime.insert_chart('I8',over_chart)
-    over_chart.set_title({'name':'Density'})
-    over_chart.set_x_axis({'name':'Timesteps'})
-    over_chart.set_y_axis({'name':'Density'})
-    over_chart.add_series({'values':('=Over_Time!$B$2:$'+endcol+'$2'),
-                           'name':'=Over_Time!$A$2'})
-    over_chart.add_series({'values':('=Over_Time!$B$3:$'+endcol+'$3'),
-                           'name':'=Over_Time!$A$3'})
-    over_chart.add_series({'values':('=Over_Time!$B$4:$'+endcol+'$4'),
-                           'name':'=Over_Time!$A$4'})
+    overtime.chart('I8','Density','Timesteps','Density',
+                   [{'values': overtime.reference(row,1,timesteps+1),
+                     'name': '=Over_Time!$A$%d' % (row+1)}
+                    for row in (1,2,3)])
     if trials <= 10:
-        for t in range(trials):
-            overtime.write(t+3,0,"Trial "+str(t+1))
-            for m in range(timesteps+1):
-                overtime.write(t+3,m+1,density_list[t][m])
+        arrays['density_trials'] = [density_list[t][:timesteps+1]
+                                    for t in range(trials)]
+        overtime.column(3,0,["Trial "+str(t+1) for t in range(trials)])
+        overtime.table(3,1,'density_trials')
     else:
         overtime.write(6,0,"Trials: "+str(trials))
+    averages = list()
     for m in range(timesteps+1):
         t_sum = 0
-        overtime.write(0,m+1,m)
         for t in range(trials):
             t_sum += density_list[t][m]
-        t_av = t_sum/trials
-        overtime.write(1,m+1,t_av)
+        averages.append(t_sum/trials)
+    arrays['density'] = averages
+    overtime.row(0,1,list(range(timesteps+1)))
+    overtime.row(1,1,'density')
 
-    workbook.close()
+    params = {'model': model, 'const': const, 'a_const': a_const,
+              'radius': radius, 'issue': issue, 'trials': trials,
+              'timesteps': timesteps, 'senate_corr': senate_corr}
+    results = cy.Results.save(name, arrays, params, sheets)
+    if excel:
+        results.toExcel(name+'.xlsx')
 
 
 
@@ -178,8 +173,9 @@ def main():
         radius = radius_of_connection
     else: radius = 0
     issue = float(input("What is the issue rating? "))
+    excel = input("Also write the Excel workbook? [Y/N] ").upper() == 'Y'
     start_time = time.time()
-    simulate(model, const, a_const, radius, issue, trials)
+    simulate(model, const, a_const, radius, issue, trials, excel)
     print("--- %s seconds ---" % (time.time() - start_time))
 
 if __name__ == '__main__':
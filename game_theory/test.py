@@ -1,6 +1,7 @@
 import Cayley as cy
 import Cayley.game_theory as cgt
 import csv
+import numpy as np
 
 issue_rating = 0.25
 a = 1
@@ -10,6 +11,8 @@ d = 1000
 k = 500
 timesteps = 2
 name_of_excel_sheet = '%da_%db_%dc_%dd' %(a,b,c,d)
+seed = None #set to an integer for a reproducible run
+rng = np.random.default_rng(seed)
 
 strategy_data_dump = list()
 real_data_dump = list()
@@ -21,11 +24,11 @@ cgt.make_senate(g,'houseData.csv')
 
 
 for rep in g:
-    cgt.random_agent(g,rep)
-cgt.random_strat_start(g)
+    cgt.random_agent(g,rep,rng)
+cgt.random_strat_start(g,rng)
 strategy_data_dump.append(g.getNodeFeature('strategy'))
 for step in range(timesteps):
-    cgt.timestep(g,issue_rating,a,b,c,d,k)
+    cgt.timestep(g,issue_rating,a,b,c,d,k,rng)
     strategy_data_dump.append(g.getNodeFeature('strategy'))
     real_data_dump.append(g.getNodeFeature('real_reward'))
     imagined_data_dump.append(g.getNodeFeature('imagined_reward'))
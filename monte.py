@@ -1,10 +1,11 @@
 #comment
-import random
+import numpy as np
 
 class MonteCarlo(object):
 
-    def __init__(self,network):
+    def __init__(self,network,rng = None):
         self.network = network
+        self.rng = np.random.default_rng(rng) # numpy Generator or seed for every random draw
         self.data = list() # list of dictionaries <node, int state> to hold simulation data of each timestep
 
     def getTimesteps(self):
@@ -22,7 +23,7 @@ class MonteCarlo(object):
         """
         if len(self.data) == 0:
             self.network.setFeature("state",{node:0 for node in self.network})
-            self.data.append(self.network.getFeature("state"))
+            self.data.append(self.network.getFeature("state").copy())
             
     def startFull(self):
         """
@@ -31,7 +32,7 @@ class MonteCarlo(object):
         """
         if len(self.data) == 0:
             self.network.setFeature("state",{node:1 for node in self.network})
-            self.data.append(self.network.getFeature("state"))
+            self.data.append(self.network.getFeature("state").copy())
                 
     def startRandom(self,concentration):
         """
@@ -41,8 +42,8 @@ class MonteCarlo(object):
         put in.
         """
         if len(self.data) == 0:
-            self.network.setFeature("state",{node: 1 if random.uniform(0,1) < concentration else 0 for node in self.network})
-            self.data.append(self.network.getFeature("state"))
+            self.network.setFeature("state",{node: 1 if self.rng.random() < concentration else 0 for node in self.network})
+            self.data.append(self.network.getFeature("state").copy())
 
     #### State Counter Methods ####
                              
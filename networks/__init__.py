@@ -1,10 +1,19 @@
-__all__ = ['AbstractNetwork','CayleyTree','Graph','Lattice','MonteCarlo']
+__all__ = ['AbstractNetwork','CayleyTree','Graph','ImplicitLattice','Lattice',
+           'MonteCarlo','MasterEquation','Observer','Density','GenerationalDensity',
+           'PairCorrelation','Results','Sheet','writeExcel','spawnSeeds',
+           'spawnGenerators']
 
 from .abstractnetwork import AbstractNetwork
 from .cayleytree import CayleyTree
 from .graph import Graph
+from .implicitlattice import ImplicitLattice
 from .lattice import Lattice
 from .montecarlo import MonteCarlo
+from .masterequation import MasterEquation
+from .observers import Observer, Density, GenerationalDensity, \
+     PairCorrelation
+from .results import Results, Sheet, writeExcel
+from .rng import spawnSeeds, spawnGenerators
 
 
 
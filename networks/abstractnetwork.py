@@ -13,6 +13,34 @@ __author__ = "\n".join(['Justin Pusztay (pusztayj20@mail.wlu.edu)'])
 __all__ = ['AbstractNetwork']
 
 import numpy as np
+try:
+    import scipy.sparse as sparse
+except ImportError: #scipy is only needed for sparse matrices
+    sparse = None
+from .features import FeatureColumn, FeatureView, GraphView
+
+class _LazyNeighbors(dict):
+    """
+    Dictionary of neighbor sets that builds the set of a node from CSR
+    arrays the first time it is looked up. Used after links are added in
+    bulk, so millions of sets are only made if they are needed.
+    """
+
+    def __init__(self,network,indptr,indices):
+        """Creates the dictionary with no sets built yet."""
+        dict.__init__(self)
+        self._network = network
+        self._indptr = indptr
+        self._indices = indices
+
+    def __missing__(self,node):
+        """Builds, stores and returns the neighbor set of the node."""
+        i = self._network._index[node]
+        row = self._indices[self._indptr[i]:self._indptr[i+1]].tolist()
+        nodes = self._network.nodes
+        neighbors = {nodes[j] for j in row}
+        self[node] = neighbors
+        return neighbors
 
 class AbstractNetwork(object):
     """
@@ -40,7 +68,28 @@ class AbstractNetwork(object):
     The only built in feature for all networks is the 'neighbors' feature,
     since links are a fundamental part of graphs. 
 
-    The network is represented as a dictionary of dictionary implemenation.
+    The features are stored in columns, one numpy array per feature name
+    with an entry for every node, in the order of the node list. getFeature
+    returns a FeatureView of a column rather than a new dictionary, and
+    setFeature accepts an array in node order. network[node] and the graph
+    attribute still give the dictionary of dictionary interface, with the
+    neighbor sets under 'neighbors'.
+
+    *Compressed Sparse Row*
+
+    Alongside the neighbor sets, the links can be compiled into compressed
+    sparse row (CSR) arrays with toCSR. The arrays are cached and rebuilt
+    lazily whenever _structCount shows the structure of the network changed.
+    Calling freeze builds the arrays and locks the structure, so simulations
+    can rely on them and compute neighbor sums as array gathers with
+    neighborSums.
+
+    *Bulk Construction*
+
+    fromEdgeArray builds a whole network from arrays of node positions and
+    addEdgesBulk adds many links at once. Both sort and deduplicate the
+    links with numpy into the CSR arrays, and the neighbor sets are only
+    built when a node's neighbors are looked up.
 
     *Subclasses*
 
@@ -53,8 +102,83 @@ class AbstractNetwork(object):
         Initializes an empty network. 
         """
         self.nodes = list()
-        self.graph = dict()
-        self._modCount = 0
+        self.graph = GraphView(self)
+        self._index = dict()
+        self._neighbors = dict()
+        self._incoming = dict()
+        self._columns = dict()
+        self._capacity = 0
+        self._modCount = 0 #changes to the node list, see __iter__
+        self._structCount = 0 #changes to nodes or links, see toCSR
+        self._frozen = False
+        self._csr = None
+        self._csrStructCount = -1
+        self._edges = None
+        self._edgesStructCount = -1
+
+    @classmethod
+    def fromEdgeArray(cls,src,dst,n_nodes = None,names = None):
+        """
+        Builds a network from two arrays of node positions, with an
+        undirected link between src[i] and dst[i] for every i.
+
+        Parameters
+        ----------
+        src: array_like of int
+           Positions of the nodes at one end of the links
+        dst: array_like of int
+           Positions of the nodes at the other end of the links
+        n_nodes: int, optional
+           Number of nodes, by default one more than the largest position
+           or the number of names.
+        names: iterable of hashable objects, optional
+           The nodes, in position order. By default the nodes are the
+           integers 0 to n_nodes-1.
+
+        Returns
+        -------
+        A network of the class the method is called on, such as Graph.
+
+        Raises
+        ------
+        ValueError: If src and dst differ in length, the names do not match
+        n_nodes or are repeated.
+        IndexError: If a position is not a node of the network.
+
+        Notes
+        -----
+        -> Repeated links are only added once.
+        -> The subclass __init__ is not called, so this is meant for Graph
+           like networks whose structure comes only from the links.
+
+        The runtime is $O(n + m log(m))$ for $m$ links.
+        """
+        src = np.asarray(src,dtype = np.intp).reshape(-1)
+        dst = np.asarray(dst,dtype = np.intp).reshape(-1)
+        if len(src) != len(dst):
+            raise ValueError("src and dst must have the same length")
+        if names is not None:
+            names = list(names)
+        if n_nodes is None:
+            if names is not None:
+                n_nodes = len(names)
+            else:
+                n_nodes = int(max(src.max(),dst.max())) + 1 if len(src) else 0
+        nodes = list(range(n_nodes)) if names is None else names
+        if len(nodes) != n_nodes:
+            raise ValueError("There must be one name for every node")
+        network = cls.__new__(cls)
+        AbstractNetwork.__init__(network)
+        network.keys = list(nodes)
+        network.nodes = nodes
+        network._index = dict(zip(nodes,range(n_nodes)))
+        if len(network._index) != n_nodes:
+            raise ValueError("Node names must be unique")
+        network._reserve(n_nodes)
+        network._incStructCount()
+        network._setCSR(*AbstractNetwork._compileLinks(
+            np.concatenate((src,dst)),np.concatenate((dst,src)),n_nodes))
+        return network
 
     def __iter__(self):
         """
@@ -86,13 +210,14 @@ class AbstractNetwork(object):
         being used.
         """
         try:
-            return node in self.graph
+            return node in self._index
         except TypeError:
             return False
 
     def __getitem__(self,node):
         """
-        Returns a dictionary with all the node features for the node.
+        Returns a dictionary with all the node features for the node. It is
+        a NodeView, so setting a key sets the feature.
 
         Use network[node].
 
@@ -106,7 +231,7 @@ class AbstractNetwork(object):
 
     def degree(self,node):
         """Returns the degree of a node."""
-        return len(self.graph[node]["neighbors"])
+        return len(self._neighbors[node])
 
     def add(self,node,**kwargs):
         """
@@ -120,26 +245,42 @@ class AbstractNetwork(object):
         kwargs: keyword arguments, optional
            Can set features for a node by using key=value.
 
-        The runtime is $O(k)$ when adding a new node. However, it can degrade
-        to $O(n)$ when updating features or adding new features to an existing
-        node.
+        The runtime is $O(k)$ for k features. The feature columns double in
+        size when they are full, so adding a new node is amortized $O(1)$
+        per column.
 
         This also adds a new node to the node list.
         """
-        if node not in self.graph: #handles adding a new node with new features
-            self.graph[node] = dict()
+        if node not in self._index: #handles adding a new node
+            self._incStructCount()
             self.keys.append(node)
-            self.graph[node] = kwargs
-            self.graph[node]["neighbors"] = set()
+            self._index[node] = len(self.nodes)
             self.nodes.append(node)
-        else: #if node is already in graph, handles updating features.
-            for key in kwargs.items():
-                try:
-                    if key[1] != self.graph[node][key[0]]: #handles update
-                        self.graph[node][key[0]] = key[1]
-                except KeyError:
-                    self.graph[node][key[0]] = key[1] #handles new feature to
-                                                      #node that exits.
+            self._neighbors[node] = set()
+            self._reserve(len(self.nodes))
+        for name,value in kwargs.items(): #sets new and existing features
+            self._setValue(node,name,value)
+
+    def _reserve(self,size):
+        """Makes room for size nodes in every feature column."""
+        if size > self._capacity:
+            self._capacity = max(size,2*self._capacity,8)
+            for column in self._columns.values():
+                column.resize(self._capacity)
+
+    def _setValue(self,node,name,value):
+        """Stores one feature of an existing node in its column, creating
+        the column the first time the feature is used."""
+        if name == "neighbors":
+            self._incStructCount()
+            self._neighbors[node] = value
+            return
+        column = self._columns.get(name)
+        if column is None:
+            column = FeatureColumn(self._capacity,FeatureColumn.dtypeOf(value))
+            self._columns[name] = column
+        column.set(self._index[node],value)
+
     def addMultipleNodes(self,nodes,**kwargs):
         """
         Adds multiple nodes to a network.
@@ -170,12 +311,15 @@ class AbstractNetwork(object):
 
     def setFeature(self,name,data): 
         """
-        Does a one-to-one mapping of data. The data variable must be a
+        Does a one-to-one mapping of data. The data variable can be a
         dictionary where the node name is the key and the data desired to be
         set as the feature called 'name' should be the value. This allows
         a plethora of data to be applied to each node. This mapping can also
         allow for all the data to the nodes to be unique.
 
+        The data can also be an array with one entry per node, in the order
+        of the node list, which is copied into the column at once.
+
         The runtime of this algorithm is $O(n)$ in all cases, since only
         one feature is added.
 
@@ -183,19 +327,28 @@ class AbstractNetwork(object):
         ----------
         name: str
            The name of the feature added
-        data: dict
+        data: dict or array_like
            The data is held under a key/value pair in a dictionary. The key must
            be the name of the node and the value is the feature data.
 
         Notes
         -----
-        -> If the data is not in a dictionary format, it will not work.
+        -> Nodes in the dictionary that are not in the network are added.
+        -> An array must have exactly one entry per node.
         """
-        try:
-            for node,datum in zip(self,data.items()): #loops through node and data
-                self.add(node,state = datum[1])
-        except AttributeError:
-            return "Dictionary must be used"
+        if hasattr(data,"items"):
+            for node,datum in data.items(): #loops through node and data
+                self.add(node)
+                self._setValue(node,name,datum)
+            return
+        data = np.asarray(data)
+        if data.shape != (len(self.nodes),) or name == "neighbors":
+            return "Dictionary or array with one entry per node must be used"
+        column = self._columns.get(name)
+        if column is None:
+            column = FeatureColumn(self._capacity,data.dtype)
+            self._columns[name] = column
+        column.fill(data,len(self.nodes))
                 
 
     def getFeature(self,name):
@@ -212,29 +365,59 @@ class AbstractNetwork(object):
 
         Notes
         -----
-        -> The funciton uses a dictionary comprehension
-        -> Will not return a dictionary with all nodes if the a node does
-           not have that specific feature. 
+        -> The dictionary is a FeatureView of the column, so nothing is
+           copied and the runtime is $O(1)$. It shows later changes to the
+           feature, use its copy method to keep a snapshot.
+        -> FeatureView.array gives the column as a numpy array in the order
+           of the node list.
+        -> Will not contain all nodes if a node does not have that specific
+           feature.
+        -> 'neighbors' gives the dictionary of neighbor sets.
         """
-        return {n: self.graph[n][name] for n in self if name in self.graph[n]}
+        if name == "neighbors":
+            self._materialize()
+            return self._neighbors
+        if name not in self._columns:
+            return dict()
+        return FeatureView(self,name)
 
     def remove(self,node):
-        """Removes the nodes from the network.
-        Curently it does not remove links that are in the neighbors feature.
+        """Removes the node, and every link to or from it, from the network.
 
         Parameters
         ----------
         node: hashable object
            Any hashable object in the network.
 
-        The runtime is $O(n)$.  
+        Notes
+        -----
+        -> Only the neighbors of the node, and the nodes with a directed link
+           to it, are visited. Links added by editing a neighbor set
+           directly are not known and are not removed from other nodes.
+        -> The last node of the node list takes the position of the removed
+           node, so the order of the node list changes.
+        -> Removing from a network built with fromEdgeArray or addEdgesBulk
+           first builds all of its neighbor sets, once.
+
+        The runtime is $O(k)$ for a node with $k$ links.
         """
-        for x in self:
-            neigbhors = self.getNeighbors(x) #gets neighbors for node
-            if node in neigbhors: #checks for connection
-                (neigbhors).remove(node) #removes any connection
-        del self.graph[node] #deletes from graph
-        self.nodes.remove(node) #deletes from nodes variable
+        position = self._index[node]
+        self._incStructCount()
+        self._modCount += 1 #the node list is reordered
+        self._materialize()
+        neighbors = self._neighbors.pop(node)
+        for x in neighbors: #removes connections in both directions
+            self._neighbors.get(x,set()).discard(node)
+            self._incoming.get(x,set()).discard(node)
+        for x in self._incoming.pop(node,()): #removes directed links to node
+            self._neighbors.get(x,set()).discard(node)
+        del self._index[node]
+        last = self.nodes.pop() #swaps the last node into the gap
+        if position < len(self.nodes):
+            self.nodes[position] = last
+            self._index[last] = position
+        for column in self._columns.values():
+            column.move(len(self.nodes),position)
         return self.graph
 
     def addEdge(self,node,connection):
@@ -251,13 +434,21 @@ class AbstractNetwork(object):
         Will add the node on the other end of the link to the neighbors
         feature.
 
+        Notes
+        -----
+        -> Both nodes are checked before anything changes, so a missing node
+           leaves the network and its cached CSR arrays as they were.
+
         Has a runtime of $O(k)$.
         """
-        try:
-            (self.graph[node]["neighbors"]).add(connection)
-            (self.graph[connection]["neighbors"]).add(node)
-        except KeyError:
+        if node not in self._index or connection not in self._index:
             return "Node not in graph"
+        if connection in self._neighbors[node] and \
+           node in self._neighbors[connection]: #nothing changes
+            return
+        self._incStructCount()
+        (self._neighbors[node]).add(connection)
+        (self._neighbors[connection]).add(node)
 
     def directedLink(self,node,connection):
         """Adds a link that is directed from node to connection.
@@ -270,12 +461,82 @@ class AbstractNetwork(object):
            Node in the network
 
         Will only add connection to the neighbors feature of node. This is a
-        one way link. 
+        one way link. Like addEdge, both nodes are checked first.
         """
-        try:
-            (self.graph[node]["neighbors"]).add(connection)
-        except KeyError:
+        if node not in self._index or connection not in self._index:
             return "Node not in graph"
+        if connection in self._neighbors[node]: #nothing changes
+            return
+        self._incStructCount()
+        (self._neighbors[node]).add(connection)
+        self._incoming.setdefault(connection,set()).add(node)
+
+    def addEdgesBulk(self,edges):
+        """
+        Adds many non-directed links at once.
+
+        Parameters
+        ----------
+        edges: array_like of int
+           An (m, 2) array where each row holds the positions, in the node
+           list, of the two nodes of a link.
+
+        Raises
+        ------
+        IndexError: If a position is not a node of the network.
+
+        Notes
+        -----
+        -> The links are merged with the existing ones in the CSR arrays
+           and the neighbor sets are rebuilt lazily, so sets returned by
+           getNeighbors before the call are not updated.
+
+        The runtime is $O(n + m log(m))$ for $m$ links in the network.
+        """
+        edges = np.asarray(edges,dtype = np.intp).reshape(-1,2)
+        indptr, indices = self.toCSR()
+        self._incStructCount()
+        rows = np.repeat(np.arange(len(self.nodes)),np.diff(indptr))
+        self._setCSR(*AbstractNetwork._compileLinks(
+            np.concatenate((rows,edges[:,0],edges[:,1])),
+            np.concatenate((indices,edges[:,1],edges[:,0])),
+            len(self.nodes)))
+
+    @staticmethod
+    def _compileLinks(rows,cols,size):
+        """Sorts and deduplicates directed links, given as arrays of
+        positions, into CSR arrays for size nodes."""
+        if len(rows) and (min(rows.min(),cols.min()) < 0 or
+                          max(rows.max(),cols.max()) >= size):
+            raise IndexError("Link to a position outside the network")
+        rows, indices = AbstractNetwork._uniquePairs(rows,cols,size)
+        indptr = np.zeros(size+1,dtype = np.intp)
+        np.cumsum(np.bincount(rows,minlength = size),out = indptr[1:])
+        return indptr, indices.astype(np.intp)
+
+    @staticmethod
+    def _uniquePairs(rows,cols,size):
+        """Returns the distinct (row, col) pairs of positions, sorted by row
+        and then col, as two arrays."""
+        keys = rows.astype(np.int64)*size + cols
+        keys.sort()
+        if len(keys):
+            keys = keys[np.concatenate(([True],keys[1:] != keys[:-1]))]
+        return np.divmod(keys,size)
+
+    def _setCSR(self,indptr,indices):
+        """Makes the CSR arrays the structure of the network, building the
+        neighbor sets lazily from them."""
+        self._neighbors = _LazyNeighbors(self,indptr,indices)
+        self._csr = (indptr,indices)
+        self._csrStructCount = self._structCount
+
+    def _materialize(self):
+        """Builds every neighbor set that has not been built yet, so the
+        node positions can change."""
+        if isinstance(self._neighbors,_LazyNeighbors):
+            self._neighbors = {node: self._neighbors[node]
+                               for node in self.nodes}
 
     def addMultipleEdges(self,node,connections):
         """
@@ -304,10 +565,129 @@ class AbstractNetwork(object):
         Clears the network of all links, nodes, and data, the runtime
         is $O(k)$.
         """
-        self.graph = dict()
+        self._incStructCount()
+        self._modCount += 1
         self.nodes = list()
+        self._index = dict()
+        self._neighbors = dict()
+        self._incoming = dict()
+        self._columns = dict()
+        self._capacity = 0
         self.edge_list = np.zeros([0,0],dtype=int)
 
+    def _incStructCount(self):
+        """Records a change to the structure of the network, which makes the
+        cached CSR arrays stale. Unlike _modCount it does not stop iteration,
+        so links and nodes can still be added while iterating over the
+        network.
+
+        Raises
+        ------
+        AttributeError: If the network is frozen.
+        """
+        if self._frozen:
+            raise AttributeError("Network is frozen, thaw it before modifying.")
+        self._structCount += 1
+
+    def freeze(self):
+        """
+        Builds the CSR arrays and locks the structure of the network. Adding
+        or removing nodes and links raises an AttributeError until thaw is
+        called. Features of existing nodes can still be updated.
+
+        Returns
+        -------
+        The (indptr, indices) tuple returned by toCSR.
+        """
+        csr = self.toCSR()
+        self._frozen = True
+        return csr
+
+    def thaw(self):
+        """Unlocks a frozen network so it can be modified again."""
+        self._frozen = False
+
+    def isFrozen(self):
+        """Returns True if the network is frozen, False otherwise."""
+        return self._frozen
+
+    def nodeIndex(self):
+        """
+        Returns a dictionary mapping every node to its position in the node
+        list. The positions are the row numbers used by the CSR arrays and
+        the entries of the feature columns.
+
+        The dictionary is kept up to date as nodes are added and removed, so
+        the runtime is $O(1)$. It must not be modified.
+        """
+        return self._index
+
+    def toCSR(self):
+        """
+        Returns the links of the network as compressed sparse row arrays.
+
+        Returns
+        -------
+        A tuple (indptr, indices) of integer numpy arrays. The neighbors of
+        the node at position i in the node list are at positions
+        indices[indptr[i]:indptr[i+1]], sorted in increasing order.
+
+        Notes
+        -----
+        -> The arrays are cached and only rebuilt when _structCount shows the
+           network was modified since the last call.
+        -> Directed links only appear in the row of the node they leave.
+        -> The returned arrays must not be modified in place.
+
+        The runtime is $O(n + m)$ for $m$ links when rebuilding and $O(1)$
+        otherwise.
+        """
+        if self._csr is None or self._csrStructCount != self._structCount:
+            index = self._index
+            degrees = np.fromiter((len(self._neighbors[node])
+                                   for node in self.nodes),
+                                  dtype = np.intp, count = len(self.nodes))
+            indptr = np.zeros(len(self.nodes)+1, dtype = np.intp)
+            np.cumsum(degrees, out = indptr[1:])
+            indices = np.fromiter((index[connection] for node in self.nodes
+                                   for connection in
+                                   self._neighbors[node]),
+                                  dtype = np.intp, count = indptr[-1])
+            rows = np.repeat(np.arange(len(self.nodes)), degrees)
+            indices = indices[np.lexsort((indices,rows))] #sorts every row
+            self._csr = (indptr, indices)
+            self._csrStructCount = self._structCount
+        return self._csr
+
+    def neighborSums(self,states):
+        """
+        Sums the states of the neighbors of every node at once, using the CSR
+        arrays to gather the states.
+
+        Parameters
+        ----------
+        states: array_like
+           The states of the nodes, ordered like the node list along the last
+           axis. Leading axes, such as trials, are kept.
+
+        Returns
+        -------
+        A numpy array with the same shape as states, holding the sum over
+        the neighbors of each node.
+
+        The runtime is $O(n + m)$ for $m$ links.
+        """
+        indptr, indices = self.toCSR()
+        states = np.asarray(states)
+        dtype = np.result_type(states.dtype, np.int64)
+        sums = np.zeros(states.shape, dtype = dtype)
+        linked = indptr[:-1] != indptr[1:] #reduceat needs non-empty rows
+        if linked.any():
+            sums[...,linked] = np.add.reduceat(states[...,indices],
+                                               indptr[:-1][linked],
+                                               axis = -1, dtype = dtype)
+        return sums
+
     def getNeighbors(self,node):
         """Finds the neighbors between of the node.
 
@@ -318,21 +698,120 @@ class AbstractNetwork(object):
 
         Runtime of $O(k)$.
         """
-        return self.graph[node]["neighbors"]
+        return self._neighbors[node]
+
+    def degrees(self):
+        """Returns the degree of every node as an array in the order of the
+        node list. Has a runtime of $O(1)$ once the CSR arrays are built."""
+        return np.diff(self.toCSR()[0])
+
+    def adjacencyMatrix(self,format = 'dense',dtype = np.int64):
+        """
+        Returns the adjacency matrix of the network. Row and column i belong
+        to the node at position i of the node list, see nodeIndex, so any
+        hashable nodes can be used.
+
+        Parameters
+        ----------
+        format: str
+           'dense', the default, for a numpy array, or 'csr' or 'coo' for a
+           scipy.sparse matrix, which needs the optional scipy package.
+        dtype: numpy dtype
+           The type of the entries.
+
+        Raises
+        ------
+        ValueError: If the format is not known.
+        ImportError: If a sparse format is asked for without scipy.
+
+        Notes
+        -----
+        -> Entry (i, j) is 1 if there is a link from node i to node j, so
+           the matrix is symmetric unless directed links are used.
+        -> The dense matrix takes $O(n^2)$ memory.
+
+        The runtime is $O(n + m)$ for $m$ links in the sparse formats.
+        """
+        indptr, indices = self.toCSR()
+        n = len(self.nodes)
+        if format == 'dense':
+            matrix = np.zeros((n,n),dtype = dtype)
+            matrix[np.repeat(np.arange(n),np.diff(indptr)),indices] = 1
+            return matrix
+        if format not in ('csr','coo'):
+            raise ValueError("Format must be 'csr', 'coo' or 'dense'")
+        if sparse is None:
+            raise ImportError("scipy is needed for sparse matrices, "
+                              "leave out format for a dense array")
+        matrix = sparse.csr_matrix((np.ones(len(indices),dtype = dtype),
+                                    indices,indptr),shape = (n,n))
+        return matrix.asformat(format)
+
+    def laplacian(self,format = 'dense',dtype = np.int64):
+        """
+        Returns the graph Laplacian, the diagonal matrix of degrees minus the
+        adjacency matrix, in the same formats as adjacencyMatrix.
+
+        The runtime is $O(n + m)$ for $m$ links in the sparse formats.
+        """
+        adjacency = self.adjacencyMatrix(format,dtype)
+        degrees = self.degrees().astype(dtype)
+        if format == 'dense':
+            return np.diag(degrees) - adjacency
+        return (sparse.diags(degrees,format = 'csr',dtype = dtype) -
+                adjacency).asformat(format)
 
     def edgeList(self):
         """
-        Uses the neighbor dictionary to create a numpy array that is the
-        adjacency matrix for any network.
+        Returns the adjacency matrix for any network as a dense numpy array,
+        with every directed link made non-directed.
 
-        Has a runtime of $O(n^2)$.
+        Has a runtime of $O(n^2)$. See adjacencyMatrix for a sparse matrix.
+        """
+        edge_list = self.adjacencyMatrix('dense',int)
+        return edge_list | edge_list.T
+
+    def edgeArray(self):
         """
-        edge_list = np.zeros([len(self),len(self)], dtype = int)
-        for node in self:
-            for connection in self.graph[node]["neighbors"]:
-                edge_list[node,connection] = 1
-                edge_list[connection,node] = 1
-        return edge_list
+        Returns every link once as an (m, 2) integer array of positions in
+        the node list, with the smaller position first and the rows sorted.
+
+        Notes
+        -----
+        -> Directed links are treated as non-directed, and links from a
+           node to itself are left out.
+        -> The array is cached and only rebuilt when _structCount shows the
+           network was modified since the last call. It must not be
+           modified in place.
+        -> Edge based dynamics can shuffle a permutation of the row numbers
+           instead of the links themselves.
+
+        The runtime is $O(n + m log(m))$ for $m$ links when rebuilding and
+        $O(1)$ otherwise.
+        """
+        if self._edges is None or self._edgesStructCount != self._structCount:
+            indptr, indices = self.toCSR()
+            rows = np.repeat(np.arange(len(self.nodes)),np.diff(indptr))
+            low = np.minimum(rows,indices)
+            high = np.maximum(rows,indices)
+            loop = low == high
+            low, high = AbstractNetwork._uniquePairs(low[~loop],high[~loop],
+                                                     max(len(self.nodes),1))
+            self._edges = np.column_stack((low,high)).astype(np.intp)
+            self._edgesStructCount = self._structCount
+        return self._edges
+
+    def iterEdges(self):
+        """
+        Generates every link once as a tuple of two nodes, in the order of
+        edgeArray. The tuples are made a block at a time rather than all at
+        once.
+        """
+        nodes = self.getNodes()
+        edges = self.edgeArray()
+        for start in range(0,len(edges),4096):
+            for i,j in edges[start:start+4096].tolist():
+                yield (nodes[i],nodes[j])
 
     def linksAsTuples(self):
         """
@@ -340,18 +819,9 @@ class AbstractNetwork(object):
         network. Where the two nodes in the tuple are the nodes that
         have a connection between them.
 
-        The runtime is $O(n^2)$, however it runs slightly better since it
-        uses a map function. 
-        """
-        tuples = list()
-        for x in self:
-            edges = list(filter(lambda node: node[0] > x or \
-                                node[1] > x,
-                                    list(
-                                        map(lambda node:(x,node),
-                                            self.graph[x]["neighbors"]))))
-            tuples = tuples + edges
-        return tuples
+        The runtime is $O(m)$ for $m$ links once edgeArray is built.
+        """
+        return list(self.iterEdges())
 
     def completeGraph(self):
         """
@@ -16,6 +16,7 @@ __author__ = "\n".join(['Justin Pusztay (pusztayj20@mail.wlu.edu)',
 __all__ = ['CayleyTree']
 
 from .abstractnetwork import AbstractNetwork
+import numpy as np
 
 class CayleyTree(AbstractNetwork):
     """Creates the Cayley Tree object. The class needs integer values
@@ -29,6 +30,9 @@ class CayleyTree(AbstractNetwork):
         self.links = links
         self.keys = list(range(len(self)))
         self.__names = names
+        sizes = np.array(self._nodeGeneration(), dtype = np.intp)
+        self._genOffsets = np.zeros(len(sizes)+1, dtype = np.intp)
+        np.cumsum(sizes, out = self._genOffsets[1:])
         self._autoCreate()
         
     def getType(self):
@@ -65,21 +69,58 @@ class CayleyTree(AbstractNetwork):
                                  range(1,self.links)})
                 node_count += self.links-1
         
+    def genOffsets(self):
+        """Returns an array where generation g holds the nodes from
+           genOffsets()[g] up to genOffsets()[g+1]. The offsets are computed
+           once when the tree is created."""
+        return self._genOffsets.copy()
+
     def genFinder(self,node):
-        """Takes a node and returns the generation that the node is in."""
-        b = self._nodeGeneration()
-        count_gen = -1
-        for x in range(len(b)):
-            node = node - b[x]
-            count_gen += 1
-            if node < 0:
-                return count_gen
+        """Takes a node and returns the generation that the node is in.
+           Uses a binary search of the generation offsets."""
+        if not 0 <= node < self._genOffsets[-1]:
+            return None
+        return int(np.searchsorted(self._genOffsets, node, side = 'right')) - 1
+
+    def generationOf(self,nodes):
+        """Takes an array of nodes and returns an array with the generation
+           of every node."""
+        return np.searchsorted(self._genOffsets, np.asarray(nodes),
+                               side = 'right') - 1
+
+    def generationArray(self):
+        """Returns an array with the generation of every node, in node
+           order."""
+        return np.repeat(np.arange(self.generations+1),
+                         np.diff(self._genOffsets))
+
+    def genSlice(self,gen):
+        """Takes a generation and returns the slice of the node list that
+           holds its nodes."""
+        return slice(int(self._genOffsets[gen]), int(self._genOffsets[gen+1]))
 
     def nodesPerGen(self,gen):
         """Takes a generation and returns a list with the nodes in
             the generation."""
-        b = self._nodeGeneration()
-        a = sum(b[0:gen])
-        c = len(self)-sum(b[gen+1:self.generations+1])
-        return list(range(a,c))
+        return list(range(self._genOffsets[gen], self._genOffsets[gen+1]))
+
+    def generationSums(self,states):
+        """Sums the states in every generation at once.
+
+        Parameters
+        ----------
+        states: array_like
+           States in node order along the last axis, such as the
+           (timesteps, nodes) history of a MonteCarlo.
+
+        Returns
+        -------
+        An array with the last axis replaced by the generations."""
+        states = np.asarray(states)
+        sizes = np.diff(self._genOffsets)
+        sums = np.zeros(states.shape[:-1] + (len(sizes),), dtype = np.int64)
+        filled = sizes > 0 #reduceat needs non-empty generations
+        sums[...,filled] = np.add.reduceat(states, self._genOffsets[:-1][filled],
+                                           axis = -1, dtype = np.int64)
+        return sums
 
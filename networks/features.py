@@ -0,0 +1,295 @@
+"""
+Authors: Justin Pusztay
+Filename: features.py
+Project: Research for Irina Mazilu, Ph.D.
+
+This file contains the columnar feature store used by AbstractNetwork. Every
+feature is a FeatureColumn, a numpy array with one entry per node and a mask
+of the nodes that have the feature. FeatureView, NodeView and GraphView give
+the dictionary interfaces the rest of the project expects on top of the
+columns, without copying them.
+"""
+
+__author__ = "\n".join(['Justin Pusztay (pusztayj20@mail.wlu.edu)'])
+
+__all__ = ['FeatureColumn','FeatureView','NodeView','GraphView']
+
+from collections.abc import Mapping, MutableMapping
+import numpy as np
+
+NUMERIC = 'biuf'
+
+class FeatureColumn(object):
+    """
+    One feature for every node of a network. values[i] holds the feature
+    of the node at position i of the node list and present[i] is True if
+    that node has the feature.
+
+    The dtype is taken from the first value stored. A later value the dtype
+    holds exactly, like a python int in an int8 column, is cast to it, and
+    one that does not fit widens the column, to float and at last to object.
+    """
+
+    def __init__(self,capacity,dtype):
+        """Creates an empty column with room for capacity nodes."""
+        self.values = np.zeros(capacity,dtype = dtype)
+        self.present = np.zeros(capacity,dtype = bool)
+
+    @staticmethod
+    def dtypeOf(value):
+        """Returns the dtype a column needs to hold the value. Python and
+        numpy numbers keep a numeric dtype, everything else is stored as an
+        object."""
+        if isinstance(value,(bool,int,float,np.bool_,np.number)):
+            dtype = np.asarray(value).dtype
+            if dtype.kind in NUMERIC:
+                return dtype
+        return np.dtype(object)
+
+    def resize(self,capacity):
+        """Changes the number of nodes the column has room for."""
+        values = np.zeros(capacity,dtype = self.values.dtype)
+        present = np.zeros(capacity,dtype = bool)
+        size = min(capacity,len(self.values))
+        values[:size] = self.values[:size]
+        present[:size] = self.present[:size]
+        self.values = values
+        self.present = present
+
+    def widen(self,dtype):
+        """Makes the column able to hold values of the dtype."""
+        current = self.values.dtype
+        if current == object or np.can_cast(dtype,current,'safe'):
+            return
+        if current.kind in NUMERIC and dtype.kind in NUMERIC:
+            self.values = self.values.astype(np.result_type(current,dtype))
+        else:
+            self.values = self.values.astype(object)
+
+    def fits(self,value):
+        """Returns True if the column holds the value exactly without
+        changing its dtype, like 1 in an int8 column but not 300 or 2.5."""
+        dtype = self.values.dtype
+        if dtype == object:
+            return True
+        if FeatureColumn.dtypeOf(value).kind not in NUMERIC:
+            return False
+        try:
+            with np.errstate(over = 'ignore',invalid = 'ignore'):
+                stored = dtype.type(value)
+        except (OverflowError,ValueError):
+            return False
+        return bool(stored == value) or (stored != stored and value != value)
+
+    def get(self,i):
+        """Returns the value at position i.
+
+        Raises
+        ------
+        KeyError: If the node at position i does not have the feature.
+        """
+        if not self.present[i]:
+            raise KeyError(i)
+        value = self.values[i]
+        return value.item() if self.values.dtype != object else value
+
+    def set(self,i,value):
+        """Stores the value at position i, widening the column only if the
+        value does not fit."""
+        if not self.fits(value):
+            self.widen(FeatureColumn.dtypeOf(value))
+        self.values[i] = value
+        self.present[i] = True
+
+    def fill(self,data,size):
+        """Stores an array of values for the first size positions."""
+        data = np.asarray(data)
+        if data.dtype.kind not in NUMERIC:
+            data = data.astype(object)
+        if self.values.dtype != data.dtype:
+            self.values = np.zeros(len(self.values),dtype = data.dtype)
+        self.values[:size] = data
+        self.present[:size] = True
+
+    def discard(self,i):
+        """Removes the value at position i."""
+        self.present[i] = False
+
+    def move(self,source,target):
+        """Moves the value at position source to position target, leaving
+        source empty."""
+        if source != target:
+            self.values[target] = self.values[source]
+            self.present[target] = self.present[source]
+        self.present[source] = False
+
+class FeatureView(Mapping):
+    """
+    Read only dictionary view of one feature. The keys are the nodes that
+    have the feature and the values are looked up in the column, so the
+    view always shows the current data.
+
+    array gives the column itself as a numpy array in node order, which is
+    how simulations read a feature without building a dictionary.
+    """
+
+    def __init__(self,network,name):
+        """Creates a view of the named feature of the network."""
+        self._network = network
+        self._name = name
+
+    def _column(self):
+        """Returns the column of the feature."""
+        return self._network._columns[self._name]
+
+    def __getitem__(self,node):
+        """Returns the feature of the node, has a runtime of $O(1)$."""
+        return self._column().get(self._network._index[node])
+
+    def __iter__(self):
+        """Iterates over the nodes that have the feature."""
+        present = self._column().present
+        index = self._network._index
+        return (node for node in self._network.nodes if present[index[node]])
+
+    def __len__(self):
+        """Returns the number of nodes that have the feature."""
+        return int(self.mask().sum())
+
+    def __contains__(self,node):
+        """Returns True if the node has the feature."""
+        try:
+            return bool(self._column().present[self._network._index[node]])
+        except (KeyError,TypeError):
+            return False
+
+    def __str__(self):
+        """Returns the string representation of the dictionary."""
+        return str(dict(self))
+
+    __repr__ = __str__
+
+    def __array__(self,dtype = None,copy = None):
+        """Lets numpy functions use the view as the column array."""
+        array = self.array()
+        return array if dtype is None else array.astype(dtype)
+
+    def copy(self):
+        """Returns the feature as a regular dictionary."""
+        return dict(self)
+
+    def array(self):
+        """Returns the column as an array in the order of the node list. The
+        array is not a copy. Entries of nodes without the feature are
+        meaningless, see mask.
+
+        The column is replaced when it grows past its capacity or a value
+        that does not fit its dtype is stored, after which an array returned
+        earlier no longer follows the feature. Call array again after such
+        changes."""
+        return self._column().values[:len(self._network.nodes)]
+
+    def mask(self):
+        """Returns a boolean array, in node order, that is True for the
+        nodes that have the feature."""
+        return self._column().present[:len(self._network.nodes)]
+
+    def isComplete(self):
+        """Returns True if every node has the feature."""
+        return bool(self.mask().all())
+
+class NodeView(MutableMapping):
+    """
+    Dictionary of the features of one node. 'neighbors' is the neighbor set
+    of the node and every other key is read from and written to the feature
+    columns of the network.
+    """
+
+    __slots__ = ('_network','_node')
+
+    def __init__(self,network,node):
+        """Creates a view of the features of the node."""
+        self._network = network
+        self._node = node
+
+    def __getitem__(self,name):
+        """Returns a feature of the node."""
+        if name == "neighbors":
+            return self._network._neighbors[self._node]
+        try:
+            column = self._network._columns[name]
+        except KeyError:
+            raise KeyError(name)
+        try:
+            return column.get(self._network._index[self._node])
+        except KeyError:
+            raise KeyError(name)
+
+    def __setitem__(self,name,value):
+        """Sets a feature of the node."""
+        self._network._setValue(self._node,name,value)
+
+    def __delitem__(self,name):
+        """Removes a feature from the node."""
+        if name not in self:
+            raise KeyError(name)
+        self._network._columns[name].discard(self._network._index[self._node])
+
+    def __iter__(self):
+        """Iterates over the names of the features of the node."""
+        i = self._network._index[self._node]
+        yield "neighbors"
+        for name,column in list(self._network._columns.items()):
+            if column.present[i]:
+                yield name
+
+    def __len__(self):
+        """Returns the number of features of the node."""
+        return sum(1 for name in self)
+
+    def __contains__(self,name):
+        """Returns True if the node has the feature."""
+        if name == "neighbors":
+            return True
+        column = self._network._columns.get(name)
+        return column is not None and \
+               bool(column.present[self._network._index[self._node]])
+
+    def __str__(self):
+        """Returns the string representation of the dictionary."""
+        return str(dict(self))
+
+    __repr__ = __str__
+
+class GraphView(Mapping):
+    """Read only dictionary of dictionaries view of a network, mapping every
+    node to its NodeView."""
+
+    def __init__(self,network):
+        """Creates a view of the network."""
+        self._network = network
+
+    def __getitem__(self,node):
+        """Returns the NodeView of the node."""
+        if node not in self._network._index:
+            raise KeyError(node)
+        return NodeView(self._network,node)
+
+    def __iter__(self):
+        """Iterates over the nodes."""
+        return iter(self._network.nodes)
+
+    def __len__(self):
+        """Returns the number of nodes."""
+        return len(self._network.nodes)
+
+    def __contains__(self,node):
+        """Returns True if the node is in the network."""
+        return node in self._network._index
+
+    def __str__(self):
+        """Returns the string representation of the dictionary of
+        dictionaries."""
+        return str({node: dict(self[node]) for node in self})
+
+    __repr__ = __str__
@@ -0,0 +1,175 @@
+"""
+Authors: Justin Pusztay
+Filename: history.py
+Project: Research for Irina Mazilu, Ph.D.
+
+This file contains the History class, which stores the states of every node
+for every timestep of a simulation in a single numpy array. StateView and
+HistoryView give the dictionary and list interfaces the rest of the project
+expects, without copying the array.
+"""
+
+__author__ = "\n".join(['Justin Pusztay (pusztayj20@mail.wlu.edu)'])
+
+__all__ = ['History','StateView','HistoryView']
+
+from collections.abc import Mapping, Sequence
+import numpy as np
+
+class StateView(Mapping):
+    """
+    Read only dictionary view of a single timestep. The keys are the nodes
+    and the values are their states, looked up through the node index.
+    """
+
+    def __init__(self,index,row):
+        """Creates a view over a row of the history array."""
+        self._index = index
+        self._row = row
+
+    def __getitem__(self,node):
+        """Returns the state of the node, has a runtime of $O(1)$."""
+        return int(self._row[self._index[node]])
+
+    def __iter__(self):
+        """Iterates over the nodes."""
+        return iter(self._index)
+
+    def __contains__(self,node):
+        """Returns True if the node is in the view."""
+        return node in self._index
+
+    def __len__(self):
+        """Returns the number of nodes."""
+        return len(self._index)
+
+    def __str__(self):
+        """Returns the string representation of the dictionary."""
+        return str(dict(self))
+
+    __repr__ = __str__
+
+    def copy(self):
+        """Returns the view as a regular dictionary."""
+        return dict(self)
+
+    def array(self):
+        """Returns the states as an array in the order of the node list."""
+        return self._row
+
+class HistoryView(Sequence):
+    """Read only list view of the timesteps, each one a StateView."""
+
+    def __init__(self,history):
+        """Creates a view of the history object."""
+        self._history = history
+
+    def __getitem__(self,timestep):
+        """Returns the StateView of a timestep, or a list of them for a
+        slice."""
+        if isinstance(timestep,slice):
+            return [self[t] for t in range(*timestep.indices(len(self)))]
+        return self._history.view(timestep)
+
+    def __len__(self):
+        """Returns the number of timesteps."""
+        return len(self._history)
+
+class History(object):
+    """
+    Preallocated (timesteps, nodes) array of states, with int8 entries.
+
+    Rows are appended one timestep at a time. When the array is full its
+    capacity is doubled, so appending has an amortized runtime of $O(n)$
+    for $n$ nodes. The sum of the states is taken as each row is appended,
+    which makes counting filled nodes a $O(1)$ lookup.
+
+    Notes
+    -----
+    -> The nodes and their positions are taken from the network when the
+       history is created. The network must not be restructured while the
+       history is in use.
+    -> States must fit in an int8, which covers 0/1 particles and -1/1
+       spins.
+    """
+
+    def __init__(self,network,capacity = None,dtype = np.int8):
+        """Creates an empty history for the nodes of the network. Networks
+        whose nodes are a range, like ImplicitLattice, are not copied. By
+        default room is made for 64 timesteps, fewer for networks so large
+        that 64 rows would take more than 64 MB."""
+        self.nodes = network.getNodes()
+        self.index = network.nodeIndex()
+        if not isinstance(self.nodes,range):
+            self.nodes = list(self.nodes)
+            self.index = dict(self.index)
+        if capacity is None:
+            capacity = min(64,max(2,(1 << 26)//max(len(self.nodes),1)))
+        self._data = np.zeros((max(capacity,1),len(self.nodes)),dtype = dtype)
+        self._sums = np.zeros(max(capacity,1),dtype = np.int64)
+        self._size = 0
+
+    def __len__(self):
+        """Returns the number of timesteps recorded."""
+        return self._size
+
+    def _timestep(self,timestep):
+        """Converts a possibly negative timestep to a row number."""
+        if timestep < 0:
+            timestep += self._size
+        if not 0 <= timestep < self._size:
+            raise IndexError("Timestep out of range")
+        return timestep
+
+    def reserve(self,capacity):
+        """Makes room for at least capacity timesteps."""
+        if capacity > len(self._data):
+            data = np.zeros((capacity,len(self.nodes)),dtype = self._data.dtype)
+            data[:self._size] = self._data[:self._size]
+            sums = np.zeros(capacity,dtype = np.int64)
+            sums[:self._size] = self._sums[:self._size]
+            self._data = data
+            self._sums = sums
+
+    def append(self,states):
+        """Records an array of states, in node order, as the next timestep."""
+        if self._size == len(self._data):
+            self.reserve(2*len(self._data))
+        self._data[self._size] = states
+        self._sums[self._size] = self._data[self._size].sum(dtype = np.int64)
+        self._size += 1
+
+    def appendDict(self,state_d):
+        """Records a dictionary of node states as the next timestep."""
+        self.append(np.fromiter((state_d[node] for node in self.nodes),
+                                dtype = self._data.dtype,
+                                count = len(self.nodes)))
+
+    def keepLast(self):
+        """Forgets every timestep but the latest, which becomes timestep 0.
+        Views of the forgotten timesteps must not be used afterwards."""
+        if self._size > 1:
+            self._data[0] = self._data[self._size-1]
+            self._sums[0] = self._sums[self._size-1]
+            self._size = 1
+
+    def row(self,timestep):
+        """Returns the states of a timestep as an array in node order."""
+        return self._data[self._timestep(timestep)]
+
+    def view(self,timestep):
+        """Returns the states of a timestep as a StateView."""
+        return StateView(self.index,self.row(timestep))
+
+    def total(self,timestep):
+        """Returns the sum of the states at a timestep. For 0/1 states this
+        is the number of filled nodes."""
+        return int(self._sums[self._timestep(timestep)])
+
+    def totals(self):
+        """Returns the sum of the states at every timestep as an array."""
+        return self._sums[:self._size]
+
+    def array(self):
+        """Returns the (timesteps, nodes) array of every recorded state."""
+        return self._data[:self._size]
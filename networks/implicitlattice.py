@@ -0,0 +1,296 @@
+"""
+Authors: Justin Pusztay
+Filename: implicitlattice.py
+Project: Research for Irina Mazilu, Ph.D.
+
+This file contains the ImplicitLattice class. Unlike Lattice, it stores no
+nodes or links. Site i sits at x = i % length, y = (i // length) % width and
+z = i // (length*width), the same numbering Lattice uses, and its neighbors
+are found from those coordinates. Features, such as the state, are held in
+numpy arrays with shape (height, width, length).
+"""
+
+__author__ = "\n".join(['Justin Pusztay (pusztayj20@mail.wlu.edu)'])
+
+__all__ = ['ImplicitLattice']
+
+import numpy as np
+
+class ImplicitLattice(object):
+    """
+    Structure only lattice for very large numbers of sites. The class needs
+    integer values for the length, width, and height, and defaults to a
+    2-dimensional lattice. With periodic boundaries the sites on opposite
+    faces are linked.
+
+    Neighbor sums over the whole lattice are computed with slice additions
+    on the (height, width, length) array, so no memory is spent on links.
+    """
+
+    def __init__(self,length,width,height = 1,periodic = False):
+        """Sets up the dimensions of the lattice."""
+        self.x = length
+        self.y = width
+        self.z = height
+        self.periodic = periodic
+        self.latticeProtect()
+        self.shape = (self.z,self.y,self.x)
+        self._features = dict()
+        self._edges = None
+        self._modCount = 0
+
+    def __eq__(self,other):
+        """Defines equality of a lattice based on the dimensions and
+        boundaries."""
+        if self is other:
+            return True
+        if type(self) != type(other):
+            return False
+        return self.shape == other.shape and self.periodic == other.periodic
+
+    def __len__(self):
+        """Returns the number of sites in the lattice."""
+        return self.nodeNumber()
+
+    def __iter__(self):
+        """Iterates over the sites."""
+        return iter(range(len(self)))
+
+    def __contains__(self,node):
+        """Return True if node is a site of the lattice, False otherwise."""
+        try:
+            return 0 <= node < len(self) and int(node) == node
+        except TypeError:
+            return False
+
+    def latticeProtect(self):
+        """Protects the user from creating a lattice that cannot exist."""
+        if self.y <= 0 or self.x <= 0 or self.z <= 0:
+            raise ValueError("Inappropriate entries lattice cannot exist")
+
+    def nodeNumber(self):
+        """Returns the total number of sites in the Lattice."""
+        return self.z*self.y*self.x
+
+    def floorArea(self):
+        """Returns the number of sites in a cross section of the z-plane."""
+        return self.x*self.y
+
+    def getType(self):
+        """Quick fix for MonteCarlo"""
+        return "Lattice"
+
+    def getNodes(self):
+        """Returns the sites as a range, without building a list."""
+        return range(len(self))
+
+    def nodeIndex(self):
+        """Returns the mapping from site to position, which is the site
+        itself."""
+        return self.getNodes()
+
+    def coordinates(self,node):
+        """Returns the (x, y, z) coordinates of a site."""
+        if node not in self:
+            raise KeyError(node)
+        return (node % self.x, (node // self.x) % self.y,
+                node // self.floorArea())
+
+    def site(self,x,y,z = 0):
+        """Returns the site at the (x, y, z) coordinates."""
+        return x + self.x*y + self.floorArea()*z
+
+    def getNeighbors(self,node):
+        """Computes the neighbors of a site from its coordinates.
+
+        Has a runtime of $O(1)$."""
+        coordinates = self.coordinates(node)
+        neighbors = set()
+        for axis,size in enumerate((self.x,self.y,self.z)):
+            for step in (-1,1):
+                moved = list(coordinates)
+                moved[axis] += step
+                if self.periodic:
+                    moved[axis] %= size
+                elif not 0 <= moved[axis] < size:
+                    continue
+                neighbors.add(self.site(*moved))
+        neighbors.discard(node) #periodic axis of size 1
+        return neighbors
+
+    def degree(self,node):
+        """Returns the degree of a site."""
+        return len(self.getNeighbors(node))
+
+    def degrees(self):
+        """Returns the degree of every site as an array in site order."""
+        degrees = np.zeros(self.shape, dtype = np.int64)
+        for axis,size in ((2,self.x),(1,self.y),(0,self.z)):
+            counts = np.full(size, 2 if size > 2 else size - 1)
+            if not self.periodic and size > 1:
+                counts[0] = counts[-1] = 1
+            shape = [1,1,1]
+            shape[axis] = size
+            degrees += counts.reshape(shape)
+        return degrees.reshape(-1)
+
+    def edgeArray(self):
+        """Returns every link once as an (m, 2) array of sites, with the
+        smaller site first. The array is built on the first call and then
+        kept, since the structure cannot change."""
+        if self._edges is None:
+            sites = np.arange(len(self)).reshape(self.shape)
+            pieces = list()
+            for axis,size in ((2,self.x),(1,self.y),(0,self.z)):
+                if size == 1:
+                    continue
+                pieces.append((sites.take(range(size-1),axis).reshape(-1),
+                               sites.take(range(1,size),axis).reshape(-1)))
+                if self.periodic and size > 2:
+                    pieces.append((sites.take([0],axis).reshape(-1),
+                                   sites.take([size-1],axis).reshape(-1)))
+            if pieces:
+                self._edges = np.column_stack(
+                    (np.concatenate([low for low,high in pieces]),
+                     np.concatenate([high for low,high in pieces])))
+            else:
+                self._edges = np.zeros((0,2),dtype = np.intp)
+        return self._edges
+
+    def iterEdges(self):
+        """Generates every link once as a tuple of two sites."""
+        edges = self.edgeArray()
+        for start in range(0,len(edges),4096):
+            for link in edges[start:start+4096].tolist():
+                yield tuple(link)
+
+    def neighborSums(self,states):
+        """
+        Sums the states of the neighbors of every site at once, by adding
+        shifted slices of the (height, width, length) array.
+
+        Parameters
+        ----------
+        states: array_like
+           States of the sites in site order along the last axis, or with the
+           last three axes shaped (height, width, length). Leading axes, such
+           as trials, are kept.
+
+        Returns
+        -------
+        A numpy array with the same shape as states.
+
+        The runtime is $O(n)$ for $n$ sites.
+        """
+        states = np.asarray(states)
+        grid = states.reshape(states.shape[:-1] + self.shape) \
+               if states.shape[-3:] != self.shape else states
+        sums = np.zeros(grid.shape, dtype = np.result_type(grid.dtype,np.int16))
+        for axis,size in ((-1,self.x),(-2,self.y),(-3,self.z)):
+            if size == 1:
+                continue
+            self._addShifted(sums,grid,axis,slice(1,None),slice(None,-1))
+            self._addShifted(sums,grid,axis,slice(None,-1),slice(1,None))
+            if self.periodic and size > 2:
+                self._addShifted(sums,grid,axis,slice(0,1),slice(-1,None))
+                self._addShifted(sums,grid,axis,slice(-1,None),slice(0,1))
+        return sums.reshape(states.shape)
+
+    def slabNeighborSums(self,grid,z0,z1):
+        """
+        Sums the neighbors of the sites in layers z0 up to z1 of a
+        (height, width, length) grid. Layers next to the slab are read but
+        not summed, so slabs can be handled by different threads.
+
+        Returns
+        -------
+        An array shaped like grid[z0:z1].
+        """
+        block = grid[z0:z1]
+        sums = np.zeros(block.shape, dtype = np.result_type(grid.dtype,np.int16))
+        for axis,size in ((-1,self.x),(-2,self.y)):
+            if size == 1:
+                continue
+            self._addShifted(sums,block,axis,slice(1,None),slice(None,-1))
+            self._addShifted(sums,block,axis,slice(None,-1),slice(1,None))
+            if self.periodic and size > 2:
+                self._addShifted(sums,block,axis,slice(0,1),slice(-1,None))
+                self._addShifted(sums,block,axis,slice(-1,None),slice(0,1))
+        if self.z > 1:
+            layers = np.arange(z0,z1)
+            steps = (1,) if self.periodic and self.z == 2 else (-1,1)
+            for step in steps:
+                neighbor = layers + step
+                if self.periodic:
+                    neighbor %= self.z
+                valid = (neighbor >= 0) & (neighbor < self.z)
+                sums[valid] += grid[neighbor[valid]]
+        return sums
+
+    def isBipartite(self):
+        """Returns True if the sites can be split into two colours with every
+        link joining different colours, which fails only for periodic axes
+        of odd length."""
+        return not self.periodic or \
+               all(size % 2 == 0 or size == 1 for size in self.shape)
+
+    def parity(self):
+        """Returns the colour, (x + y + z) % 2, of every site as a
+        (height, width, length) array."""
+        z,y,x = np.ogrid[:self.z,:self.y,:self.x]
+        return ((x + y + z) % 2).astype(np.int8)
+
+    def _addShifted(self,sums,grid,axis,target,source):
+        """Adds the source slice of grid to the target slice of sums along
+        one axis."""
+        to = [slice(None)]*grid.ndim
+        fro = [slice(None)]*grid.ndim
+        to[axis] = target
+        fro[axis] = source
+        sums[tuple(to)] += grid[tuple(fro)]
+
+    def setFeature(self,name,data):
+        """
+        Sets a feature for every site. The data can be an array in site
+        order, an array shaped (height, width, length), a single value or a
+        dictionary with the sites as keys.
+        """
+        if isinstance(data,dict):
+            column = self._features.get(name)
+            if column is None:
+                column = np.zeros(self.shape,
+                                  dtype = np.asarray(list(data.values())).dtype)
+            flat = column.reshape(-1)
+            for node,datum in data.items():
+                flat[node] = datum
+            self._features[name] = column
+        else:
+            data = np.asarray(data)
+            self._features[name] = np.array(np.broadcast_to(
+                data.reshape(self.shape) if data.ndim == 1 else data,
+                self.shape))
+
+    def getFeature(self,name):
+        """Returns the (height, width, length) array of a feature, which is
+        the stored array itself and not a copy."""
+        return self._features[name]
+
+    def add(self,node,**kwargs):
+        """Sets features of an existing site. Sites cannot be added."""
+        if node not in self:
+            raise KeyError("Sites cannot be added to an implicit lattice")
+        for name,value in kwargs.items():
+            if name not in self._features:
+                self._features[name] = np.zeros(self.shape,
+                                                dtype = np.asarray(value).dtype)
+            self._features[name].reshape(-1)[node] = value
+
+    def addMultipleNodes(self,nodes,**kwargs):
+        """Sets features for many sites. Passing the lattice itself sets the
+        feature for every site at once."""
+        if nodes is self:
+            for name,value in kwargs.items():
+                self.setFeature(name,value)
+        else:
+            for node in nodes:
+                self.add(node,**kwargs)
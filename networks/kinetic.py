@@ -0,0 +1,264 @@
+"""
+Authors: Justin Pusztay
+Filename: kinetic.py
+Project: Research for Irina Mazilu, Ph.D.
+
+This file contains the continuous time, rejection free Monte Carlo engine
+(Gillespie's algorithm, or BKL) used by MonteCarlo.simulateKinetic. Every
+node changes state as a Poisson process. Its rate is the probability the
+discrete rule would give it in one timestep, so one unit of time is one
+timestep. Instead of drawing a number for every node each timestep, only
+the changes are drawn, one at a time, and only the rates of the changed node
+and its neighbors are updated.
+"""
+
+__author__ = "\n".join(['Justin Pusztay (pusztayj20@mail.wlu.edu)'])
+
+__all__ = ['SumTree','KineticEngine','neighborLists','csrLists']
+
+import math
+import numpy as np
+
+def neighborLists(edges,n):
+    """
+    Returns the neighbors of every node as a list of lists of positions,
+    built from an (m, 2) array of links between positions, see edgeArray.
+    Lists are used because the engines read the neighbors of one node at a
+    time.
+    """
+    edges = np.asarray(edges)
+    source = np.concatenate((edges[:,0],edges[:,1]))
+    target = np.concatenate((edges[:,1],edges[:,0]))
+    order = np.argsort(source,kind = 'stable')
+    indptr = np.concatenate(([0],np.cumsum(np.bincount(source,minlength = n))))
+    return [neighbors.tolist() for neighbors in
+            np.split(target[order],indptr[1:-1])] if n else []
+
+def csrLists(indptr,indices,transpose = False):
+    """
+    Returns the rows of CSR arrays, see toCSR, as a list of lists of
+    positions. With transpose, the list of a node holds the positions whose
+    rows contain it instead, the nodes whose neighbor sums read its state.
+    The two only differ when the network has directed links.
+    """
+    n = len(indptr) - 1
+    if not transpose:
+        return [indices[indptr[i]:indptr[i+1]].tolist() for i in range(n)]
+    rows = np.repeat(np.arange(n),np.diff(indptr))
+    order = np.argsort(indices,kind = 'stable')
+    bounds = np.cumsum(np.bincount(indices,minlength = n))
+    return [readers.tolist() for readers in
+            np.split(rows[order],bounds[:-1])] if n else []
+
+class SumTree(object):
+    """
+    Binary tree over n nonnegative weights where every inner entry is the sum
+    of its two children, so the root is the total weight.
+
+    Notes
+    -----
+    -> Changing a weight and finding the weight at which a running sum
+       passes a value both have a runtime of $O(log(n))$.
+    -> The tree is held in a python list, which is faster than a numpy
+       array for reading and writing one entry at a time.
+    """
+
+    def __init__(self,weights):
+        """Builds the tree over an array of weights in $O(n)$."""
+        size = 1
+        while size < len(weights):
+            size *= 2
+        tree = np.zeros(2*size)
+        tree[size:size+len(weights)] = weights
+        level = size
+        while level > 1:
+            tree[level//2:level] = tree[level:2*level:2] + \
+                                   tree[level+1:2*level:2]
+            level //= 2
+        self._tree = tree.tolist()
+        self._size = size
+        self._count = len(weights)
+
+    def __len__(self):
+        """Returns the number of weights."""
+        return self._count
+
+    def __getitem__(self,i):
+        """Returns weight i."""
+        return self._tree[self._size + i]
+
+    def total(self):
+        """Returns the sum of the weights."""
+        return self._tree[1]
+
+    def update(self,i,weight):
+        """Sets weight i and the sums above it. Sums are recomputed from the
+        children instead of shifted, so rounding errors do not build up."""
+        tree = self._tree
+        i += self._size
+        tree[i] = weight
+        i //= 2
+        while i:
+            tree[i] = tree[2*i] + tree[2*i+1]
+            i //= 2
+
+    def find(self,value):
+        """Returns the index i of the weight where the running sum of the
+        weights first passes the value, for 0 <= value < total()."""
+        tree = self._tree
+        i = 1
+        while i < self._size:
+            i *= 2
+            if value >= tree[i] and tree[i+1] > 0:
+                value -= tree[i]
+                i += 1
+        return i - self._size
+
+class KineticEngine(object):
+    """
+    Continuous time simulation of the 'NN', 'EI' or 'TL' rule, started from
+    an array of 0/1 states in node order.
+
+    For 'NN' and 'EI' the rate of a node depends on the number of its filled
+    neighbors, which is kept per node, and the rates are kept in a SumTree.
+    For 'TL' every empty node has the same rate, which depends on the total
+    density, so the nodes are kept in two buckets, filled and empty, and a
+    node is picked uniformly from the bucket of the event.
+
+    Rates
+    -----
+    -> NN: gamma for a filled node, alpha*beta**s for an empty one with s
+       filled neighbors.
+    -> EI: each link picks each of its ends at rate 1/2. A filled node
+       empties at rate gamma*d/2 for degree d, an empty one fills at rate
+       (r1*s + r2*(d - s))/2.
+    -> TL: gamma for a filled node, (1 - density)*mu for an empty one.
+    """
+
+    RULES = ('NN','EI','TL')
+
+    def __init__(self,edges,states,rule,rng,alpha = .5,beta = .8,
+                 gamma = 0.0,mu = 0.3,r1 = 0.3,r2 = 0.5):
+        """
+        Sets up the rates.
+
+        Parameters
+        ----------
+        edges: numpy array
+           The (m, 2) array of links between positions, see edgeArray.
+        states: array_like
+           The 0/1 state of every node in node order.
+        rng: numpy Generator
+           Source of every random number.
+        """
+        if rule not in KineticEngine.RULES:
+            raise ValueError("Rule must be one of " + str(KineticEngine.RULES))
+        self.rule = rule
+        self.rng = rng
+        self.alpha, self.beta, self.gamma = alpha, beta, gamma
+        self.mu, self.r1, self.r2 = mu, r1, r2
+        states = np.asarray(states).astype(np.int64)
+        n = len(states)
+        self._n = n
+        self._uniforms = list()
+        if rule == 'TL':
+            self._state = states.tolist()
+            self._filled = np.flatnonzero(states).tolist()
+            self._empty = np.flatnonzero(states == 0).tolist()
+            return
+        edges = np.asarray(edges)
+        source = np.concatenate((edges[:,0],edges[:,1]))
+        target = np.concatenate((edges[:,1],edges[:,0]))
+        degree = np.bincount(source,minlength = n)
+        summ = np.bincount(source,weights = states[target],minlength = n)
+        self._neighbors = neighborLists(edges,n)
+        self._degree = degree.tolist()
+        self._state = states.tolist()
+        self._summ = summ.astype(np.int64).tolist()
+        self._powers = [beta**s for s in range(int(degree.max(initial = 0))+1)]
+        if rule == 'NN':
+            rates = np.where(states == 1,gamma,alpha*beta**summ)
+        else:
+            rates = np.where(states == 1,gamma*degree/2,
+                             (r1*summ + r2*(degree - summ))/2)
+        self._tree = SumTree(rates)
+
+    def _uniform(self):
+        """Returns a uniform number, drawn from the rng in batches."""
+        if not self._uniforms:
+            self._uniforms = self.rng.random(4096).tolist()
+        return self._uniforms.pop()
+
+    def _rate(self,i):
+        """Returns the rate at which node i changes state, for 'NN' and
+        'EI'."""
+        if self.rule == 'NN':
+            if self._state[i]:
+                return self.gamma
+            return self.alpha*self._powers[self._summ[i]]
+        if self._state[i]:
+            return self.gamma*self._degree[i]/2
+        s = self._summ[i]
+        return (self.r1*s + self.r2*(self._degree[i] - s))/2
+
+    def states(self):
+        """Returns the current states as an int8 array in node order."""
+        return np.array(self._state,dtype = np.int8)
+
+    def total(self):
+        """Returns the total rate of change of the network."""
+        if self.rule == 'TL':
+            filled = len(self._filled)
+            return filled*self.gamma + \
+                   len(self._empty)*(1 - filled/self._n)*self.mu
+        return self._tree.total()
+
+    def advance(self,duration = 1.0):
+        """
+        Runs the simulation for a length of time and returns the number of
+        changes made. The time to the next change is drawn afresh at the
+        start, which is exact because the waiting times are memoryless.
+        """
+        time = 0.0
+        changes = 0
+        while True:
+            total = self.total()
+            if total <= 0:
+                return changes
+            time -= math.log(1.0 - self._uniform())/total
+            if time > duration:
+                return changes
+            if self.rule == 'TL':
+                self._changeBucket(self._uniform()*total)
+            else:
+                self._change(self._tree.find(self._uniform()*total))
+            changes += 1
+
+    def _change(self,i):
+        """Flips node i and updates its rate and the rates of its
+        neighbors, which has a runtime of $O(d log(n))$ for degree d."""
+        step = 1 - 2*self._state[i]
+        self._state[i] += step
+        tree = self._tree
+        tree.update(i,self._rate(i))
+        for j in self._neighbors[i]:
+            self._summ[j] += step
+            tree.update(j,self._rate(j))
+
+    def _changeBucket(self,value):
+        """Flips a node picked from the filled or the empty bucket, with the
+        bucket picked by where value falls in the total rate."""
+        filled = len(self._filled)
+        if value < filled*self.gamma:
+            source, target = self._filled, self._empty
+            k = min(int(value/self.gamma),filled - 1)
+        else:
+            source, target = self._empty, self._filled
+            rate = (1 - filled/self._n)*self.mu
+            k = min(int((value - filled*self.gamma)/rate),len(source) - 1)
+        i = source[k]
+        last = source.pop()
+        if k < len(source): #swap the last node of the bucket into the gap
+            source[k] = last
+        target.append(i)
+        self._state[i] = 1 - self._state[i]
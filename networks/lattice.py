@@ -29,6 +29,8 @@ class Lattice(AbstractNetwork):
         self.z = height
         self.__names = names
         self.latticeProtect()
+        self.shape = (self.z,self.y,self.x)
+        self.periodic = False
         self.keys = list(range(self.nodeNumber()))
         self.autoCreate()
 
@@ -0,0 +1,300 @@
+"""
+Authors: Justin Pusztay
+Filename: masterequation.py
+Project: Research for Irina Mazilu, Ph.D.
+
+This file contains the MasterEquation class, which solves the dynamics of a
+small network exactly. Instead of sampling trials, it follows the
+probability of every one of the 2^n configurations of the n nodes, so the
+expected densities and correlations it gives carry no sampling noise. Only
+one node changes at a time, as in the sequential backend and in
+MonteCarlo.simulateKinetic, so from any configuration only n others can be
+reached and the transitions are applied without building a matrix.
+"""
+
+__author__ = "\n".join(['Justin Pusztay (pusztayj20@mail.wlu.edu)'])
+
+__all__ = ['MasterEquation']
+
+from .features import FeatureView
+from .kinetic import neighborLists, csrLists
+import math
+import numpy as np
+
+try:
+    import scipy.sparse as sparse
+except ImportError: #scipy is only needed for transitionMatrix
+    sparse = None
+
+class MasterEquation(object):
+    """
+    Probability distribution over the configurations of a network under the
+    'NN', 'TL', 'EI' or 'VOTE' rule.
+
+    Configuration x is the integer whose bit i is the state of the node at
+    position i of the node list, see nodeIndex. Every node i flips at a rate
+    r_i(x), the probability the rule gives it when it is picked.
+
+    A timestep is K picks, with K = n for the node rules and K = m, the
+    number of links, for 'EI', like in the sequential backend. A pick flips
+    node i with probability r_i(x)/K. With kinetic the configurations change
+    in continuous time at the rates r_i(x) instead, like in simulateKinetic.
+
+    Notes
+    -----
+    -> The rates are kept for every node and configuration, which takes
+       $O(n 2^n)$ memory, about 170 MB for 20 nodes, so networks are
+       limited to MAX_NODES = 20 nodes.
+    -> A node of degree 0 takes both neighbor fractions of 'VOTE' as 0,
+       like in MonteCarlo.simulateVote.
+    -> The node rules read the neighbors and degrees of the CSR arrays, like
+       neighborSums and degrees, so a directed link is only read by the
+       node it leaves. 'EI' treats every link as non-directed, like
+       edgeArray.
+    -> A pick has a runtime of $O(n 2^n)$, so a timestep is $O(K n 2^n)$.
+    -> The synchronous update of the numpy backend changes every node at
+       once, so its transitions are not sparse and it is not solved here.
+    """
+
+    RULES = ('NN','TL','EI','VOTE')
+    MAX_NODES = 20
+
+    def __init__(self,network,rule,alpha = .5,beta = .8,gamma = 0.0,
+                 mu = 0.3,r1 = 0.3,r2 = 0.5,function = None,
+                 kinetic = False):
+        """
+        Computes the rates of every node in every configuration.
+
+        Parameters
+        ----------
+        network: AbstractNetwork or ImplicitLattice
+           The 'VOTE' rule reads the 'beta' and 'phi' features of its nodes.
+        rule: str
+        alpha, beta, gamma, mu, r1, r2: float
+           The parameters of the rule, as in MonteCarlo.
+        function: callable, optional
+           A compiled probability function for 'NN', as in simulateNN.
+        kinetic: bool
+           Continuous time instead of picks, see evolve.
+
+        Raises
+        ------
+        ValueError: If the rule is not known or the network has more than
+                    MAX_NODES nodes.
+        """
+        if rule not in MasterEquation.RULES:
+            raise ValueError("Rule must be one of " + str(MasterEquation.RULES))
+        n = len(network)
+        if n > MasterEquation.MAX_NODES:
+            raise ValueError("The master equation needs 2^n states, use at "
+                             "most " + str(MasterEquation.MAX_NODES) + " nodes")
+        self.network = network
+        self.rule = rule
+        self.kinetic = kinetic
+        self.n = n
+        edges = network.edgeArray()
+        configurations = np.arange(2**n,dtype = np.int64)
+        def bits(i): #the state of node i in every configuration
+            return ((configurations >> i) & 1).astype(np.int16)
+        if rule != 'EI' and hasattr(network,'toCSR'): #follows directed links
+            indptr, indices = network.toCSR()
+            neighbors = csrLists(indptr,indices)
+            degree = np.diff(indptr)
+        else: #EI picks the non-directed links
+            neighbors = neighborLists(edges,n)
+            degree = np.bincount(edges.reshape(-1),minlength = n)
+        if rule == 'TL':
+            filled = np.zeros(2**n,dtype = np.int16)
+            for i in range(n):
+                filled += bits(i)
+            density = filled/max(n,1)
+        elif rule == 'VOTE':
+            betas = self.__featureArray('beta')
+            phis = self.__featureArray('phi')
+        self._rates = list()
+        for i in range(n): #only one node's sums are held at a time
+            d, state = degree[i], bits(i)
+            s = np.zeros(2**n,dtype = np.int16)
+            for j in neighbors[i]:
+                s += bits(j)
+            if rule == 'NN':
+                if function is not None:
+                    rate = function(a=alpha,b=beta,g=gamma,m=mu,s=s,n=state)
+                else:
+                    rate = gamma*state + (1 - state)*alpha*(beta**s)
+            elif rule == 'TL':
+                rate = gamma*state + (1 - state)*(1 - density)*mu
+            elif rule == 'EI': #picked by each of its d links at 1/(2m)
+                rate = (gamma*d*state + (1 - state)*(r1*s + r2*(d - s)))/2
+            else: #a node without neighbors takes both fractions as 0
+                rate = gamma*state*(phis[i]**((d - s)/max(d,1))) + \
+                       (1 - state)*alpha*(betas[i]**(s/max(d,1)))
+            self._rates.append(np.broadcast_to(rate,(2**n,)).astype(float))
+        self.picks = len(edges) if rule == 'EI' else n
+        self._total = sum(self._rates,np.zeros(2**n))
+        self._uniform = max(self.picks,float(self._total.max(initial = 0)))
+
+    def __featureArray(self,name):
+        """Returns a node feature as a float array in the order of the node
+        list."""
+        feature_d = self.network.getFeature(name)
+        if isinstance(feature_d,np.ndarray): #ImplicitLattice features
+            return feature_d.reshape(-1).astype(float)
+        if isinstance(feature_d,FeatureView) and feature_d.isComplete():
+            return feature_d.array().astype(float)
+        return np.array([feature_d[node] for node in self.network.nodes],
+                        dtype = float)
+
+    def distribution(self,initial):
+        """
+        Returns a distribution over the configurations.
+
+        Parameters
+        ----------
+        initial: array_like
+           Either the 0/1 states of the nodes in node order, such as
+           monte.history()[-1], which gives all the probability to that
+           configuration, or a distribution of length 2^n, which is copied.
+        """
+        initial = np.asarray(initial)
+        if len(initial) == 2**self.n:
+            return initial.astype(float)
+        p = np.zeros(2**self.n)
+        p[int(np.dot(initial.astype(np.int64),2**np.arange(self.n)))] = 1
+        return p
+
+    def pick(self,p,rate = None):
+        """
+        Returns the distribution after one step of the chain that flips node
+        i with probability r_i(x)/rate, by default 1/K of a timestep.
+
+        The probability flowing out of x through node i is added to
+        x ^ 2**i by viewing the arrays with bit i as a middle axis of length
+        2 and reversing that axis, so no index arrays are built.
+        """
+        scaled = p/(self.picks if rate is None else rate)
+        new = p - scaled*self._total
+        flow = np.empty_like(new)
+        for i,r in enumerate(self._rates):
+            np.multiply(scaled,r,out = flow)
+            new.reshape(-1,2,2**i)[:,::-1,:] += flow.reshape(-1,2,2**i)
+        return new
+
+    def evolve(self,p,duration = 1):
+        """
+        Returns the distribution after a number of timesteps.
+
+        Without kinetic a timestep is K picks. With kinetic the master
+        equation is solved by uniformization: the distribution at time t
+        is the average of the distributions after k steps of the pick chain
+        at the largest total rate, weighted by the Poisson probabilities of
+        k, which are summed until what is left is below 1e-12.
+        """
+        if not self.kinetic:
+            for _ in range(duration*self.picks):
+                p = self.pick(p)
+            return p
+        rate = self._uniform*duration
+        if rate == 0:
+            return p.copy()
+        step = p
+        weight = math.exp(-rate)
+        new = weight*step
+        left = 1 - weight
+        k = 0
+        while left > 1e-12 and k < rate + 50*math.sqrt(rate) + 50:
+            k += 1
+            step = self.pick(step,self._uniform)
+            weight *= rate/k
+            new += weight*step
+            left -= weight
+        return new
+
+    def means(self,p):
+        """Returns the probability that every node is filled, an array in
+        node order."""
+        return np.array([p.reshape(-1,2,2**i)[:,1,:].sum()
+                         for i in range(self.n)])
+
+    def pairMean(self,p,i,j):
+        """Returns the probability that the nodes at positions i and j are
+        both filled."""
+        axes = tuple(self.n - 1 - k for k in range(self.n) if k not in (i,j))
+        marginal = p.reshape((2,)*self.n).sum(axis = axes)
+        return marginal[1,1]
+
+    def solve(self,initial,steps,pairs = ()):
+        """
+        Propagates the distribution and measures it at every timestep.
+
+        Parameters
+        ----------
+        initial: array_like
+           The states at timestep 0 or a distribution, see distribution.
+        steps: int
+           The number of timesteps.
+        pairs: iterable of (node, node) tuples
+           The nodes whose connected correlation is measured, like
+           PairCorrelation.
+
+        Returns
+        -------
+        A (steps + 1, n) array with the expected state of every node, so
+        .mean(axis = 1) is the expected density, and a (steps + 1, pairs)
+        array with the correlation <s_i s_j> - <s_i><s_j> of every pair.
+        """
+        index = self.network.nodeIndex()
+        pairs = [(index[a],index[b]) for a,b in pairs]
+        means = np.zeros((steps+1,self.n))
+        correlations = np.zeros((steps+1,len(pairs)))
+        p = self.distribution(initial)
+        for t in range(steps+1):
+            if t:
+                p = self.evolve(p)
+            means[t] = self.means(p)
+            for k,(i,j) in enumerate(pairs):
+                correlations[t,k] = self.pairMean(p,i,j) - means[t,i]*means[t,j]
+        return means, correlations
+
+    def transitionMatrix(self,format = 'csr'):
+        """
+        Returns the matrix of the master equation as a scipy.sparse matrix,
+        with column x holding the transitions out of configuration x, so the
+        distribution moves as matrix @ p.
+
+        Without kinetic it is the matrix of one pick, which is stochastic.
+        With kinetic it is the generator, whose columns sum to 0, and
+        scipy.sparse.linalg.expm_multiply gives the distribution at any
+        time.
+
+        Raises
+        ------
+        ImportError: If scipy, an optional package, is not installed.
+
+        Notes
+        -----
+        -> The matrix has $(n + 1) 2^n$ entries, pick and evolve do the same
+           work without it.
+        """
+        if sparse is None:
+            raise ImportError("scipy is needed for the transition matrix, "
+                              "use pick or evolve")
+        size = 2**self.n
+        configurations = np.arange(size,dtype = np.int64)
+        rows = [configurations]
+        cols = [configurations]
+        if self.kinetic:
+            scale = 1
+            values = [-self._total]
+        else:
+            scale = self.picks
+            values = [1 - self._total/scale]
+        for i,r in enumerate(self._rates):
+            rows.append(configurations ^ (1 << i))
+            cols.append(configurations)
+            values.append(r/scale)
+        matrix = sparse.coo_matrix((np.concatenate(values),
+                                    (np.concatenate(rows),
+                                     np.concatenate(cols))),
+                                   shape = (size,size))
+        return matrix.asformat(format)
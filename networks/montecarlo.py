@@ -12,32 +12,60 @@ __author__ = "\n".join(['Justin Pusztay (pusztayj20@mail.wlu.edu)',
 
 __all__ = ['MonteCarlo']
 
-import random
-import xlsxwriter #http://xlsxwriter.readthedocs.io/tutorial01.html
 from .cayleytree import *
 from .lattice import *
+from .implicitlattice import ImplicitLattice
+from concurrent.futures import ThreadPoolExecutor
+from .history import History, HistoryView
+from .features import FeatureView
+from .results import Results, Sheet, writeExcel
+from .kinetic import KineticEngine, neighborLists, csrLists
+import math
 import numpy as np
-##from parser import Evaluator
 
 class MonteCarlo(object):
 
+    BACKENDS = ('python','numpy','sequential')
+
     def __init__(self, network,
                  alpha = .5, beta = .8, gamma = 0.0, mu = 0.3,
-                 r1 = 0.3, r2 = 0.5):
-        """Runs the Monte Carlo simulation the desired number of times."""
+                 r1 = 0.3, r2 = 0.5, backend = 'python', rng = None):
+        """Runs the Monte Carlo simulation the desired number of times.
+
+        The backend selects how a timestep is computed. The 'python' backend
+        visits the nodes one at a time. The 'numpy' backend updates every
+        node at once, using the CSR arrays of the network for the neighbor
+        sums and one batch of random numbers per timestep. Both read the
+        states of the previous timestep, a synchronous update, and for TL
+        both update the density after every change, in a random order. The
+        'sequential' backend is asynchronous: a timestep is n picks of a
+        random node, each updated at once and seen by the picks after it.
+
+        The rng can be a numpy Generator or a seed. Every random number of
+        the simulation is drawn from it, so seeded runs are reproducible and
+        parallel runs can each be given their own stream, see spawnSeeds."""
+        if backend not in MonteCarlo.BACKENDS:
+            raise ValueError("Backend must be one of " +
+                             str(MonteCarlo.BACKENDS))
         self.__network = network
-        self.__sim_data = list()
+        self.__history = None
         self.alpha = alpha
         self.beta = beta
         self.gamma = gamma
         self.mu = mu
         self.r1 = r1
         self.r2 = r2
+        self.backend = backend
+        self.rng = np.random.default_rng(rng)
+        self.__neighbors = (None,None) #link arrays and their reader lists
+        self.__implicit = None #ImplicitLattice used by checkerboard updates
 
 
     def getTimesteps(self): #needs to be looked at in 0 case
         """Returns the number of timesteps."""
-        return len(self.__sim_data)
+        if self.__history is None:
+            return 0
+        return len(self.__history)
 
     #Initial State Methods
     def startEmpty(self): #startEmpty
@@ -46,12 +74,12 @@ class MonteCarlo(object):
 
         Returns
         -------
-        self.__sim_data with a new dictionary with all the nodes with an initial
+        The history with a new dictionary with all the nodes with an initial
         empty state.
 
         Raises
         ------
-        ValueError: If size of self.__sim_data is not 0
+        ValueError: If the simulation already has data
 
         Notes
         -----
@@ -66,9 +94,9 @@ class MonteCarlo(object):
         >>> mc.startEmpty()
         {0:0,1:0,2:0,3:0}
         """
-        if len(self.__sim_data) == 0:
+        if self.getTimesteps() == 0:
             self.__network.addMultipleNodes(self.__network,state=0)
-            self.__sim_data.append(self.__network.getNodeFeature('state'))
+            self.__start()
         else:
             raise ValueError("Must clear data before setting initial state.")
 
@@ -78,12 +106,12 @@ class MonteCarlo(object):
 
         Returns
         -------
-        self.__sim_data with a new dictionary with all the nodes with an initial
+        The history with a new dictionary with all the nodes with an initial
         random state.
 
         Raises
         ------
-        ValueError: If size of self.__sim_data is not 0
+        ValueError: If the simulation already has data
 
         Notes
         -----
@@ -95,14 +123,13 @@ class MonteCarlo(object):
         --------
         >>> import Cayley as cy
         >>> mc = cy.MonteCarlo(Lattice(2,2))
-        >>> mc.randomDictionary()
+        >>> mc.startRandom()
         {0:1,1:0,2:1,3:0}
         """
-        if len(self.__sim_data) == 0:
+        if self.getTimesteps() == 0:
             for node in self.__network:
-                self.__network.add(node,state = random.randint(0,1))
-            self.__sim_data.append(self.__network.getNodeFeature('state'))
-            return  self.__sim_data
+                self.__network.add(node,state = int(self.rng.integers(2)))
+            return self.__start()
         else:
             raise ValueError("Must clear data before setting initial state.")
 
@@ -112,12 +139,12 @@ class MonteCarlo(object):
 
         Returns
         -------
-        self.__sim_data with a new dictionary with thee central node with
+        The history with a new dictionary with thee central node with
         an initial filled state and all other nodes with an empty state.
 
         Raises
         ------
-        ValueError: If size of self.__sim_data is not 0.
+        ValueError: If the simulation already has data.
         AttributeError: If network is not a Cayley Tree.
 
         Notes
@@ -134,57 +161,57 @@ class MonteCarlo(object):
         >>> mc.startEmpty()
         {0:1,1:0,2:0,3:0,4:0}
         """
-        if len(self.__sim_data) == 0:
+        if self.getTimesteps() == 0:
             self.__network.addMultipleNodes(self.__network,state=0)
             self.__network.add(0,state = 1)
-            self.__sim_data.append(self.__network.getNodeFeature('state'))
+            self.__start()
         else:
             raise ValueError("Must clear data before setting initial state.")
 
     def startUp(self):
         """Sets the inital state of all nodes to full or spin up."""
-        if len(self.__sim_data) == 0:
+        if self.getTimesteps() == 0:
             self.__network.addMultipleNodes(self.__network,state=1)
-            self.__sim_data.append(self.__network.getNodeFeature('state'))
+            self.__start()
         else:
             raise ValueError("Must clear data before setting initial state.")
 
     def startDown(self):
         """Sets the inital state of all nodes to spin down."""
-        if len(self.__sim_data) == 0:
+        if self.getTimesteps() == 0:
             self.__network.addMultipleNodes(self.__network,state=-1)
-            self.__sim_data.append(self.__network.getNodeFeature('state'))
+            self.__start()
         else:
             raise ValueError("Must clear data before setting initial state.")
 
     def randomSpins(self):
         """Sets the inital state of all nodes to either spin up or spin down."""
-        if len(self.__sim_data) == 0:
+        if self.getTimesteps() == 0:
             for node in self.__network:
-                self.__network.add(node,state = random.choice([-1,1]))
-            self.__sim_data.append(self.__network.getNodeFeature('state'))
+                self.__network.add(node,state = int(self.rng.choice([-1,1])))
+            self.__start()
         else:
             raise ValueError("Must clear data before setting initial state.")
 
     def senateDictionary(self, issue):
-        if len(self.__sim_data) == 0:
+        if self.getTimesteps() == 0:
             polarity = issue - 0.5
-            ideals = self.__network.getNodeFeature('ideology')
+            ideals = self.__network.getFeature('ideology')
             for node in self.__network:
                 eta = ideals[node] - self.getMedian()
                 probability = (eta*polarity + 0.34)/(0.68) ### CHANGE ###
-                if random.uniform(0, 1) <= probability:
+                if self.rng.random() <= probability:
                     vote = 1
                 else:
                     vote = 0
                 self.__network.add(node, state = vote)
-            self.__sim_data.append(self.__network.getNodeFeature('state'))
+            self.__start()
         else:
             raise ValueError("Must clear data before setting initial state.")
 
     def magnetization(self,nodes):
         """Adds magnetization to a certain group of nodes."""
-        if len(self.__sim_data) == 0:
+        if self.getTimesteps() == 0:
             self.__network.addMultipleNodes(nodes,magnetization=0)
         else:
             raise ValueError("Must clear data before setting initial state.")
@@ -193,6 +220,18 @@ class MonteCarlo(object):
         """Adds a temperature to a group of nodes."""
         self.__network.addMultipleNodes(nodes,temperature=temp)
 
+    def __start(self):
+        """Records the state feature of the network as the first timestep."""
+        self.__history = History(self.__network)
+        state = self.__network.getFeature('state')
+        if isinstance(state,np.ndarray): #ImplicitLattice features
+            self.__history.append(state.reshape(-1))
+        elif isinstance(state,FeatureView) and state.isComplete():
+            self.__history.append(state.array())
+        else:
+            self.__history.appendDict(state)
+        return self.allData()
+
     #Analysis Methods
     def getZeros(self,timestep):
         """Finds the number of nodes with in the empty state at any given
@@ -223,12 +262,12 @@ class MonteCarlo(object):
         >>> g.linkCreator('b','d')
         >>> g.linkCreator('c','d')
         >>> mc = cy.MonteCarlo(g)
-        >>> mc.randomDictionary()
+        >>> mc.startRandom()
         {'a': 1, 'b': 0, 'c': 1, 'd': 1}
         >>> mc.getZeros(0)
         1
         """
-        return len(self.__sim_data[timestep]) - self.getOnes(timestep)
+        return len(self.__history.nodes) - self.getOnes(timestep)
 
     def getOnes(self,timestep):
         """Finds the number of nodes with in the filled state at any given
@@ -259,12 +298,17 @@ class MonteCarlo(object):
         >>> g.linkCreator('b','d')
         >>> g.linkCreator('c','d')
         >>> mc = cy.MonteCarlo(g)
-        >>> mc.randomDictionary()
+        >>> mc.startRandom()
         {'a': 1, 'b': 0, 'c': 1, 'd': 1}
         >>> mc.getOnes(0)
         3
         """
-        return sum(self.__sim_data[timestep].values())
+        return self.__history.total(timestep)
+
+    def density(self,timestep):
+        """Returns the fraction of filled nodes at a timestep, a $O(1)$
+        lookup."""
+        return self.getOnes(timestep)/len(self.__history.nodes)
 
     def neighborSum(self,node,state_d):
         """Takes the node number and caculates the sum of the nearest nieghbors.
@@ -301,22 +345,22 @@ class MonteCarlo(object):
         >>> g.linkCreator('b','d')
         >>> g.linkCreator('c','d')
         >>> mc = cy.MonteCarlo(g)
-        >>> mc.randomDictionary()
+        >>> mc.startRandom()
         {'a': 1, 'b': 0, 'c': 1, 'd': 1}
         >>> mc.neighborSum('b')
         2
        """
         return sum([state_d.get(x)
-                    for x in self.__network.neighborFinder(node)])
+                    for x in self.__network.getNeighbors(node)])
 
     def previousNeighbors(self,node):
-        return sum([self.__simData[-1].get(x)
-                    for x in self.__network.neighborFinder(node)])
+        return sum([self.simData(-1).get(x)
+                    for x in self.__network.getNeighbors(node)])
 
     def neighborUnsum(self,node,state_d):
         """Returns sum(1-n) for nearest neighbors."""
         return sum([(1-state_d.get(x))
-                       for x in self.__network.neighborFinder(node)])
+                       for x in self.__network.getNeighbors(node)])
 
     def edgeSum(self,neighbor,timestep):
         """Gets the state of a node on an edge."""
@@ -326,6 +370,8 @@ class MonteCarlo(object):
         """Takes a generation and a state dictionary and returns the density
            of the generation."""
         try:
+            if hasattr(state_d,'array'): #views of the history array
+                return int(state_d.array()[self.__network.genSlice(gen)].sum())
             nodes = self.__network.nodesPerGen(gen)
             density = 0
             for node in nodes:
@@ -334,8 +380,14 @@ class MonteCarlo(object):
         except AttributeError:
             return "Inappropriate network type"
 
+    def generationalDensities(self):
+        """Returns a (timesteps, generations) array with the density of every
+           generation at every timestep, computed in one reduction over the
+           history. Only works on a Cayley Tree."""
+        return self.__network.generationSums(self.history())
+
     #Monte Carlo Algorithm methods
-    def simulateNN(self,function = 'g*n+(1-n)*a*(b^s)'):
+    def simulateNN(self,function = None):
         """A monte carlo method that runs a timestep of a simulation
         by visiting each node.
 
@@ -347,9 +399,17 @@ class MonteCarlo(object):
 
         This algorithm has a running time of $O(n)$ for $n$ nodes in a network.
 
+        Parameters
+        ----------
+        function: str, optional
+            A probability function such as 'g*n+(1-n)*a*(b^s)', compiled
+            once by the parser. The variables a, b, g and m are alpha, beta,
+            gamma and mu, n is the state of the node and s is the sum of its
+            neighbors. Defaults to that function written out in Python.
+
         Returns
         -------
-        self.__sim_data: a list containing the dictionaries of all the data
+        self.allData(): a list view containing the dictionaries of all the data
                          for each node generated by previous timesteps.
         Notes
         -----
@@ -374,61 +434,82 @@ class MonteCarlo(object):
                  mc.simulateNN()
         """
 
-        if len(self.__sim_data) == 0:
+        if self.getTimesteps() == 0:
             raise ValueError("Must set up initial state of simulation")
-        list_cache = self.__sim_data
+        if function is not None:
+            function = self.__compile(function)
+        if self.backend == 'numpy':
+            return self.__appendArray(self.__nnArray(function))
+        if self.backend == 'sequential':
+            return self.__appendArray(self.__sequentialArray('NN',function))
+        list_cache = self.allData()
         cache = dict()
         node_l = list(self.__network.getNodes())
-        random.shuffle(node_l)
+        self.rng.shuffle(node_l)
         for x in node_l:
             summ = self.neighborSum(x,list_cache[-1])
             #print("summ: ", summ)
-##            probability = evaluator(function,a=.5,b=.8,g=0,s=summ,
-##                                    n=list_cache[-1][x])
-##            print("Test: ",probability)
-##            probability = self.gamma*list_cache[-1][x] + \
-##                                    (1 - list_cache[-1][x])*\
-##                                    self.alpha*(self.beta**(summ))
-##            print("Proven: ",probability)
+            if function is not None:
+                probability = function(a=self.alpha,b=self.beta,
+                                       g=self.gamma,m=self.mu,s=summ,
+                                       n=list_cache[-1][x])
+            else:
+                probability = self.gamma*list_cache[-1][x] + \
+                                        (1 - list_cache[-1][x])*\
+                                        self.alpha*(self.beta**(summ))
             if list_cache[-1][x] == 0 and \
-               random.uniform(0, 1) <= probability:
+               self.rng.random() <= probability:
                 cache[x] = 1
             elif list_cache[-1][x] == 1 and \
-                 random.uniform(0, 1) <= probability:
+                 self.rng.random() <= probability:
                 cache[x] = 0
             else:
                 cache[x] = list_cache[-1][x]
         #print("cache: ",cache)
-        list_cache.append(cache)
-        self.__sim_data = list_cache
-        return self.__sim_data
+        self.__history.appendDict(cache)
+        return self.allData()
 
     def simulateEI(self):
         """Runs a timestep of a MonteCarlo by picking the edge and then a random
         node on the edge in order to use a probability function in oder to see a
-        change of state."""
-        if len(self.__sim_data) == 0:
+        change of state.
+
+        The links are visited in a random order and a node picked by more
+        than one link keeps the result of the first of them, in every
+        backend. With the numpy backend every link is handled at once."""
+        if self.getTimesteps() == 0:
             raise ValueError("Must set up initial state of simulation")
-        list_cache = self.__sim_data
-        cache = dict()
-        link_l = list(self.__network.linksAsTuples())
-        random.shuffle(link_l)
-        for x in link_l:
-            node_picked = random.randint(0,1)
+        if self.backend == 'numpy':
+            return self.__appendArray(self.__eiArray())
+        if self.backend == 'sequential':
+            return self.__appendArray(self.__sequentialArray('EI'))
+        list_cache = self.allData()
+        cache = list_cache[-1].copy() #nodes not picked keep their state
+        nodes = self.__network.getNodes()
+        link_l = self.__network.edgeArray().tolist()
+        order = list(range(len(link_l)))
+        self.rng.shuffle(order)
+        picked = set() #nodes already given a result this timestep
+        for i in order:
+            x = (nodes[link_l[i][0]],nodes[link_l[i][1]])
+            node_picked = int(self.rng.integers(2))
+            if x[node_picked] in picked: #the first link picking it wins
+                continue
+            picked.add(x[node_picked])
             summ = self.edgeSum(x[1-node_picked],list_cache[-1])
             #print("summ: ", summ)
             probability = self.gamma*list_cache[-1][x[node_picked]] + \
                                 (1 - list_cache[-1][x[node_picked]])*\
                                 (self.r1*summ + self.r2*(1 - summ))
             if list_cache[-1][x[node_picked]] == 0 and \
-               random.uniform(0, 1) <= probability:
+               self.rng.random() <= probability:
                 cache[x[node_picked]] = 1
                 #check to see if state of neighbor has changed before setting
                 #to original
                 if x[1-node_picked] not in cache:
                     cache[x[1-node_picked]] = list_cache[-1][x[1-node_picked]]
             elif list_cache[-1][x[node_picked]] == 1 and \
-                 random.uniform(0, 1) <= probability:
+                 self.rng.random() <= probability:
                 cache[x[node_picked]] = 0
                 if x[1-node_picked] not in cache:
                     cache[x[1-node_picked]] = list_cache[-1][x[1-node_picked]]
@@ -437,18 +518,25 @@ class MonteCarlo(object):
                 if x[1-node_picked] not in cache:
                     cache[x[1-node_picked]] = list_cache[-1][x[1-node_picked]]
         #print("cache: ",cache)
-        list_cache.append(cache)
-        self.__sim_data = list_cache
-        return self.__sim_data
+        self.__history.appendDict(cache)
+        return self.allData()
 
-    def simulateTL(self,timestep): #Only works for first timestep
+    def simulateTL(self,timestep,aggregate = False): #Only works for first timestep
         """Simulates the Monte Carlo simulation on the Cayley Tree for one
-           time step and stores that data."""
+           time step and stores that data.
+
+           The probability of a node depends only on its own state and the
+           density. With aggregate the numbers of 0 to 1 and 1 to 0 changes
+           are drawn from binomial distributions and only that many nodes,
+           picked at random, are changed. The density is held at its value
+           from the previous timestep, whatever the backend, while the
+           backends update it after every change. When only the density is
+           needed see simulateTLDensity."""
         #print("Timestep: " + str(timestep))
         #no_nodes = (self.__network.links*(self.__network.links-1)**(self.__network.generations-1))
-        if len(self.__sim_data) == 0:
+        if self.getTimesteps() == 0:
             raise ValueError("Must set up initial state of simulation")
-        list_cache = self.__sim_data
+        list_cache = self.allData()
         cache = {}
         nodes = len(self.__network)
         if timestep == 0:
@@ -456,145 +544,628 @@ class MonteCarlo(object):
         else:
             dens = self.getOnes(timestep)/nodes ### make sure this calls correct timestep
         #print("dens: " +str(dens))
+        if aggregate:
+            return self.__appendArray(self.__tlBinomial(dens))
+        if self.backend == 'numpy':
+            return self.__appendArray(self.__tlArray(dens))
+        if self.backend == 'sequential':
+            return self.__appendArray(self.__sequentialArray('TL'))
         node_l = list(self.__network.getNodes())
-        random.shuffle(node_l)
+        self.rng.shuffle(node_l)
         for x in node_l:
             probability = self.gamma*list_cache[-1][x] + \
                                     (1 - list_cache[-1][x])*(1-dens)*self.mu
             #print("probability: " +str(probability))
             if list_cache[-1][x] == 0 and \
-               random.uniform(0, 1) <= probability:
+               self.rng.random() <= probability:
                 cache[x] = 1
                 dens += 1/nodes
             elif list_cache[-1][x] == 1 and \
-                 random.uniform(0, 1) <= probability:
+                 self.rng.random() <= probability:
                 cache[x] = 0
                 dens -= 1/nodes
             else:
                 cache[x] = list_cache[-1][x]
         #print("cache: ",cache)
-        list_cache.append(cache)
-        self.__sim_data = list_cache
-        return self.__sim_data
+        self.__history.appendDict(cache)
+        return self.allData()
+
+    def simulateTLDensity(self,steps,observers = ()):
+        """
+        Runs the TL rule for a number of timesteps keeping only the number of
+        filled nodes, starting from the latest timestep. Each timestep draws
+        the number of nodes that fill and that empty from two binomial
+        distributions, with the density of the previous timestep, so it has
+        a runtime of $O(1)$ whatever the size of the network.
+
+        Parameters
+        ----------
+        steps: int
+           The number of timesteps to run.
+        observers: iterable of Observer objects
+           Updated with the density as timestep 0 and after every step, like
+           in run. Only observers of the density, like Density over every
+           node, make sense here.
+
+        Returns
+        -------
+        An array with the density at timesteps 0 to steps.
 
-    def simulateTemp(self, k = 1, J = 1): #J needs to be renamed.
+        Notes
+        -----
+        -> The states of the nodes are not known and the history is left
+           unchanged.
+        """
+        if self.getTimesteps() == 0:
+            raise ValueError("Must set up initial state of simulation")
+        observers = list(observers)
+        nodes = len(self.__history.nodes)
+        filled = self.getOnes(-1)
+        densities = np.zeros(steps+1)
+        densities[0] = filled/nodes
+        for t in range(1,steps+1):
+            dens = filled/nodes
+            filled += self.rng.binomial(nodes - filled,(1 - dens)*self.mu) - \
+                      self.rng.binomial(filled,self.gamma)
+            densities[t] = filled/nodes
+        for observer in observers:
+            for t,dens in enumerate(densities):
+                observer.add(t,dens)
+        return densities
+
+    def simulateTemp(self, k = 1, J = 1, checkerboard = False, threads = 1): #J needs to be renamed.
         """Simulates the Monte Carlo simulation on the Cayley Tree for one
            time step and stores that data. Uses temperature of nodes in
-           calculation of probabilty."""
-        if len(self.__sim_data) == 0:
+           calculation of probabilty.
+
+           With checkerboard set, the network must be a Lattice or an
+           ImplicitLattice. Its sites are split into two colours by the
+           parity of x + y + z and every site of one colour is updated in one
+           vectorized step, then every site of the other, using the states
+           the first colour just took. This gives the semantics of an
+           asynchronous sweep at array speed. threads splits each colour's
+           update into that many z-slabs run on a thread pool. Only the
+           numpy work on a slab releases the GIL, the python code around it
+           does not, so threads help only on lattices large enough for the
+           array operations to dominate. The default is one thread."""
+        if self.getTimesteps() == 0:
             raise ValueError("Must set up initial state of simulation")
-        list_cache = self.__sim_data
+        if checkerboard:
+            return self.__appendArray(self.__checkerboardArray(k,J,threads))
+        if self.backend == 'numpy':
+            return self.__appendArray(self.__tempArray(k,J))
+        if self.backend == 'sequential':
+            return self.__appendArray(self.__sequentialArray('TM',k = k,J = J))
+        list_cache = self.allData()
         cache = dict()
-        temps = self.__network.getNodeFeature('temperature')
+        temps = self.__network.getFeature('temperature')
         node_l = list(self.__network.getNodes())
-        random.shuffle(node_l)
+        self.rng.shuffle(node_l)
         for x in node_l:
             beta = (1/(k*temps[x]))
             summ = self.neighborSum(x,list_cache[-1])
             #print("summ: ", summ)
             probability = 0.5*(1-list_cache[-1][x]*np.tanh(beta*J*summ))
             if list_cache[-1][x] == -1 and \
-               random.uniform(0, 1) <= probability:
+               self.rng.random() <= probability:
                 cache[x] = 1
             elif list_cache[-1][x] == 1 and \
-                 random.uniform(0, 1) <= probability:
+                 self.rng.random() <= probability:
                 cache[x] = -1
             else:
                 cache[x] = list_cache[-1][x]
         #print("cache: ",cache)
-        list_cache.append(cache)
-        self.__sim_data = list_cache
-        return self.__sim_data
+        self.__history.appendDict(cache)
+        return self.allData()
 
     def simulateVote(self): ### Set up senate object with neighbors, alpha, beta, gamma, phi,
-        if len(self.__sim_data) == 0:  ### neighborSum function
+        """Simulates one timestep of the voting rule. The exponents are the
+           fractions of filled and empty neighbors, and a node without
+           neighbors takes both as 0, so it fills with probability alpha and
+           empties with probability gamma in every backend."""
+        if self.getTimesteps() == 0:  ### neighborSum function
             raise ValueError("Must set up initial state of simulation")
-        list_cache = self.__sim_data
+        if self.backend == 'numpy':
+            return self.__appendArray(self.__voteArray())
+        if self.backend == 'sequential':
+            return self.__appendArray(self.__sequentialArray('VOTE'))
+        list_cache = self.allData()
         cache = dict()
-        beta_d = self.__network.getNodeFeature('beta')
-        phi_d = self.__network.getNodeFeature('phi')
-        neigh_d = self.__network.getNodeFeature('neighbors')
+        beta_d = self.__network.getFeature('beta')
+        phi_d = self.__network.getFeature('phi')
+        neigh_d = self.__network.getFeature('neighbors')
         node_l = list(self.__network.getNodes())
-        random.shuffle(node_l)
+        self.rng.shuffle(node_l)
         for x in node_l:
             beta = beta_d[x]
             phi = phi_d[x]
             summ = self.neighborSum(x,list_cache[-1])
             unsumm = self.neighborUnsum(x,list_cache[-1])
-            probability = self.gamma*list_cache[-1][x]*(phi**(unsumm/len(neigh_d[x]))) + \
+            degree = max(len(neigh_d[x]),1) #an isolated node has fractions 0
+            probability = self.gamma*list_cache[-1][x]*(phi**(unsumm/degree)) + \
                                     (1 - list_cache[-1][x])*\
-                                    self.alpha*(beta**(summ/len(neigh_d[x])))
+                                    self.alpha*(beta**(summ/degree))
             if list_cache[-1][x] == 0 and \
-               random.uniform(0, 1) <= probability:
+               self.rng.random() <= probability:
                 cache[x] = 1
             elif list_cache[-1][x] == 1 and \
-                 random.uniform(0, 1) <= probability:
+                 self.rng.random() <= probability:
                 cache[x] = 0
             else:
                 cache[x] = list_cache[-1][x]
-        list_cache.append(cache)
-        self.__sim_data = list_cache
-        return self.__sim_data
+        self.__history.appendDict(cache)
+        return self.allData()
+
+    def simulateKinetic(self,rule = 'NN',steps = 1):
+        """
+        Runs a continuous time, rejection free simulation (Gillespie's
+        algorithm, or BKL) of the NN, EI or TL rule and records the states
+        at the end of each of the timesteps.
+
+        Every node changes state as a Poisson process whose rate per
+        timestep is the probability the discrete rule gives it, see
+        KineticEngine. Only changes are drawn, each in $O(d log(n))$ for a
+        node of degree d, so the cost follows the number of changes instead
+        of the number of nodes. This pays off when few nodes change per
+        timestep, at small gamma or near saturation.
+
+        Parameters
+        ----------
+        rule: str
+           'NN', 'EI' or 'TL'.
+        steps: int
+           The number of timesteps to record.
+
+        Returns
+        -------
+        self.allData(), like the discrete methods, so the analysis functions
+        read the recorded timesteps the same way.
+
+        Notes
+        -----
+        -> Changes within a timestep see each other at once, the
+           asynchronous semantics, unlike the discrete methods which read
+           the previous timestep.
+        """
+        if self.getTimesteps() == 0:
+            raise ValueError("Must set up initial state of simulation")
+        engine = KineticEngine(self.__network.edgeArray(),self.__stateArray(),
+                               rule,self.rng,self.alpha,self.beta,self.gamma,
+                               self.mu,self.r1,self.r2)
+        for t in range(steps):
+            engine.advance(1.0)
+            self.__history.append(engine.states())
+        return self.allData()
+
+    def run(self,steps,rule = 'NN',observers = (),record = True,**kwargs):
+        """
+        Runs a trial of the simulation for a number of timesteps, updating
+        the observers with every state.
+
+        Parameters
+        ----------
+        steps: int
+           The number of timesteps to run.
+        rule: str
+           'NN', 'EI', 'TL', 'TM' or 'VOTE' for simulateNN, simulateEI,
+           simulateTL, simulateTemp or simulateVote.
+        observers: iterable of Observer objects
+           Each one is updated with the current state as timestep 0 and then
+           after every step as timesteps 1 to steps.
+        record: bool
+           If False only the latest timestep is kept, so the memory used by
+           the run does not grow with the number of steps.
+        kwargs: keyword arguments, optional
+           Passed on to the rule, such as function for NN, aggregate for TL
+           or k and J for TM.
+
+        Returns
+        -------
+        The list of observers.
+
+        Raises
+        ------
+        ValueError: If there is no initial state or the rule is not known.
+
+        Notes
+        -----
+        -> Observers keep their samples between runs. Running many trials
+           into the same observers gives the mean and variance over trials
+           at every timestep, without keeping the histories.
+        """
+        if self.getTimesteps() == 0:
+            raise ValueError("Must set up initial state of simulation")
+        rules = {'NN': self.simulateNN, 'EI': self.simulateEI,
+                 'TL': self.simulateTL, 'TM': self.simulateTemp,
+                 'VOTE': self.simulateVote}
+        if rule not in rules:
+            raise ValueError("Rule must be one of " + str(sorted(rules)))
+        observers = list(observers)
+        fresh = self.getTimesteps() == 1
+        for observer in observers:
+            observer.update(0,self.__history.row(-1),self.__network)
+        for t in range(1,steps+1):
+            if rule == 'TL': #the first timestep of a new run uses density 0
+                rules[rule](0 if fresh and t == 1 else -1,**kwargs)
+            else:
+                rules[rule](**kwargs)
+            if not record:
+                self.__history.keepLast()
+            for observer in observers:
+                observer.update(t,self.__history.row(-1),self.__network)
+        return observers
+
+    #Vectorized timestep methods used by the numpy backend
+    def __stateArray(self):
+        """Returns the states of the last timestep as an array in the order
+        of the node list."""
+        return self.__history.row(-1)
+
+    def __featureArray(self,name):
+        """Returns a node feature as a float array in the order of the node
+        list."""
+        feature_d = self.__network.getFeature(name)
+        if isinstance(feature_d,np.ndarray): #ImplicitLattice features
+            return feature_d.reshape(-1).astype(float)
+        if isinstance(feature_d,FeatureView) and feature_d.isComplete():
+            return feature_d.array().astype(float)
+        return np.array([feature_d[node] for node in self.__history.nodes],
+                        dtype = float)
+
+    def __appendArray(self,states):
+        """Records an array of states as the next timestep."""
+        self.__history.append(states)
+        return self.allData()
+
+    def __flip(self,states,probability,flipped):
+        """Draws one uniform number per node and changes the state of the
+        nodes whose number is at most their probability."""
+        uniform = self.rng.random(len(states))
+        return np.where(uniform <= probability, flipped, states)
+
+    def __compile(self,function):
+        """Compiles a probability function string with the parser."""
+        from Cayley.parser.functions import compile_expression
+        return compile_expression(function)
+
+    def __nnArray(self,function = None):
+        """Nearest neighbor timestep for every node at once. A compiled
+        probability function is evaluated once for the whole array."""
+        state = self.__stateArray()
+        summ = self.__network.neighborSums(state)
+        if function is not None:
+            probability = function(a=self.alpha,b=self.beta,g=self.gamma,
+                                   m=self.mu,s=summ,n=state)
+        else:
+            probability = self.gamma*state + \
+                          (1 - state)*self.alpha*(self.beta**summ)
+        return self.__flip(state,probability,1 - state)
+
+    def __tlArray(self,dens):
+        """Total lattice timestep for every node at once, with the same
+        update as the python backend: the nodes are visited in a random
+        order and every change moves the density seen by the nodes after it.
+
+        A filled node empties with probability gamma whatever the density,
+        so those changes are drawn at once. The empty nodes are first
+        decided with the densities the current guess gives, and the guess is
+        kept up to the first node whose result differs. That node is
+        decided correctly, since every change before it is, so each pass
+        settles at least one more node. A change of the density by 1/n
+        rarely changes a result, so a timestep takes only a few passes."""
+        state = self.__stateArray()
+        n = len(state)
+        order = self.rng.permutation(n)
+        uniform = self.rng.random(n)
+        empty = state[order] == 0
+        down = ~empty & (uniform <= self.gamma)
+        up = np.zeros(n,dtype = bool)
+        filled = dens*n
+        start = 0
+        while start < n:
+            step = up[start:].astype(np.int64) - down[start:]
+            seen = (filled + np.cumsum(step) - step)/n #before each change
+            new = empty[start:] & (uniform[start:] <= (1 - seen)*self.mu)
+            wrong = np.flatnonzero(new != up[start:])
+            if len(wrong) == 0:
+                break
+            k = wrong[0]
+            up[start:] = new
+            filled += step[:k].sum() + int(new[k]) - int(down[start+k])
+            start += k + 1
+        cache = state.copy()
+        changed = order[up | down]
+        cache[changed] = 1 - state[changed]
+        return cache
+
+    def __tlBinomial(self,dens):
+        """Total lattice timestep that draws how many nodes change from two
+        binomial distributions and then which ones, without a random number
+        for every node."""
+        state = self.__stateArray()
+        filled = np.flatnonzero(state)
+        empty = np.flatnonzero(state == 0)
+        up = self.rng.binomial(len(empty),(1 - dens)*self.mu)
+        down = self.rng.binomial(len(filled),self.gamma)
+        cache = state.copy()
+        cache[self.rng.choice(empty,up,replace = False)] = 1
+        cache[self.rng.choice(filled,down,replace = False)] = 0
+        return cache
+
+    def __eiArray(self):
+        """Edge interval timestep for every link at once.
+
+        Every link picks one of its nodes, which reads the state of the node
+        on the other end. The links are given a random order by ranking them
+        with a permutation, and a node picked by several links keeps the
+        result of the first of them, the one with the lowest rank. Only
+        those first links are evaluated, so no state is written twice."""
+        state = self.__stateArray()
+        links = self.__network.edgeArray()
+        rank = self.rng.permutation(len(links))
+        picked = self.rng.integers(0,2,size = len(links)).astype(bool)
+        node = np.where(picked,links[:,1],links[:,0])
+        first = np.full(len(state),len(links),dtype = np.intp)
+        np.minimum.at(first,node,rank) #lowest rank picking each node
+        won = first[node] == rank
+        node = node[won]
+        other = np.where(picked[won],links[won,0],links[won,1])
+        summ = state[other]
+        probability = self.gamma*state[node] + \
+                      (1 - state[node])*(self.r1*summ + self.r2*(1 - summ))
+        cache = state.copy()
+        cache[node] = self.__flip(state[node],probability,1 - state[node])
+        return cache
+
+    def __tempArray(self,k,J):
+        """Temperature timestep for every node at once."""
+        state = self.__stateArray()
+        beta = 1/(k*self.__featureArray('temperature'))
+        summ = self.__network.neighborSums(state)
+        probability = 0.5*(1 - state*np.tanh(beta*J*summ))
+        return self.__flip(state,probability,-state)
+
+    def __checkerboardArray(self,k,J,threads):
+        """Two colour Glauber timestep on a lattice, split into z-slabs."""
+        network = self.__network
+        if network.getType() != "Lattice":
+            raise ValueError("Checkerboard updates need a Lattice")
+        if not isinstance(network,ImplicitLattice): #same numbering
+            network = self.__implicitLattice(network)
+        if not network.isBipartite():
+            raise ValueError("Periodic lattice with an odd side is not "
+                             "bipartite")
+        grid = self.__stateArray().reshape(network.shape).copy()
+        beta = (1/(k*self.__featureArray('temperature'))).reshape(network.shape)
+        uniform = self.rng.random(network.shape)
+        parity = network.parity()
+        bounds = np.linspace(0,network.z,min(max(threads,1),network.z)+1)
+        slabs = list(zip(bounds[:-1].astype(int),bounds[1:].astype(int)))
+
+        def update(slab,colour):
+            z0,z1 = slab
+            summ = network.slabNeighborSums(grid,z0,z1)
+            state = grid[z0:z1]
+            probability = 0.5*(1 - state*np.tanh(beta[z0:z1]*J*summ))
+            flip = (parity[z0:z1] == colour) & (uniform[z0:z1] <= probability)
+            state[flip] = -state[flip]
+
+        if len(slabs) == 1:
+            for colour in (0,1):
+                update(slabs[0],colour)
+        else:
+            with ThreadPoolExecutor(max_workers = len(slabs)) as pool:
+                for colour in (0,1):
+                    list(pool.map(update,slabs,[colour]*len(slabs)))
+        return grid.reshape(-1)
+
+    def __implicitLattice(self,lattice):
+        """Returns an ImplicitLattice with the dimensions of a Lattice,
+        built once and rebuilt only if the dimensions change."""
+        dimensions = (lattice.x,lattice.y,lattice.z,lattice.periodic)
+        if self.__implicit is None or self.__implicit[0] != dimensions:
+            self.__implicit = (dimensions,
+                               ImplicitLattice(lattice.x,lattice.y,lattice.z,
+                                               lattice.periodic))
+        return self.__implicit[1]
+
+    def __voteArray(self):
+        """Voting timestep for every node at once. Nodes of degree 0 get
+        neighbor fractions of 0 instead of nan."""
+        state = self.__stateArray()
+        beta = self.__featureArray('beta')
+        phi = self.__featureArray('phi')
+        degree = self.__network.degrees()
+        summ = self.__network.neighborSums(state)
+        unsumm = degree - summ
+        filled = np.divide(summ,degree,out = np.zeros(len(state)),
+                           where = degree > 0) #an isolated node has 0
+        unfilled = np.divide(unsumm,degree,out = np.zeros(len(state)),
+                             where = degree > 0)
+        probability = self.gamma*state*(phi**unfilled) + \
+                      (1 - state)*self.alpha*(beta**filled)
+        return self.__flip(state,probability,1 - state)
+
+    #Random sequential timestep used by the sequential backend
+    def __neighborLists(self):
+        """Returns, for every node, the nodes whose neighbor sums read its
+        state and the number of neighbors it reads, rebuilt only when the
+        links of the network change.
+
+        Both come from the CSR arrays, like neighborSums, so directed links
+        are followed the same way. An ImplicitLattice has only non-directed
+        links and uses its edge array."""
+        if hasattr(self.__network,'toCSR'):
+            links = self.__network.toCSR()
+            if self.__neighbors[0] is not links:
+                self.__neighbors = (links,(csrLists(*links,transpose = True),
+                                           np.diff(links[0]).tolist()))
+        else:
+            links = self.__network.edgeArray()
+            if self.__neighbors[0] is not links:
+                self.__neighbors = (links,
+                                    (neighborLists(links,len(self.__network)),
+                                     self.__network.degrees().tolist()))
+        return self.__neighbors[1]
+
+    def __sequentialArray(self,rule,function = None,k = 1,J = 1):
+        """
+        Random sequential timestep. n times a node is picked at random, with
+        replacement, and updated at once from the current states, so later
+        picks see the earlier changes. For EI, m times a link is picked and
+        then one of its ends.
+
+        The sums of the neighbor states are kept in an array for the whole
+        timestep. When a node changes only the sums of the nodes linked to
+        it are adjusted, following directed links backwards, so a pick is
+        $O(1)$ and a change $O(d)$ for d such nodes, instead of $O(d)$ for
+        every pick as with neighborSum.
+        """
+        state = self.__stateArray()
+        n = len(state)
+        readers, degrees = self.__neighborLists()
+        summ = np.asarray(self.__network.neighborSums(state)).reshape(-1).tolist()
+        state = state.astype(np.int64).tolist()
+        if rule == 'EI':
+            links = self.__network.edgeArray()
+            ends = self.rng.integers(0,2,size = len(links))
+            picks = self.rng.integers(0,max(len(links),1),size = len(links))
+            node = links[picks,ends].tolist()
+            other = links[picks,1 - ends].tolist()
+            uniform = self.rng.random(len(links)).tolist()
+            for x,y,u in zip(node,other,uniform):
+                s = state[x]
+                probability = self.gamma*s + \
+                              (1 - s)*(self.r1*state[y] + self.r2*(1 - state[y]))
+                if u <= probability:
+                    state[x] = 1 - s
+            return np.array(state,dtype = np.int8)
+        picks = self.rng.integers(0,max(n,1),size = n).tolist()
+        uniform = self.rng.random(n).tolist()
+        if rule == 'TM':
+            beta = (1/(k*self.__featureArray('temperature'))).tolist()
+        elif rule == 'VOTE':
+            beta = self.__featureArray('beta').tolist()
+            phi = self.__featureArray('phi').tolist()
+        filled = sum(state)
+        for i,u in zip(picks,uniform):
+            s = state[i]
+            if rule == 'NN':
+                if function is not None:
+                    probability = function(a=self.alpha,b=self.beta,
+                                           g=self.gamma,m=self.mu,s=summ[i],
+                                           n=s)
+                else:
+                    probability = self.gamma*s + \
+                                  (1 - s)*self.alpha*(self.beta**summ[i])
+            elif rule == 'TL':
+                probability = self.gamma*s + (1 - s)*(1 - filled/n)*self.mu
+            elif rule == 'TM':
+                probability = 0.5*(1 - s*math.tanh(beta[i]*J*summ[i]))
+            else:
+                degree = max(degrees[i],1) #an isolated node has 0
+                probability = self.gamma*s*(phi[i]**((degrees[i] - summ[i])/degree)) + \
+                              (1 - s)*self.alpha*(beta[i]**(summ[i]/degree))
+            if u <= probability:
+                flipped = -s if rule == 'TM' else 1 - s
+                state[i] = flipped
+                filled += flipped - s
+                for j in readers[i]:
+                    summ[j] += flipped - s
+        return np.array(state,dtype = np.int8)
 
     def clear(self):
         """Clears the data from the tree."""
-        self.__sim_data = list()
+        self.__history = None
+
+    def reserve(self,timesteps):
+        """Preallocates room for the given number of timesteps. Must be
+        called after an initial state method."""
+        self.__history.reserve(timesteps)
 
     #Data Export Methods
     def simData(self,timestep):
-        """Returns the sim data at a certain timestep."""
-        return self.__sim_data[timestep]
+        """Returns the sim data at a certain timestep, as a read only
+        dictionary view of the history array."""
+        return self.__history.view(timestep)
 
     def previousState(self,node):
         """Returns the state of the node from the previous timestep."""
-        return self.__sim_data[-1][node]
+        return self.simData(-1)[node]
 
     def allData(self):
-        return self.__sim_data
-
-    def sendExcel(self,filename = "monteCarloData.xlsx"):
-        """A file that sends the data ran from the most recent
-           MonteCarlo().simulate to an excel sheet. Must run the simulate
-           method in order to have this method work."""
-        if self.__sim_data == list():
+        """Returns a read only list view of the data, with one dictionary
+        view per timestep."""
+        return HistoryView(self.__history)
+
+    def history(self):
+        """Returns the (timesteps, nodes) int8 array of states. The columns
+        follow the order of the node list."""
+        return self.__history.array()
+
+    def __results(self):
+        """Returns the arrays and worksheet layouts of the most recent
+        simulation, shared by save and sendExcel."""
+        if self.getTimesteps() == 0:
             raise ValueError("No data to send to excel. Must run simulation")
-        workbook = xlsxwriter.Workbook(filename)
-        worksheet = workbook.add_worksheet("Monte Carlo Data")
-        worksheet.write(0,0,"Timestep")
+        timesteps = self.getTimesteps()
+        nodes = self.__history.nodes
+        keys = getattr(self.__network,'keys',nodes)
         try:
-            for x in self.__network:
-                worksheet.write(x+1,0,"Node "+ str(self.__network.keys[x]))
+            labels = ["Node "+ str(keys[node]) for node in nodes]
+            rows = np.arange(1,len(nodes)+1)
         except TypeError:
-            rank_d = self.__network.getNodeFeature('rank')
-            for x in self.__network:
-                worksheet.write(int(rank_d[x]),0,x)
-        for y in range(len(self.__sim_data[0])):
-            worksheet.write(0,y+1,str(y))
-        for y in range(len(self.__sim_data)):
-            try:
-                nodes = self.__network.getNodes()
-                for x in range(len(self.__network)):
-                    worksheet.write(x+1,y+1,self.__sim_data[y]
-                                    [nodes[x]])
-            except KeyError:
-                rank_d = self.__network.getNodeFeature('rank')
-                for x in self.__network:
-                    worksheet.write(int(rank_d[x]),\
-                                    y+1,self.__sim_data[y][x])
+            rank_d = self.__network.getFeature('rank')
+            labels = list(nodes)
+            rows = np.array([int(rank_d[node]) for node in nodes])
+        arrays = {'history': self.history(),
+                  'density': self.__history.totals()/len(nodes),
+                  'rows': rows}
+        data = Sheet("Monte Carlo Data")
+        data.write(0,0,"Timestep")
+        data.row(0,1,[str(y) for y in range(timesteps)])
+        data.table(0,0,[labels],transpose = True,rows = 'rows')
+        data.table(0,1,'history',transpose = True,rows = 'rows')
+        sheets = [data]
         if self.__network.getType() == "CayleyTree":
-            worksheet2 = workbook.add_worksheet("Density")
-            worksheet2.write(0,0,"Timestep")
-            for x in range(self.__network.generations+1):
-                worksheet2.write(x+1,0,"Gen. "+str(x))
-            for y in range(len(self.__sim_data[0])):
-                worksheet2.write(0,y+1,str(y))
-            for y in range(len(self.__sim_data)):
-                for x in range(self.__network.generations+1):
-                    worksheet2.write(x+1,y+1,self.density(x,self.__sim_data[y]))
-        worksheet3 = workbook.add_worksheet("Total Density")
-        worksheet3.write(0,0,'Timestep')
-        worksheet3.write(1,0,"Density")
-        for i in range(len(self.__sim_data)):
-            worksheet3.write(0,i+1,i)
-            worksheet3.write(1,i+1,self.getOnes(i)/len(self.__network))
-        workbook.close()
+            arrays['generations'] = self.generationalDensities()
+            density = Sheet("Density")
+            density.write(0,0,"Timestep")
+            density.column(1,0,["Gen. "+str(x) for x in
+                                range(self.__network.generations+1)])
+            density.row(0,1,[str(y) for y in range(timesteps)])
+            density.table(1,1,'generations',transpose = True)
+            sheets.append(density)
+        total = Sheet("Total Density")
+        total.column(0,0,['Timestep',"Density"])
+        total.row(0,1,list(range(timesteps)))
+        total.row(1,1,'density')
+        sheets.append(total)
+        return arrays,sheets
+
+    def save(self,path,**params):
+        """
+        Saves the most recent simulation as a Results directory: the
+        (timesteps, nodes) int8 history, the density of every timestep and,
+        on a Cayley Tree, the generation sums, as memory mappable .npy files.
+
+        The rates of the simulation and any keyword arguments are written to
+        the json sidecar, with the layout of sendExcel, so
+        Results(path).toExcel() writes the same workbook later.
+        """
+        arrays,sheets = self.__results()
+        settings = {'network': self.__network.getType(),
+                    'nodes': len(self.__history.nodes),
+                    'alpha': self.alpha,'beta': self.beta,
+                    'gamma': self.gamma,'mu': self.mu,
+                    'r1': self.r1,'r2': self.r2,'backend': self.backend}
+        settings.update(params)
+        return Results.save(path,arrays,settings,sheets)
+
+    def sendExcel(self,filename = "monteCarloData.xlsx"):
+        """A file that sends the data ran from the most recent
+           MonteCarlo().simulate to an excel sheet. Must run the simulate
+           method in order to have this method work. Large runs should be
+           kept with save instead, which has no row or column limits."""
+        arrays,sheets = self.__results()
+        writeExcel(filename,arrays,sheets)
@@ -0,0 +1,185 @@
+"""
+Authors: Justin Pusztay
+Filename: observers.py
+Project: Research for Irina Mazilu, Ph.D.
+
+This file contains observers, which measure a simulation as it runs instead
+of from its stored history. Every observer keeps a running mean and variance
+of its measurement for each timestep, updated with Welford's algorithm, so
+many trials can be averaged in $O(timesteps)$ memory. Observers are passed to
+MonteCarlo.run.
+"""
+
+__author__ = "\n".join(['Justin Pusztay (pusztayj20@mail.wlu.edu)'])
+
+__all__ = ['Observer','Density','GenerationalDensity','PairCorrelation']
+
+import numpy as np
+
+class Observer(object):
+    """
+    Running mean and variance, per timestep, of a measurement of the states.
+
+    Subclasses define measure, which turns the states of one timestep into
+    a number or an array. Calling update with the same timestep in many
+    trials accumulates one more sample for that timestep.
+
+    Notes
+    -----
+    -> Welford's update is used, so the variance does not lose precision
+       when the mean is large compared to the spread.
+    -> Room for timesteps doubles as needed, updating is $O(1)$ amortized
+       plus the cost of measure.
+    """
+
+    def __init__(self):
+        """Creates an observer with no samples."""
+        self._count = np.zeros(0,dtype = np.int64)
+        self._mean = None
+        self._m2 = None
+        self._size = 0
+
+    def __len__(self):
+        """Returns the number of timesteps with samples."""
+        return self._size
+
+    def measure(self,states,network):
+        """Returns the measurement of an array of states in node order."""
+        raise NotImplementedError
+
+    def update(self,timestep,states,network):
+        """Measures the states and adds the measurement as a sample of the
+        timestep."""
+        self.add(timestep,self.measure(states,network))
+
+    def _grow(self,capacity,shape):
+        """Makes room for capacity timesteps of values with the shape."""
+        count = np.zeros(capacity,dtype = np.int64)
+        mean = np.zeros((capacity,) + shape)
+        m2 = np.zeros((capacity,) + shape)
+        if self._mean is not None:
+            count[:len(self._count)] = self._count
+            mean[:len(self._mean)] = self._mean
+            m2[:len(self._m2)] = self._m2
+        self._count, self._mean, self._m2 = count, mean, m2
+
+    def add(self,timestep,value):
+        """
+        Adds a sample of the timestep.
+
+        Returns
+        -------
+        The difference between the value and the mean before the update,
+        which subclasses can use for further running sums.
+        """
+        value = np.asarray(value,dtype = float)
+        if timestep >= len(self._count):
+            self._grow(max(2*len(self._count),timestep+1,16),value.shape)
+        self._count[timestep] += 1
+        delta = value - self._mean[timestep]
+        self._mean[timestep] += delta/self._count[timestep]
+        self._m2[timestep] += delta*(value - self._mean[timestep])
+        self._size = max(self._size,timestep+1)
+        return delta
+
+    def count(self):
+        """Returns the number of samples of every timestep."""
+        return self._count[:self._size]
+
+    def mean(self):
+        """Returns the mean of every timestep, with the timesteps along the
+        first axis."""
+        return self._mean[:self._size]
+
+    def variance(self,ddof = 0):
+        """Returns the variance of every timestep. ddof = 1 gives the sample
+        variance. Timesteps with too few samples give nan."""
+        count = self.count().reshape((-1,) + (1,)*(self._m2.ndim - 1))
+        with np.errstate(divide = 'ignore',invalid = 'ignore'):
+            return np.where(count > ddof,self._m2[:self._size]/(count - ddof),
+                            np.nan)
+
+    def std(self,ddof = 0):
+        """Returns the standard deviation of every timestep."""
+        return np.sqrt(self.variance(ddof))
+
+    def clear(self):
+        """Forgets every sample."""
+        Observer.__init__(self)
+
+class Density(Observer):
+    """
+    Fraction of filled nodes, the mean of the states. nodes, positions in
+    the node list, limits the density to part of the network. For spins the
+    mean is the magnetization.
+    """
+
+    def __init__(self,nodes = None):
+        """Creates the observer, over every node when nodes is None."""
+        Observer.__init__(self)
+        self.nodes = nodes
+
+    def measure(self,states,network):
+        """Returns the mean state of the nodes."""
+        if self.nodes is None:
+            return states.mean()
+        return states[self.nodes].mean()
+
+class GenerationalDensity(Observer):
+    """Mean state of every generation of a Cayley Tree, measured as an
+    array indexed by generation."""
+
+    def measure(self,states,network):
+        """Returns the mean state of every generation."""
+        return network.generationSums(states)/np.diff(network.genOffsets())
+
+class PairCorrelation(Observer):
+    """
+    Connected correlation <s_i s_j> - <s_i><s_j> between the states of two
+    nodes, over trials, at every timestep.
+
+    The mean and variance are of the pair (s_i, s_j). The covariance is a
+    running co-moment updated alongside them.
+    """
+
+    def __init__(self,i,j,toSpins = False):
+        """Creates the observer for nodes i and j. With toSpins 0/1 states
+        are read as -1/1 spins, 2*s - 1."""
+        Observer.__init__(self)
+        self.pair = (i,j)
+        self.toSpins = toSpins
+        self._positions = None
+        self._comoment = np.zeros(0)
+
+    def measure(self,states,network):
+        """Returns the array (s_i, s_j)."""
+        if self._positions is None:
+            index = network.nodeIndex()
+            self._positions = [index[node] for node in self.pair]
+        values = states[self._positions].astype(float)
+        return 2*values - 1 if self.toSpins else values
+
+    def _grow(self,capacity,shape):
+        """Makes room for capacity timesteps, including the co-moment."""
+        comoment = np.zeros(capacity)
+        comoment[:len(self._comoment)] = self._comoment
+        self._comoment = comoment
+        Observer._grow(self,capacity,shape)
+
+    def add(self,timestep,value):
+        """Adds a sample of the pair and updates the co-moment."""
+        delta = Observer.add(self,timestep,value)
+        self._comoment[timestep] += delta[0]*(value[1] -
+                                              self._mean[timestep][1])
+        return delta
+
+    def correlation(self,ddof = 0):
+        """Returns the connected correlation of every timestep."""
+        count = self.count()
+        with np.errstate(divide = 'ignore',invalid = 'ignore'):
+            return np.where(count > ddof,
+                            self._comoment[:self._size]/(count - ddof),np.nan)
+
+    def clear(self):
+        """Forgets every sample."""
+        PairCorrelation.__init__(self,self.pair[0],self.pair[1],self.toSpins)
@@ -0,0 +1,258 @@
+"""
+Authors: Justin Pusztay
+Filename: results.py
+Project: Research for Irina Mazilu, Ph.D.
+
+This file contains the Results class, which stores the output of a simulation
+as a directory of numpy arrays, one .npy file per array, next to a
+results.json sidecar that holds the parameters of the run. The arrays are
+opened memory mapped, so a history larger than memory can be read a slice at
+a time. The sidecar can also describe worksheets, built with Sheet, which
+toExcel turns into the same workbooks the project has always written.
+"""
+
+__author__ = "\n".join(['Justin Pusztay (pusztayj20@mail.wlu.edu)'])
+
+__all__ = ['Results','Sheet','writeExcel']
+
+from collections.abc import Mapping
+import json
+import os
+import numpy as np
+
+try:
+    import xlsxwriter
+except ImportError:
+    xlsxwriter = None
+
+SIDECAR = "results.json"
+
+def _jsonable(value):
+    """Converts the numpy values json cannot write to python values."""
+    if isinstance(value,(np.generic,np.ndarray)):
+        return value.tolist()
+    if isinstance(value,(range,tuple,set)):
+        return list(value)
+    raise TypeError("Cannot write %r to json" % (value,))
+
+def _columnName(col):
+    """Returns the letters of a zero based column number, 27 -> 'AB'."""
+    name = ""
+    col += 1
+    while col:
+        col,rest = divmod(col - 1,26)
+        name = chr(ord('A') + rest) + name
+    return name
+
+class Sheet(object):
+    """
+    Layout of one worksheet. Every block is placed at a zero based
+    (row, column) cell, and its data is either the name of an array, read
+    from the arrays when the workbook is written, or a list of values.
+
+    Notes
+    -----
+    -> The layout is plain json, so it is kept in the sidecar of a Results
+       directory and the workbook can be written long after the run.
+    -> Rows and columns are written with one call each, not cell by cell.
+    """
+
+    def __init__(self,name):
+        """Creates an empty worksheet layout with the name."""
+        self.name = name
+        self.blocks = list()
+        self.charts = list()
+
+    def write(self,row,col,value):
+        """Writes a single value."""
+        self.blocks.append({'kind': 'cell','at': [row,col],'data': value})
+
+    def row(self,row,col,data):
+        """Writes a 1-dimensional array or list to the right of the cell."""
+        self.blocks.append({'kind': 'row','at': [row,col],'data': data})
+
+    def column(self,row,col,data):
+        """Writes a 1-dimensional array or list down from the cell."""
+        self.blocks.append({'kind': 'column','at': [row,col],'data': data})
+
+    def table(self,row,col,data,transpose = False,rows = None):
+        """
+        Writes a 2-dimensional array with its first entry at the cell.
+
+        Parameters
+        ----------
+        transpose: bool
+           Writes the lines of the array down the columns instead of along
+           the rows, so a (timesteps, nodes) history has a row per node.
+        rows: str or list, optional
+           The sheet row of every line, instead of one line per row down
+           from row.
+        """
+        self.blocks.append({'kind': 'table','at': [row,col],'data': data,
+                            'transpose': transpose,'rows': rows})
+
+    def chart(self,at,title,x_axis,y_axis,series,kind = 'line'):
+        """Inserts a chart at a cell given as a string like 'I8'. Each of
+        the series is the dictionary passed to xlsxwriter's add_series."""
+        self.charts.append({'at': at,'type': kind,'title': title,
+                            'x_axis': x_axis,'y_axis': y_axis,
+                            'series': list(series)})
+
+    def reference(self,row,first,last):
+        """Returns the formula reference to the cells of a row from column
+        first to column last, for chart series."""
+        return "=%s!$%s$%d:$%s$%d" % (self.name,_columnName(first),row+1,
+                                      _columnName(last),row+1)
+
+    def spec(self):
+        """Returns the layout as a json ready dictionary."""
+        return {'name': self.name,'blocks': self.blocks,
+                'charts': self.charts}
+
+    @classmethod
+    def fromSpec(cls,spec):
+        """Creates a layout from a dictionary made by spec."""
+        sheet = cls(spec['name'])
+        sheet.blocks = list(spec['blocks'])
+        sheet.charts = list(spec['charts'])
+        return sheet
+
+def writeExcel(filename,arrays,sheets):
+    """
+    Writes a workbook from worksheet layouts.
+
+    Parameters
+    ----------
+    filename: str
+       Name of the .xlsx file.
+    arrays: Mapping
+       The arrays the layouts refer to by name, a dictionary or a Results.
+    sheets: list of Sheet
+
+    Notes
+    -----
+    -> Needs xlsxwriter. Excel's limits of 1048576 rows and 16384 columns
+       apply to the workbook, not to the Results it is made from.
+    """
+    if xlsxwriter is None:
+        raise ImportError("Writing Excel files requires xlsxwriter")
+    def values(data):
+        if isinstance(data,str):
+            return np.asarray(arrays[data]).tolist()
+        return list(data)
+    workbook = xlsxwriter.Workbook(filename,{'nan_inf_to_errors': True})
+    for sheet in sheets:
+        worksheet = workbook.add_worksheet(sheet.name)
+        for block in sheet.blocks:
+            row,col = block['at']
+            if block['kind'] == 'cell':
+                value = block['data']
+                if isinstance(value,np.generic):
+                    value = value.item()
+                worksheet.write(row,col,value)
+            elif block['kind'] == 'row':
+                worksheet.write_row(row,col,values(block['data']))
+            elif block['kind'] == 'column':
+                worksheet.write_column(row,col,values(block['data']))
+            else:
+                table = np.asarray(arrays[block['data']]) \
+                        if isinstance(block['data'],str) \
+                        else np.asarray(block['data'])
+                if block['transpose']:
+                    table = table.T
+                lines = range(row,row + len(table)) \
+                        if block['rows'] is None else values(block['rows'])
+                for line,data in zip(lines,table):
+                    worksheet.write_row(int(line),col,data.tolist())
+        for spec in sheet.charts:
+            chart = workbook.add_chart({'type': spec['type']})
+            chart.set_title({'name': spec['title']})
+            chart.set_x_axis({'name': spec['x_axis']})
+            chart.set_y_axis({'name': spec['y_axis']})
+            for series in spec['series']:
+                chart.add_series(series)
+            worksheet.insert_chart(spec['at'],chart)
+    workbook.close()
+
+class Results(Mapping):
+    """
+    Arrays of a finished run, stored in a directory as .npy files, with the
+    parameters and worksheet layouts in a json sidecar.
+
+    The class is a read only dictionary from array names to arrays. Arrays
+    are loaded when first used and, by default, memory mapped.
+
+    Examples
+    --------
+    >>> import Cayley as cy
+    >>> results = cy.Results.save("run1",{'density': densities},
+    ...                           {'alpha': .5})
+    >>> cy.Results("run1")['density'][:10]
+    >>> cy.Results("run1").toExcel("run1.xlsx")
+    """
+
+    def __init__(self,path,mmap_mode = 'r'):
+        """Opens the results saved in the directory. mmap_mode is passed to
+        numpy.load, None reads the arrays into memory."""
+        self.path = path
+        with open(os.path.join(path,SIDECAR)) as file:
+            meta = json.load(file)
+        self.params = meta['params']
+        self.sheets = [Sheet.fromSpec(spec) for spec in meta['sheets']]
+        self._names = meta['arrays']
+        self._mmap_mode = mmap_mode
+        self._arrays = dict()
+
+    def __getitem__(self,name):
+        """Returns the array with the name."""
+        if name not in self._names:
+            raise KeyError(name)
+        if name not in self._arrays:
+            self._arrays[name] = np.load(os.path.join(self.path,name + ".npy"),
+                                         mmap_mode = self._mmap_mode)
+        return self._arrays[name]
+
+    def __iter__(self):
+        """Iterates over the names of the arrays."""
+        return iter(self._names)
+
+    def __len__(self):
+        """Returns the number of arrays."""
+        return len(self._names)
+
+    @classmethod
+    def save(cls,path,arrays,params = None,sheets = ()):
+        """
+        Writes the arrays and the sidecar to the directory, which is made if
+        needed, and returns the opened Results.
+
+        Parameters
+        ----------
+        path: str
+           The directory.
+        arrays: dict
+           Names, which must be usable as file names, mapped to arrays.
+        params: dict, optional
+           Parameters of the run, anything json can write.
+        sheets: list of Sheet, optional
+           Worksheet layouts for toExcel.
+        """
+        os.makedirs(path,exist_ok = True)
+        shapes = dict()
+        for name,array in arrays.items():
+            array = np.asarray(array)
+            np.save(os.path.join(path,name + ".npy"),array)
+            shapes[name] = {'shape': list(array.shape),'dtype': str(array.dtype)}
+        meta = {'params': dict(params or {}),'arrays': shapes,
+                'sheets': [sheet.spec() for sheet in sheets]}
+        with open(os.path.join(path,SIDECAR),'w') as file:
+            json.dump(meta,file,default = _jsonable)
+        return cls(path)
+
+    def toExcel(self,filename = None):
+        """Writes the worksheet layouts to a workbook, by default named
+        after the directory, and returns the file name."""
+        if filename is None:
+            filename = os.path.normpath(self.path) + ".xlsx"
+        writeExcel(filename,self,self.sheets)
+        return filename
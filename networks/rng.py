@@ -0,0 +1,42 @@
+"""
+Authors: Justin Pusztay
+Filename: rng.py
+Project: Research for Irina Mazilu, Ph.D.
+
+This file contains helpers for seeding simulations. Every simulation takes
+an rng, a numpy Generator or anything numpy.random.default_rng accepts. The
+helpers split one seed into independent streams, one per trial or worker,
+so parallel runs neither share nor collide in their random numbers.
+"""
+
+__author__ = "\n".join(['Justin Pusztay (pusztayj20@mail.wlu.edu)'])
+
+__all__ = ['spawnSeeds','spawnGenerators']
+
+import numpy as np
+
+def spawnSeeds(count,seed = None):
+    """
+    Returns count independent SeedSequence children of the seed.
+
+    Parameters
+    ----------
+    count: int
+       The number of streams, for example one per trial or worker.
+    seed: int, SeedSequence or None
+       The root seed. None takes fresh entropy from the operating system.
+
+    Notes
+    -----
+    -> SeedSequences are small and can be sent to worker processes, which
+       then make their Generator with numpy.random.default_rng.
+    -> The same seed and count always give the same streams.
+    """
+    if not isinstance(seed,np.random.SeedSequence):
+        seed = np.random.SeedSequence(seed)
+    return seed.spawn(count)
+
+def spawnGenerators(count,seed = None):
+    """Returns count independent numpy Generators made from the children of
+    the seed, see spawnSeeds."""
+    return [np.random.default_rng(child) for child in spawnSeeds(count,seed)]
@@ -1,6 +1,8 @@
 from Cayley.parser.abstractcollection import *
 from Cayley.parser.abstractstack import *
 from Cayley.parser.evaluator import *
+from Cayley.parser.expression import *
+from Cayley.parser.expressioncache import *
 from Cayley.parser.linkedstack import *
 from Cayley.parser.node import *
 from Cayley.parser.functions import *
@@ -0,0 +1,91 @@
+"""
+Author: Justin Pusztay
+File: expression.py
+Project: Research for Irina Mazilu, Ph.D.
+
+Contains the Expression class, which compiles an infix expression once and
+can then be evaluated many times, with numbers or numpy arrays plugged in
+for its variables.
+"""
+
+__author__ = "\n".join(['Justin Pusztay (pusztayj20@mail.wlu.edu)'])
+
+__all__ = ['Expression']
+
+import operator
+from Cayley.parser.tokens import Token
+from Cayley.parser.scanner import Scanner
+from Cayley.parser.translator import Translator
+
+class Expression(object):
+    """A compiled infix expression.
+
+    The expression is scanned and translated to postfix a single time, then
+    the postfix tokens are turned into a tree of Python functions. Calling
+    the expression only walks that tree, so the variables can be numpy
+    arrays and the whole array is evaluated in one call."""
+
+    OPERATORS = {Token.PLUS: operator.add,
+                 Token.MINUS: operator.sub,
+                 Token.MUL: operator.mul,
+                 Token.DIV: operator.truediv,
+                 Token.MOD: operator.mod,
+                 Token.POWER: operator.pow}
+
+    def __init__(self, sourceStr, floorDivision = False):
+        """Compiles the infix source string. With floorDivision '/' is the
+        floor division of the Evaluator instead of true division.
+        Raises: ValueError if the expression cannot be compiled."""
+        self._sourceStr = sourceStr
+        self._floorDivision = floorDivision
+        self._postfix = Translator(Scanner(sourceStr)).translate()
+        self._variables = set()
+        self._program = self._compile(self._postfix)
+
+    def _compile(self, postfix):
+        """Builds the function tree from the postfix tokens."""
+        stack = list()
+        for currentToken in postfix:
+            theType = currentToken.getType()
+            if theType in (Token.INT, Token.FLOAT):
+                value = currentToken.getValue()
+                stack.append(lambda env, value = value: value)
+            elif theType == Token.VAR:
+                name = currentToken.getValue()
+                self._variables.add(name)
+                stack.append(lambda env, name = name: env[name])
+            elif currentToken.isOperator() and len(stack) >= 2:
+                right = stack.pop()
+                left = stack.pop()
+                op = Expression.OPERATORS[theType]
+                if theType == Token.DIV and self._floorDivision:
+                    op = operator.floordiv
+                stack.append(lambda env, op = op, left = left, right = right:
+                             op(left(env), right(env)))
+            else:
+                raise ValueError("Cannot compile " + str(currentToken) +
+                                 " in " + self._sourceStr)
+        if len(stack) != 1:
+            raise ValueError("Malformed expression: " + self._sourceStr)
+        return stack.pop()
+
+    def __call__(self, **kwargs):
+        """Returns the value of the expression for the given variables.
+        The values can be numbers or numpy arrays that broadcast together.
+        Raises: ValueError if a variable has no value."""
+        try:
+            return self._program(kwargs)
+        except KeyError as e:
+            raise ValueError("No value given for variable " + str(e))
+
+    def __str__(self):
+        """Returns the infix source string."""
+        return self._sourceStr
+
+    def getVariables(self):
+        """Returns the set of variable names used by the expression."""
+        return set(self._variables)
+
+    def getPostfix(self):
+        """Returns the list of postfix tokens."""
+        return list(self._postfix)
@@ -0,0 +1,79 @@
+"""
+Author: Justin Pusztay
+File: expressioncache.py
+Project: Research for Irina Mazilu, Ph.D.
+
+Contains the ExpressionCache class, a least recently used cache of compiled
+expressions keyed by their source string.
+"""
+
+__author__ = "\n".join(['Justin Pusztay (pusztayj20@mail.wlu.edu)'])
+
+__all__ = ['ExpressionCache']
+
+from collections import OrderedDict
+from Cayley.parser.expression import Expression
+
+class ExpressionCache(object):
+    """A bounded cache of Expression objects.
+
+    Looking up an expression that is already cached is a dictionary lookup.
+    Otherwise the expression is compiled and stored, and the least recently
+    used expression is dropped once more than maxsize are held. The number
+    of hits and misses is counted. Every expression of a cache is compiled
+    with the same floorDivision, see Expression."""
+
+    def __init__(self, maxsize = 128, floorDivision = False):
+        """Sets the initial state of the cache.
+        Raises: ValueError if maxsize is less than 1."""
+        if maxsize < 1:
+            raise ValueError("Cache must hold at least one expression")
+        self._maxsize = maxsize
+        self._floorDivision = floorDivision
+        self._expressions = OrderedDict()
+        self.hits = self.misses = 0
+
+    def __len__(self):
+        """Returns the number of cached expressions."""
+        return len(self._expressions)
+
+    def __contains__(self, sourceStr):
+        """Returns True if the expression is cached, without counting it as a
+        use."""
+        return sourceStr in self._expressions
+
+    def get(self, sourceStr):
+        """Returns the compiled expression for the source string, compiling
+        it on a miss."""
+        try:
+            expression = self._expressions[sourceStr]
+        except KeyError:
+            self.misses += 1
+            expression = Expression(sourceStr, self._floorDivision)
+            self._expressions[sourceStr] = expression
+            if len(self._expressions) > self._maxsize:
+                self._expressions.popitem(last = False)
+            return expression
+        self.hits += 1
+        self._expressions.move_to_end(sourceStr)
+        return expression
+
+    def info(self):
+        """Returns a dictionary with the hits, misses, current size and
+        maximum size of the cache."""
+        return {'hits': self.hits, 'misses': self.misses,
+                'size': len(self), 'maxsize': self._maxsize}
+
+    def resize(self, maxsize):
+        """Changes the maximum size, dropping the least recently used
+        expressions if needed."""
+        if maxsize < 1:
+            raise ValueError("Cache must hold at least one expression")
+        self._maxsize = maxsize
+        while len(self._expressions) > maxsize:
+            self._expressions.popitem(last = False)
+
+    def clear(self):
+        """Empties the cache and resets the counters."""
+        self._expressions.clear()
+        self.hits = self.misses = 0
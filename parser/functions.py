@@ -11,27 +11,53 @@ equation by translating the function to postfix notation and evaluating it there
 
 __author__ = "\n".join(['Justin Pusztay (pusztayj20@mail.wlu.edu)'])
 
-__all__ = ['evaluator']
+__all__ = ['evaluator','compile_expression','expression_cache',
+           'evaluator_cache']
 
 from Cayley.parser.scanner import Scanner
 from Cayley.parser.translator import Translator
 from Cayley.parser.evaluator import Evaluator
+from Cayley.parser.expression import Expression
+from Cayley.parser.expressioncache import ExpressionCache
+
+#Compiled expressions of compile_expression, with true division
+expression_cache = ExpressionCache(maxsize = 128)
+#Compiled expressions of evaluator, with the floor division of Evaluator
+evaluator_cache = ExpressionCache(maxsize = 128, floorDivision = True)
 
 
 def evaluator(function,**kwargs):
-    """Plugs in values for the variables and then evaluates the expression."""
-    variables = findVariables(function)
-    variables.update(kwargs)
-    for var in variables:
-        function = function.replace(var,str(variables[var]))
+    """Plugs in values for the variables and then evaluates the expression.
+
+    '/' is floor division, as it has always been for the Evaluator, so
+    '1/2' is 0. Use compile_expression for true division.
+
+    The expression is compiled on its first use and kept in
+    evaluator_cache, so later calls with the same function string skip
+    scanning and translation. evaluator_cache.info() reports the hits and
+    misses.
+
+    Raises: ValueError naming the expression if it cannot be compiled or
+    evaluated, for example when a variable has no value."""
     try:
-        scanner = Scanner(function)
-        translator = Translator(scanner)
-        postfix = translator.translate()
-        evaluator = Evaluator(postfix)
-        return evaluator.evaluate()
+        return evaluator_cache.get(function)(**kwargs)
     except Exception as e:
-        print("Error:", e, translator.translationStatus())
+        raise ValueError("Cannot evaluate " + repr(function) + ": " +
+                         str(e)) from e
+
+def compile_expression(function):
+    """Parses the function once and returns a callable Expression. The
+    compiled expression comes from expression_cache when possible.
+
+    The callable takes the variables as keyword arguments, which can be
+    numbers or numpy arrays, so a rate can be evaluated for every node at
+    once. Division is true division, unlike the Evaluator.
+
+    >>> rate = compile_expression('g*n+(1-n)*a*(b^s)')
+    >>> rate(g=0,a=.5,b=.8,n=np.zeros(3),s=np.array([0,1,2]))
+    array([0.5 , 0.4 , 0.32])
+    """
+    return expression_cache.get(function)
 
 def findVariables(function):
     """Finds the variables in the probability function."""
@@ -1,2 +1,3 @@
 from Cayley.research.variables import *
 from Cayley.research.analysis import *
+from Cayley.research.rates import *
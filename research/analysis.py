@@ -22,12 +22,10 @@ def final_state(monte):
 def density_generations(network,monte):
     """Stores the density of a each generation in a list for each timestep."""
     # [Generation][Timestep] = density of generation at timestep
+    densities = monte.generationalDensities()
     density_generations = dict()
     for x in range(network.generations+1):
-        denstiy_timestep = dict()
-        for y in range(monte.getTimesteps()):
-            denstiy_timestep[y] =  monte.generationalDensity(x,monte.simData(y))
-        density_generations[x] = denstiy_timestep
+        density_generations[x] = dict(enumerate(densities[:,x].tolist()))
     return density_generations
             
 def correlation(network,monte,node,other_node):
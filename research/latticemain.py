@@ -55,9 +55,9 @@ def main():
           "Press 3 for only having the 0 node filled.")
     num_select = int(input("Starting state: "))
     if num_select == 1:
-        monte.emptyDictionary() #can change to other inital states
+        monte.startEmpty() #can change to other inital states
     elif num_select == 2:
-        monte.randomDictionary()
+        monte.startRandom()
     else:
         monte.zeroDictionary()
     for x in range(len(network)):
@@ -9,7 +9,6 @@ A file to run large numbers of trials for the lattice type network.
 import Cayley as cy
 import Cayley.graphics as cg
 import Cayley.research as cr
-import xlsxwriter as xl
 import time
 from math import sqrt
 timesteps = cr.variable('timesteps',int)
@@ -18,8 +17,10 @@ node_list = cr.variable('node_list',list,int)
 temp_d = cr.variable('temp_d',dict,float)
 
 
-def simulate(method, model, length, width, height, alpha, beta, gamma, mu, r1, r2,trials,k,J):
-    """The important one"""
+def simulate(method, model, length, width, height, alpha, beta, gamma, mu, r1, r2,trials,k,J,
+             excel = False):
+    """The important one. Saves the run as a Results directory, and with
+    excel writes the workbook from it as well."""
     length_tag = length
     width_tag = width
     height_tag = height
@@ -36,7 +37,6 @@ def simulate(method, model, length, width, height, alpha, beta, gamma, mu, r1, r
     network = cy.Lattice(length,width,height)
     monte = cy.MonteCarlo(network, alpha, beta, gamma, mu, r1, r2)
     run_time = time.time()
-    endcol = xl.utility.xl_col_to_name(timesteps+1)
 
     a_tag = "%.2f" % alpha
     b_tag = "%.2f" % beta
@@ -47,32 +47,33 @@ def simulate(method, model, length, width, height, alpha, beta, gamma, mu, r1, r
 
 
     if method == 'NN':
-        name = ("NN%dx%dx%d_%sα_%sβ_%sγ.xlsx" % (length_tag, width_tag, height_tag,
-                                                 a_tag, b_tag, g_tag))
+        name = ("NN%dx%dx%d_%sα_%sβ_%sγ" % (length_tag, width_tag, height_tag,
+                                             a_tag, b_tag, g_tag))
         tags = a_tag+'-'+b_tag+'-'+g_tag
     elif method == 'TL':
-        name = ("TL%dx%dx%d_%sμ_%sγ.xlsx" % (length_tag, width_tag, height_tag,
-                                                m_tag, g_tag))
+        name = ("TL%dx%dx%d_%sμ_%sγ" % (length_tag, width_tag, height_tag,
+                                        m_tag, g_tag))
         tags = m_tag+'-'+g_tag
     elif method == 'EI':
-        name = ("EI%dx%dx%d_%sr1_%sr2_%sγ.xlsx" % (length_tag, width_tag, height_tag,
-                                                      r1_tag, r2_tag, g_tag))
+        name = ("EI%dx%dx%d_%sr1_%sr2_%sγ" % (length_tag, width_tag, height_tag,
+                                                  r1_tag, r2_tag, g_tag))
         tags = r1_tag+'-'+r2_tag+'-'+g_tag
     elif method == 'TM':
         tag_list = ()
         for s in range(len(temp_d)):
             tag_list += ("%.2f"%temp_d[s],)
         tags = ("%s_"*(len(temp_d)-1)+"%s") %tag_list
-        name = ("TM%dx%dx%d_"%(length_tag,width_tag,height_tag)+tags+".xlsx")
+        name = ("TM%dx%dx%d_"%(length_tag,width_tag,height_tag)+tags)
     else: raise ValueError("Method not recognized")
     print("\n#### RUNNING SIMULATION %s ####\n"%(name))
 
-    workbook = xl.Workbook(name)
     #JKP: This all can be incorporated with new node feature ability
     density_list = dict() #[trial][timestep] stores overall densities
     state_collect = dict() #[trial] stores final state dictionaries
     node_d = dict() #[trial#][pair index][node index][timestep] stores node values
-    overtime = workbook.add_worksheet("Over_Time")
+    arrays = dict() # saved as .npy files, see cy.Results
+    overtime = cy.Sheet("Over_Time")
+    sheets = [overtime]
 
     for m in range(trials):
         density_list[m] = [0]*(timesteps+2)
@@ -81,8 +82,8 @@ def simulate(method, model, length, width, height, alpha, beta, gamma, mu, r1, r
         monte.clear()
         if method == 'TM': monte.randomSpins()
         else:
-            if initial_state == "empty": monte.emptyDictionary()
-            elif initial_state == "random": monte.randomDictionary()
+            if initial_state == "empty": monte.startEmpty()
+            elif initial_state == "random": monte.startRandom()
 
         if method == 'TM':
             iterate = len(temp_d)
@@ -141,15 +142,13 @@ def simulate(method, model, length, width, height, alpha, beta, gamma, mu, r1, r
 
         if trials <= 10: # Trial-by-trial is best for small sets
             if model == 'loop':
-                worksheet = workbook.add_worksheet("Data trial %d" % (i+1))
+                arrays['history_%d' % (i+1)] = monte.history()
+                worksheet = cy.Sheet("Data trial %d" % (i+1))
                 worksheet.write(0,0,"Timestep")
-                for x in network:## #
-                    worksheet.write(x+1,0,"Node "+str(x))
-                for y in range(monte.getTimesteps()): #JKP: Follows new updates
-                    worksheet.write(0,y+1,str(y))
-                for y in range(monte.getTimesteps()): #JKP: Follows new updates
-                    for x in network:
-                        worksheet.write(x+1,y+1,monte.simData(y)[x]) #JKP: Follows new updates
+                worksheet.column(1,0,["Node "+str(x) for x in network])## #
+                worksheet.row(0,1,[str(y) for y in range(monte.getTimesteps())])
+                worksheet.table(1,1,'history_%d' % (i+1),transpose = True)
+                sheets.append(worksheet)
 
         if (trials >= 100) and ((10*i)%trials == 0):
             try:
@@ -181,60 +180,52 @@ def simulate(method, model, length, width, height, alpha, beta, gamma, mu, r1, r
             n1_t[n][t] = (n2/trials)
 
     for n in range(len(node_list)): # For recording correlations
-        sheetname = ("Nodes_%d+%d" %(node_list[n][0],node_list[n][1]))
-        chartrange = '='+sheetname+'!$B$2:$'+endcol+'$2'
-        timerange = '='+sheetname+'!$B$2:$'+endcol+'$2'
-        corr_sheet = workbook.add_worksheet(sheetname)
+        label = "%d_%d" %(node_list[n][0],node_list[n][1])
+        arrays['pair_'+label] = [corr_t[n],prod_t[n],n0_t[n],n1_t[n]]
+        corr_sheet = cy.Sheet("Nodes_%d+%d" %(node_list[n][0],node_list[n][1]))
         corr_sheet.write(0,0,"Timestep")
         corr_sheet.write(1,0,"Correlation")
-        corr_sheet.write(5,0,"Product")
-        corr_sheet.write(6,0,"Node %d" %(node_list[n][0]))
-        corr_sheet.write(7,0,"Node %d" %(node_list[n][1]))
-        corr_chart = workbook.add_chart({'type':'line'})
-        corr_sheet.insert_chart('I8', corr_chart)
-        corr_chart.set_title({'name':'Correlation'})
-        corr_chart.set_x_axis({'name':'Timesteps'})
-        corr_chart.set_y_axis({'name':'Correlation'})
-        corr_chart.add_series({'values':chartrange,
-                               'name':'Correlation'})
-        for t in range(timesteps+1):
-            corr_sheet.write(0,t+1,t)
-            corr_sheet.write(1,t+1,corr_t[n][t])
-            corr_sheet.write(5,t+1,prod_t[n][t])
-            corr_sheet.write(6,t+1,n0_t[n][t])
-            corr_sheet.write(7,t+1,n1_t[n][t])
+        corr_sheet.column(5,0,["Product","Node %d" %(node_list[n][0]),
+                               "Node %d" %(node_list[n][1])])
+        corr_sheet.chart('I8','Correlation','Timesteps','Correlation',
+                         [{'values': corr_sheet.reference(1,1,timesteps+1),
+                           'name': 'Correlation'}])
+        corr_sheet.row(0,1,list(range(timesteps+1)))
+        corr_sheet.table(1,1,'pair_'+label,rows = [1,5,6,7])
+        sheets.append(corr_sheet)
     # Average density over time
     overtime.write(0,0,"Timestep")
     data_tag = name
     overtime.write(1,0,data_tag)
-    chartrange = '=Over_Time!$B$2:$'+endcol+'$2'
-    over_chart = workbook.add_chart({'type':'line'})
-    overtime.insert_chart('I8',over_chart)
-    over_chart.set_title({'name':'Density'})
-    over_chart.set_x_axis({'name':'Timesteps'})
-    over_chart.set_y_axis({'name':'Density'})
-    over_chart.add_series({'values':('=Over_Time!$B$2:$'+endcol+'$2'),
-                           'name':'=Over_Time!$A$2'})
-    over_chart.add_series({'values':('=Over_Time!$B$3:$'+endcol+'$3'),
-                           'name':'=Over_Time!$A$3'})
-    over_chart.add_series({'values':('=Over_Time!$B$4:$'+endcol+'$4'),
-                           'name':'=Over_Time!$A$4'})
+    overtime.chart('I8','Density','Timesteps','Density',
+                   [{'values': overtime.reference(row,1,timesteps+1),
+                     'name': '=Over_Time!$A$%d' % (row+1)}
+                    for row in (1,2,3)])
     if trials <= 10:
-        for t in range(trials):
-            overtime.write(t+5,0,"Trial "+str(t+1))
-            for m in range(timesteps+1):
-                overtime.write(t+5,m+1,density_list[t][m])
+        arrays['density_trials'] = [density_list[t][:timesteps+1]
+                                    for t in range(trials)]
+        overtime.column(5,0,["Trial "+str(t+1) for t in range(trials)])
+        overtime.table(5,1,'density_trials')
     else:
         overtime.write(6,0,"Trials: "+str(trials))
+    averages = list()
     for m in range(timesteps+1):
         t_sum = 0
-        overtime.write(0,m+1,m)
         for t in range(trials):
             t_sum += density_list[t][m]
-        t_av = t_sum/trials
-        overtime.write(1,m+1,t_av)
+        averages.append(t_sum/trials)
+    arrays['density'] = averages
+    overtime.row(0,1,list(range(timesteps+1)))
+    overtime.row(1,1,'density')
 
-    workbook.close()
+    params = {'method': method, 'model': model, 'length': length_tag,
+              'width': width_tag, 'height': height_tag, 'alpha': alpha,
+              'beta': beta, 'gamma': gamma, 'mu': mu, 'r1': r1, 'r2': r2,
+              'trials': trials, 'k': k, 'J': J, 'timesteps': timesteps,
+              'initial_state': initial_state, 'node_list': node_list}
+    results = cy.Results.save(name, arrays, params, sheets)
+    if excel:
+        results.toExcel(name+".xlsx")
 
 
 def main():
@@ -286,8 +277,10 @@ def main():
         else: k_c = J_c = 1
         alpha = beta = gamma = mu = r1 = r2 = 0
     else: raise ValueError("Method not recognized")
+    excel = input("Also write the Excel workbook? [Y/N] ").upper() == 'Y'
     start_time = time.time()
-    simulate(method, model, length, width, height, alpha, beta, gamma, mu, r1,r2,trials,k_c,J_c)
+    simulate(method, model, length, width, height, alpha, beta, gamma, mu, r1,r2,trials,k_c,J_c,
+             excel = excel)
     print("--- %s seconds ---" % (time.time() - start_time))
 
 if __name__ == '__main__':
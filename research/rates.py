@@ -0,0 +1,137 @@
+"""
+@author: Justin Pusztay
+Filename: rates.py
+Project: Research for Irina Mazilu, Ph.D.
+
+Mean field rate equations for the density of every generation of a Cayley
+Tree. All nodes of a generation have the same neighbors, one parent and
+links - 1 children, so the density of a generation changes with the
+densities of the generations next to it. Iterating the equations gives an
+approximation of what many Monte Carlo trials average to in a fraction of a
+second, to pick the parameters worth simulating.
+"""
+
+__author__ = "\n".join(['Justin Pusztay (pusztayj20@mail.wlu.edu)'])
+
+__all__ = ['RULES','rate_densities','rate_generations']
+
+import numpy as np
+
+RULES = ('NN','TL','EI')
+
+def _structure(network):
+    """Returns the number of nodes, parents and children of a node in every
+    generation of the Cayley Tree."""
+    sizes = np.array(network._nodeGeneration(),dtype = float)
+    parents = np.ones(len(sizes))
+    parents[0] = 0
+    children = np.full(len(sizes),float(network.links - 1))
+    children[0] = network.links
+    children[-1] = 0
+    return sizes,parents,children
+
+def _change(rho,rule,structure,kinetic,alpha,beta,gamma,mu,r1,r2):
+    """Returns the expected change of the density of every generation in
+    one timestep, or its rate of change for kinetic runs."""
+    sizes,parents,children = structure
+    parent = np.concatenate(([0.0],rho[:-1]))
+    child = np.concatenate((rho[1:],[0.0]))
+    if rule == 'NN': #neighbors filled independently, E[beta**s]
+        weight = (1 - (1 - beta)*parent)**parents * \
+                 (1 - (1 - beta)*child)**children
+        return (1 - rho)*alpha*weight - gamma*rho
+    if rule == 'TL':
+        density = np.dot(sizes,rho)/sizes.sum()
+        return (1 - rho)*(1 - density)*mu - gamma*rho
+    degree = parents + children
+    neighbor = np.divide(parents*parent + children*child,degree,
+                         out = np.zeros_like(rho),where = degree > 0)
+    if kinetic: #every link picks each of its ends at rate 1/2
+        updated = degree/2
+    else: #some link picks the node, in a timestep of the numpy backend
+        updated = 1 - 0.5**degree
+    return updated*((1 - rho)*(r1*neighbor + r2*(1 - neighbor)) - gamma*rho)
+
+def rate_densities(network,rule,steps,initial = 0.0,alpha = .5,beta = .8,
+                   gamma = 0.0,mu = 0.3,r1 = 0.3,r2 = 0.5,kinetic = False,
+                   substeps = 10):
+    """
+    Iterates the mean field equations of a rule on a Cayley Tree.
+
+    Parameters
+    ----------
+    network: CayleyTree
+    rule: str
+       'NN', 'TL' or 'EI'.
+    steps: int
+       The number of timesteps, as passed to MonteCarlo.run.
+    initial: float or array_like
+       The density at timestep 0, of the whole tree or of every generation.
+    alpha, beta, gamma, mu, r1, r2: float
+       The parameters of the rule, as in MonteCarlo.
+    kinetic: bool
+       If False a timestep is one synchronous update, as in the numpy
+       backend. If True the equations are integrated in continuous time, as
+       in MonteCarlo.simulateKinetic, with substeps Runge-Kutta steps per
+       unit of time.
+
+    Returns
+    -------
+    A (steps + 1, generations + 1) array with the expected density of every
+    generation at every timestep.
+
+    Notes
+    -----
+    -> Neighbors are taken to be filled independently of each other and of
+       the node, which ignores the correlations built up by the rules.
+       Expect the densities to be close, not exact, and to be best when
+       the rates are small.
+    -> The runtime is $O(steps*generations)$, whatever the number of
+       nodes.
+    -> The compiled probability functions of NN cannot be used, only the
+       alpha*beta**s rule.
+    """
+    if rule not in RULES:
+        raise ValueError("Rule must be one of " + str(RULES))
+    structure = _structure(network)
+    params = (alpha,beta,gamma,mu,r1,r2)
+    rho = np.zeros(len(structure[0]))
+    rho[:] = initial
+    densities = np.zeros((steps+1,len(rho)))
+    densities[0] = rho
+    h = 1/substeps
+    for t in range(1,steps+1):
+        if not kinetic:
+            rho = rho + _change(rho,rule,structure,False,*params)
+        else:
+            for _ in range(substeps):
+                k1 = _change(rho,rule,structure,True,*params)
+                k2 = _change(rho + h/2*k1,rule,structure,True,*params)
+                k3 = _change(rho + h/2*k2,rule,structure,True,*params)
+                k4 = _change(rho + h*k3,rule,structure,True,*params)
+                rho = rho + h/6*(k1 + 2*k2 + 2*k3 + k4)
+        densities[t] = rho
+    return densities
+
+def rate_generations(network,monte,rule,steps,kinetic = False):
+    """
+    Returns the table of density_generations, [generation][timestep], as
+    predicted by rate_densities, so it can stand in for a Monte Carlo run.
+    Like density_generations the entries are numbers of filled nodes, here
+    expected ones.
+
+    The parameters of the rule are read from monte, and the densities start
+    from its latest timestep, or from an empty tree if it has none.
+    """
+    sizes = np.array(network._nodeGeneration())
+    if monte.getTimesteps():
+        initial = network.generationSums(monte.history()[-1])/sizes
+    else:
+        initial = 0.0
+    densities = rate_densities(network,rule,steps,initial,monte.alpha,
+                               monte.beta,monte.gamma,monte.mu,monte.r1,
+                               monte.r2,kinetic)*sizes
+    density_generations = dict()
+    for x in range(network.generations+1):
+        density_generations[x] = dict(enumerate(densities[:,x].tolist()))
+    return density_generations
@@ -12,8 +12,9 @@ montecarlo.py.
 import Cayley as cy
 import Cayley.graphics as cg
 import Cayley.research as cr
-import xlsxwriter as xl
+import numpy as np
 import time
+from concurrent.futures import ProcessPoolExecutor
 from math import sqrt
 from Cayley.research import total_nodes
 
@@ -25,13 +26,17 @@ temp_d = cr.variable('temp_d', dict, float)
 ## # <-- indicates adjusted generations (account for last gen fluctuations)
 
 def simulate(method, generations, links, alpha, beta, gamma, mu, r1, r2,
-             trials,k,J):
-    """The important one"""
+             trials,k,J,rng = None,excel = False):
+    """The important one. Saves the run as a Results directory and returns a
+    dictionary with the name of the directory, the average density per
+    timestep, the average density per generation at the last timestep and
+    the correlations. The rng, a numpy Generator or seed, drives every
+    trial. With excel the workbook is written from the Results as well, it
+    can also be made later with cy.Results(name).toExcel()."""
     generations = generations + 1 ## #
     network = cy.CayleyTree(generations, links)
-    monte = cy.MonteCarlo(network, alpha, beta, gamma, mu, r1, r2)
+    monte = cy.MonteCarlo(network, alpha, beta, gamma, mu, r1, r2, rng = rng)
     run_time = time.time()
-    endcol = xl.utility.xl_col_to_name(timesteps+1)
 
     a_tag = "%.2f" % alpha
     b_tag = "%.2f" % beta
@@ -40,52 +45,49 @@ def simulate(method, generations, links, alpha, beta, gamma, mu, r1, r2,
     r1_tag = "%.2f" % r1
     r2_tag = "%.2f" % r2
 
-    # naming excel file
+    # naming results directory and excel file
     if method == 'NN':
-        name = ("NN%dGen_%dLin_%sα_%sβ_%sγ.xlsx" % (generations-1, links,
-                                                    a_tag, b_tag, g_tag))
+        name = ("NN%dGen_%dLin_%sα_%sβ_%sγ" % (generations-1, links,
+                                               a_tag, b_tag, g_tag))
         tags = a_tag+'-'+b_tag+'-'+g_tag
     elif method == 'TL':
-        name = ("TL%dGen_%dLin_%sμ_%sγ.xlsx" % (generations-1, links,
-                                                m_tag, g_tag))
+        name = ("TL%dGen_%dLin_%sμ_%sγ" % (generations-1, links,
+                                           m_tag, g_tag))
         tags = m_tag+'-'+g_tag
     elif method == 'EI':
-        name = ("EI%dGen_%dLin_%sr1_%sr2_%sγ.xlsx" % (generations-1, links,
-                                                      r1_tag, r2_tag, g_tag))
+        name = ("EI%dGen_%dLin_%sr1_%sr2_%sγ" % (generations-1, links,
+                                                 r1_tag, r2_tag, g_tag))
         tags = r1_tag+'-'+r2_tag+'-'+g_tag
     elif method == 'TM':
         tag_list = ()
         for s in range(len(temp_d)):
             tag_list += ("%.2f"%temp_d[s],)
         tags = ("%s_"*(len(temp_d)-1)+"%s") %tag_list
-        name = ("TM%dGen_%dLin_"%(generations-1,links)+tags+".xlsx")
+        name = ("TM%dGen_%dLin_"%(generations-1,links)+tags)
     else:
         raise ValueError("Method not recognized")
 
     print("\n#### RUNNING SIMULATION %s ####\n"%(name))
 
-    workbook = xl.Workbook(name)
-    #JKP: This all can be incorporated with new node feature ability
-    density_list = dict() #[trial][timestep] stores overall densities
-    # Key is trial number and then value is list of densities per timestep
-    state_collect = dict() #[trial] stores final state dictionaries
-    # key is trial number and value is simulation data from last timestep
-    dens_collect = dict() #[trial][generation] stores generational densities
-    # key is trial number and value is a list with densities for every generation at last timestep
-    node_d = dict() #[trial#][pair index][node index][timestep] stores node values
-    # key is trial number and value is 3 nested lists, first of which is pairs of nodes
-    # the second is the node numbers site and the third is the states of said node over
-    # each timestep
-    overtime = workbook.add_worksheet("Over_Time")
-    overall = workbook.add_worksheet("Overall")
-
-    for m in range(trials):
-        #adding a list with zeros of certain length(number of timesteps)
-        density_list[m] = [0]*(timesteps+2)
-
-    for m in range(trials):
-        #adding a list with zeros of certain length(number of timesteps)
-        dens_collect[m] = [0]*(generations)
+    count = total_nodes[generations-1][links] ## # adjusted, can't use len(monte.network)
+    sizes = np.diff(network.genOffsets()) # nodes per generation
+    record = trials <= 10 # Trial-by-trial is best for small sets
+    # Observers keep running means over the trials, one value per timestep,
+    # so nothing grows with the number of trials
+    density = cy.Density(slice(0,count))
+    gen_density = cy.GenerationalDensity()
+    pairs = [cy.PairCorrelation(pair[0],pair[1],toSpins = method != 'TM')
+             for pair in node_list] # states -1 and 1 for the correlations
+    observers = [density, gen_density] + pairs
+    kwargs = {'k': k, 'J': J} if method == 'TM' else {}
+    arrays = dict() # saved as .npy files, see cy.Results
+    density_trials = list() #[trial][timestep] stores overall densities
+    # only kept for the trial-by-trial sheets
+    final_gens = list() #[trial][generation] stores generational densities
+    # at the last timestep, only kept for the trial-by-trial sheets
+    overtime = cy.Sheet("Over_Time")
+    overall = cy.Sheet("Overall")
+    sheets = [overtime, overall]
 
     """
     Data generation begins here
@@ -100,69 +102,38 @@ def simulate(method, generations, links, alpha, beta, gamma, mu, r1, r2,
                 temp = temp_d[d%iterate]
                 network.addMultipleNodes(network.nodesPerGen(d),temperature=temp)
         else:
-            if initial_state == "empty": monte.emptyDictionary() #pulling from variables file
-            elif initial_state == "random": monte.randomDictionary()
+            if initial_state == "empty": monte.startEmpty() #pulling from variables file
+            elif initial_state == "random": monte.startRandom()
             elif initial_state == "zero": monte.zeroDictionary()
 
-        for t in range(timesteps+1):
-            if method == 'NN':
-                monte.simulateNN()
-            elif method == 'EI':
-                monte.simulateEI()
-            elif method == 'TL':
-                monte.simulateTL(t)
-            elif method == 'TM':
-                monte.simulateTemp(k,J)
-
-        ### FOR RECORDING DATA ###
-        state_collect[i] = monte.simData(monte.getTimesteps()-1) #JKP updated
-
-        #node_d is made here
-        node_d[i] = list()
-        for n in range(len(node_list)):
-            node_d[i].append([])
-            for f in range(len(node_list[n])):
-                node_d[i][n].append([])
-                for t in range(timesteps+1):
-                    if method == 'TM':
-                        node_d[i][n][f].append((monte.simData(t)[node_list[n][f]]))
-                    else:
-                        node_d[i][n][f].append(2*(monte.simData(t)[node_list[n][f]])-1)
-
-        #makes density_list
-        for y in range(monte.getTimesteps()): #JKP: Follows new updates
-            sum_t = 0 # Sum of relevant nodes at one timestep
-            for x in range(total_nodes[generations-1][links]): ## # gives adjusted, can't use len(monte.network)
-                sum_t += monte.simData(y)[x] #JKP: Follows new updates
-            dens_t = sum_t/total_nodes[generations-1][links] ## # Density at one timestep
-            density_list[i][y] = dens_t
-
-        # not sure if it works
+        monte.run(timesteps+1, method, observers, record, **kwargs)
+
         """
         Looks at things tril by trials and makes things easier to look at
         """
-        if trials <= 10: # Trial-by-trial is best for small sets
-            worksheet = workbook.add_worksheet("Data trial %d" % (i+1))
+        if record:
+            states = monte.history()
+            density_trials.append(states[:,:count].mean(axis = 1))
+            gens = network.generationSums(states)/sizes
+            final_gens.append(gens[-1][:generations])
+            arrays['history_%d' % (i+1)] = states[:,:count] ## #
+            arrays['gens_%d' % (i+1)] = gens[:,:generations] ## #
+
+            worksheet = cy.Sheet("Data trial %d" % (i+1))
             worksheet.write(0,0,"Timestep")
-            for x in range(total_nodes[generations-1][links]):## #
-                worksheet.write(x+1,0,"Node "+str(x))
-            for y in range(monte.getTimesteps()): #JKP: Follows new updates
-                worksheet.write(0,y+1,str(y))
-            for y in range(monte.getTimesteps()): #JKP: Follows new updates
-                for x in range(total_nodes[generations-1][links]):
-                    worksheet.write(x+1,y+1,monte.simData(y)[x]) #JKP: Follows new updates
-
-            worksheet2 = workbook.add_worksheet("Density trial %d" % (i+1))
+            worksheet.column(1,0,["Node "+str(x) for x in range(count)]) ## #
+            worksheet.row(0,1,[str(y) for y in range(monte.getTimesteps())])
+            worksheet.table(1,1,'history_%d' % (i+1),transpose = True)
+
+            worksheet2 = cy.Sheet("Density trial %d" % (i+1))
             worksheet2.write(0,0,"Timestep")
             worksheet2.write(network.generations+1,0,"Density") ## #   #JKP: update
-            for x in range(network.generations): ## #  #JKP: follows update
-                worksheet2.write(x+1,0,"Gen. "+str(x))
-            for y in range(timesteps+1):
-                worksheet2.write(0,y+1,str(y))
-            for y in range(monte.getTimesteps()): #JKP: Follows new updates
-                for x in range(network.generations+1): #JKP: Follows new updates
-                    worksheet2.write(x+1,y+1,monte.density(x,monte.simData(y)))
-                worksheet2.write(network.generations+1,y+1,density_list[i][y]) ## #
+            worksheet2.column(1,0,["Gen. "+str(x) for x in
+                                   range(network.generations)]) ## #
+            worksheet2.row(0,1,[str(y) for y in range(timesteps+1)])
+            worksheet2.table(1,1,'gens_%d' % (i+1),transpose = True)
+            worksheet2.row(network.generations+1,1,list(density_trials[i])) ## #
+            sheets += [worksheet, worksheet2]
 
         # recording time for trials 
         if (trials >= 100) and ((10*i)%trials == 0):
@@ -174,79 +145,53 @@ def simulate(method, generations, links, alpha, beta, gamma, mu, r1, r2,
     #big trial loop ends here
 
     corr_t = dict() #[pair index][timestep]
-    for n in range(len(node_list)):
-        corr_t[n] = [0]*(timesteps+1)
-        for t in range(timesteps+1):
-            sum_prod = 0
-            n1 = 0
-            n2 = 0
-            for i in range(trials):
-                sum_prod += (node_d[i][n][0][t])*(node_d[i][n][1][t])
-                n1 += node_d[i][n][0][t]
-                n2 += node_d[i][n][1][t]
-            corr_t[n][t] = (sum_prod/trials)-(n1/trials)*(n2/trials)
-
     for n in range(len(node_list)): # For recording correlations
-        sheetname = ("Nodes_%d+%d" %(node_list[n][0],node_list[n][1]))
-        chartrange = '='+sheetname+'!$B$2:$'+endcol+'$2'
-        timerange = '='+sheetname+'!$B$2:$'+endcol+'$2'
-        corr_sheet = workbook.add_worksheet(sheetname)
+        corr_t[n] = list(pairs[n].correlation()[:timesteps+1])
+        label = "%d+%d" %(node_list[n][0],node_list[n][1])
+        arrays['correlation_'+label.replace('+','_')] = corr_t[n]
+        corr_sheet = cy.Sheet("Nodes_"+label)
         corr_sheet.write(0,0,"Timestep")
         corr_sheet.write(1,0,"Correlation")
-        corr_chart = workbook.add_chart({'type':'line'})
-        corr_sheet.insert_chart('I8', corr_chart)
-        corr_chart.set_title({'name':'Correlation'})
-        corr_chart.set_x_axis({'name':'Timesteps'})
-        corr_chart.set_y_axis({'name':'Correlation'})
-        corr_chart.add_series({'values':chartrange,
-                               'name':'Correlation'})
-        for t in range(timesteps+1):
-            corr_sheet.write(0,t+1,t)
-            corr_sheet.write(1,t+1,corr_t[n][t])
+        corr_sheet.chart('I8','Correlation','Timesteps','Correlation',
+                         [{'values': corr_sheet.reference(1,1,timesteps+1),
+                           'name': 'Correlation'}])
+        corr_sheet.row(0,1,list(range(timesteps+1)))
+        corr_sheet.row(1,1,'correlation_'+label.replace('+','_'))
+        sheets.append(corr_sheet)
 
 
     ### FOR RECORDING OVERALL DATA ###
     overall.write(0,0,"Generation") # For steady-state analysis
-    for x in range(generations):
-        overall.write(x+1,0,"Gen. "+str(x))
+    overall.column(1,0,["Gen. "+str(x) for x in range(generations)])
     overall.write(0,1,"Average")
     overall.write(0,2,"Std Dev")
 
-    for x in range(generations):
-        if x == 0:
-            for y in range(trials):
-                dens_collect[y][x] = monte.density(x,state_collect[y])
-        else:
-            for y in range(trials):
-                dens_collect[y][x] = monte.density(x,state_collect[y])/ \
-                                     ((links)*(links-1)**(x-1))
-
     if trials <= 10: # Densities per gen for individual trials
-        for y in range(trials):
-            overall.write(0,y+4,"Trial "+str(y+1))
-            overall.write(generations+1,y+4,density_list[y][timesteps])
-        for x in range(generations):
-            for y in range(trials):
-                overall.write(x+1,y+4,dens_collect[y][x])
-
+        arrays['density_trials'] = [trial[:timesteps+1] for trial in
+                                    density_trials]
+        arrays['final_gens'] = final_gens
+        overall.row(0,4,["Trial "+str(y+1) for y in range(trials)])
+        overall.row(generations+1,4,[density_trials[y][timesteps]
+                                     for y in range(trials)])
+        overall.table(1,4,'final_gens',transpose = True)
+
+    arrays['gen_density'] = gen_density.mean()
+    gen_averages = list(gen_density.mean()[-1][:generations])
+    deviations = list()
     for x in range(generations): # Average density per generation
-        list_gen = [] # Temporary variable
-        for y in range(trials):
-            list_gen.append(dens_collect[y][x])
-        av = sum(list_gen)/(trials)
+        av = gen_averages[x]
         if method == 'TM':
             av = (av+1)/2
         SD = sqrt((av)*(1-av)/total_nodes[generations-1][links])
         if method == 'TM':
             SD *= 2
-        overall.write(x+1,1,str(av))
-        overall.write(x+1,2,str(SD))
+        deviations.append((str(av),str(SD)))
+    overall.table(1,1,deviations)
 
     overall.write(generations+1,0,"Total")
-    tot_sum = 0
-    for c in range(trials):
-        tot_sum += density_list[c][timesteps]
-    tot_av = tot_sum/trials
+    arrays['density'] = density.mean()[:timesteps+1]
+    averages = list(arrays['density'])
+    tot_av = averages[timesteps]
     if method == 'TM':
         tot_av = (tot_av+1)/2
     SD_all = sqrt((tot_av)*(1-tot_av)/(trials*total_nodes[generations-1][links]))
@@ -259,47 +204,80 @@ def simulate(method, generations, links, alpha, beta, gamma, mu, r1, r2,
     overtime.write(0,0,"Timestep")
     data_tag = method+" "+str(generations)+" "+str(links)+" "+tags
     overtime.write(1,0,data_tag)
-    chartrange = '=Over_Time!$B$2:$'+endcol+'$2'
-    over_chart = workbook.add_chart({'type':'line'})
-    overtime.insert_chart('I8',over_chart)
-    over_chart.set_title({'name':'Density'})
-    over_chart.set_x_axis({'name':'Timesteps'})
-    over_chart.set_y_axis({'name':'Density'})
-    over_chart.add_series({'values':('=Over_Time!$B$2:$'+endcol+'$2'),
-                           'name':'=Over_Time!$A$2'})
-    over_chart.add_series({'values':('=Over_Time!$B$3:$'+endcol+'$3'),
-                           'name':'=Over_Time!$A$3'})
-    over_chart.add_series({'values':('=Over_Time!$B$4:$'+endcol+'$4'),
-                           'name':'=Over_Time!$A$4'})
+    overtime.chart('I8','Density','Timesteps','Density',
+                   [{'values': overtime.reference(row,1,timesteps+1),
+                     'name': '=Over_Time!$A$%d' % (row+1)}
+                    for row in (1,2,3)])
     if trials <= 10:
-        for t in range(trials):
-            overtime.write(t+3,0,"Trial "+str(t+1))
-            for m in range(timesteps+1):
-                overtime.write(t+3,m+1,density_list[t][m])
+        overtime.column(3,0,["Trial "+str(t+1) for t in range(trials)])
+        overtime.table(3,1,'density_trials')
         if method == 'TM':
-            overtime.write(6,1,"k: "%(k))
-            overtime.write(6,2,"J: "%(J))
-            for i in range(generations+1):
-                overtime.write(i+6+trials,0,"Generation: "+str(i))
-                overtime.write(i+6+trials,1,str(temp_d[i]))
+            overtime.write(6,1,"k: "+str(k))
+            overtime.write(6,2,"J: "+str(J))
+            overtime.column(6+trials,0,["Generation: "+str(i)
+                                        for i in range(generations+1)])
+            overtime.column(6+trials,1,[str(temp_d[i])
+                                        for i in range(generations+1)])
     else:
         overtime.write(6,0,"Trials: "+str(trials))
         if method == 'TM':
             overtime.write(6,1,"k: "+str(k))
             overtime.write(6,2,"J: "+str(J))
             overtime.write(8,0,"Temperatures")
-            for i in range(generations+1):
-                overtime.write(i+9,0,"Gen: "+str(i))
-                overtime.write(i+9,1,str(temp_d[i%len(temp_d)]))
-    for m in range(timesteps+1):
-        t_sum = 0
-        overtime.write(0,m+1,m)
-        for t in range(trials):
-            t_sum += density_list[t][m]
-        t_av = t_sum/trials
-        overtime.write(1,m+1,t_av)
-
-    workbook.close()
+            overtime.column(9,0,["Gen: "+str(i) for i in range(generations+1)])
+            overtime.column(9,1,[str(temp_d[i%len(temp_d)])
+                                 for i in range(generations+1)])
+    overtime.row(0,1,list(range(timesteps+1)))
+    overtime.row(1,1,'density')
+
+    params = {'method': method, 'generations': generations-1, 'links': links,
+              'alpha': alpha, 'beta': beta, 'gamma': gamma, 'mu': mu,
+              'r1': r1, 'r2': r2, 'trials': trials, 'k': k, 'J': J,
+              'timesteps': timesteps, 'initial_state': initial_state,
+              'node_list': node_list, 'temp_d': temp_d}
+    results = cy.Results.save(name, arrays, params, sheets)
+    if excel:
+        results.toExcel(name+".xlsx")
+    return {'name': name, 'density': averages,
+            'generations': gen_averages, 'total': tot_av,
+            'correlation': corr_t}
+
+def _run_point(job):
+    """Runs one parameter point of a sweep inside a worker process. The
+    simulation gets a Generator made from the point's own SeedSequence, so
+    every point has an independent stream no matter which worker runs it."""
+    method, generations, links, point, trials, k, J, seed_seq = job
+    alpha, beta, gamma, mu, r1, r2 = point
+    return simulate(method, generations, links, alpha, beta, gamma, mu,
+                    r1, r2, trials, k, J, np.random.default_rng(seed_seq))
+
+def sweep(method, generations, links, points, trials, k = 1, J = 1,
+          workers = None, seed = None):
+    """
+    Runs simulate for every parameter point, fanned out over a process pool.
+
+    Parameters
+    ----------
+    points: list of tuples
+       Each point is (alpha, beta, gamma, mu, r1, r2).
+    workers: int, optional
+       Number of worker processes, defaults to the number of cores.
+    seed: int, optional
+       Seed of the SeedSequence that is spawned into one independent stream
+       per point, which makes the sweep reproducible.
+
+    Returns
+    -------
+    A dictionary with the points as keys and the results of simulate as
+    values, collected in the parent process.
+    """
+    points = [tuple(point) for point in points]
+    streams = cy.spawnSeeds(len(points), seed)
+    jobs = [(method, generations, links, point, trials, k, J, stream)
+            for point, stream in zip(points, streams)]
+    with ProcessPoolExecutor(max_workers = workers) as pool:
+        results = list(pool.map(_run_point, jobs))
+    return dict(zip(points, results))
 
 def main():
     print("To change the default timesteps, initial state, temperatures, or"+\
@@ -337,53 +315,70 @@ def main():
         else: k_c = J_c = 1
         alpha = beta = gamma = mu = r1 = r2 = 0
     else: raise ValueError("Method not recognized")
+    excel = input("Also write the Excel workbook? [Y/N] ").upper() == 'Y'
     start_time = time.time()
-    simulate(method, generations, links, alpha, beta, gamma, mu, r1,r2,trials,k_c,J_c)
+    simulate(method, generations, links, alpha, beta, gamma, mu, r1,r2,trials,k_c,J_c,
+             excel = excel)
     print("--- %s seconds ---" % (time.time() - start_time))
 
-def alpha_range(generations, links, beta, gamma, trials):
+def alpha_range(generations, links, beta, gamma, trials, workers = None,
+                seed = None):
     """To run tests with a range of alpha values"""
     start_time = time.time()
     from change_me import alpha_list
-    for a in alpha_list:
-        simulate('NN', generations, links, a, beta, gamma, 0, 0, 0, trials, 1, 1)
+    points = [(a, beta, gamma, 0, 0, 0) for a in alpha_list]
+    results = sweep('NN', generations, links, points, trials,
+                    workers = workers, seed = seed)
     print("--- runtime is %s seconds ---" % (time.time() - start_time))
+    return results
 
-def beta_range(generations, links, alpha, gamma, trials):
+def beta_range(generations, links, alpha, gamma, trials, workers = None,
+               seed = None):
     """To run tests with a range of beta values"""
     start_time = time.time()
     from change_me import beta_list
-    for b in beta_list:
-        simulate('NN', generations, links, alpha, b, gamma, 0, 0, 0, trials, 1, 1)
+    points = [(alpha, b, gamma, 0, 0, 0) for b in beta_list]
+    results = sweep('NN', generations, links, points, trials,
+                    workers = workers, seed = seed)
     print("--- runtime is %s seconds ---" % (time.time() - start_time))
+    return results
 
-def mu_range(generations, links, gamma, trials):
+def mu_range(generations, links, gamma, trials, workers = None, seed = None):
     """To run tests with a range of mu values"""
     start_time = time.time()
     from change_me import mu_list
-    for m in mu_list:
-        simulate('TL', generations, links, 0, 0, gamma, m, 0, 0, trials, 1, 1)
+    points = [(0, 0, gamma, m, 0, 0) for m in mu_list]
+    results = sweep('TL', generations, links, points, trials,
+                    workers = workers, seed = seed)
     print("--- runtime is %s seconds ---" % (time.time() - start_time))
+    return results
 
-def r1_range(generations, links, r2, gamma, trials):
+def r1_range(generations, links, r2, gamma, trials, workers = None,
+             seed = None):
     """To run tests with a range of r1 values"""
     start_time = time.time()
     from change_me import r1_list
-    for rt1 in r1_list:
-        simulate('EI', generations, links, 0, 0, gamma, 0, rt1, r2, trials, 1, 1)
+    points = [(0, 0, gamma, 0, rt1, r2) for rt1 in r1_list]
+    results = sweep('EI', generations, links, points, trials,
+                    workers = workers, seed = seed)
     print("--- runtime is %s seconds ---" % (time.time() - start_time))
+    return results
 
-def r2_range(generations, links, r1, gamma, trials):
+def r2_range(generations, links, r1, gamma, trials, workers = None,
+             seed = None):
     """To run tests with a range of r2 values"""
     start_time = time.time()
     from change_me import r2_list
-    for rt2 in r2_list:
-        simulate('EI', generations, links, 0, 0, gamma, 0, r1, rt2, trials, 1, 1)
+    points = [(0, 0, gamma, 0, r1, rt2) for rt2 in r2_list]
+    results = sweep('EI', generations, links, points, trials,
+                    workers = workers, seed = seed)
     print("--- runtime is %s seconds ---" % (time.time() - start_time))
+    return results
 
-def full(method, generations, links, trials):
+def full(method, generations, links, trials, workers = None, seed = None):
     """You'll have data coming out of your ears"""
     start_time = time.time()
+    points = list()
     if method == 'NN':
         from change_me import alpha_list
         from change_me import beta_list
@@ -392,7 +387,7 @@ def full(method, generations, links, trials):
         for a in alpha_list:
             for b in beta_list:
                 for g in gamma_list:
-                    simulate('NN', generations, links, a, b, g, mu, r1, r2, trials, 1, 1)
+                    points.append((a, b, g, mu, r1, r2))
     elif method == 'EI':
         from change_me import r1_list
         from change_me import r2_list
@@ -402,27 +397,31 @@ def full(method, generations, links, trials):
             for rt2 in r2_list:
                 for g in gamma_list:
                     if rt2 >= rt1:
-                        simulate('EI',generations, links, alpha, beta, g,
-                                 rt1, rt2, trials, 1, 1)
+                        points.append((alpha, beta, g, mu, rt1, rt2))
     elif method == 'TL':
         from change_me import mu_list
         from change_me import gamma_list
         alpha = beta = r1 = r2 = 0
         for m in mu_list:
             for g in gamma_list:
-                simulate('TL', generations, links, alpha, beta, g, m, r1, r2, trials, 1, 1)
+                points.append((alpha, beta, g, m, r1, r2))
+    results = sweep(method, generations, links, points, trials,
+                    workers = workers, seed = seed)
     print("--- runtime is %s seconds ---" % (time.time() - start_time))
+    return results
 
-def no_evaporation(method, generations, links, trials):
+def no_evaporation(method, generations, links, trials, workers = None,
+                   seed = None):
     """You'll have slightly unrealistic data coming out of your ears"""
     start_time = time.time()
+    points = list()
     if method == 'NN':
         from change_me import alpha_list
         from change_me import beta_list
         mu = r1 = r2 = 0
         for a in alpha_list:
             for b in beta_list:
-                simulate('NN', generations, links, a, b, 0, mu, r1, r2, trials, 1, 1)
+                points.append((a, b, 0, mu, r1, r2))
     elif method == 'EI':
         from change_me import r1_list
         from change_me import r2_list
@@ -430,13 +429,16 @@ def no_evaporation(method, generations, links, trials):
         for rt1 in r1_list:
             for rt2 in r2_list:
                 if rt2 >= rt1:
-                    simulate('EI',generations, links, alpha, beta, 0, mu, rt1, rt2, trials, 1, 1)
+                    points.append((alpha, beta, 0, mu, rt1, rt2))
     elif method == 'TL':
         from change_me import mu_list
         alpha = beta = r1 = r2 = 0
         for m in mu_list:
-            simulate('TL', generations, links, alpha, beta, 0, m, r1, r2, trials)
+            points.append((alpha, beta, 0, m, r1, r2))
+    results = sweep(method, generations, links, points, trials,
+                    workers = workers, seed = seed)
     print("--- runtime is %s seconds ---" % (time.time() - start_time))
+    return results
 
 if __name__ == "__main__":
     main()
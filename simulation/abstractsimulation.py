@@ -11,11 +11,45 @@ import numpy as np
 
 class AbstractSimulation(object):
 
-    def __init__(self,network,trials,timesteps):
-        self.data = np.zeros((trials,timesteps,len(network)))
+    def __init__(self,network,trials,timesteps,rng = None,dtype = np.float64,
+                 path = None):
+        """
+        Sets up the (trials, timesteps, nodes) data array. The columns follow
+        the order of the node list of the network.
+
+        The rng can be a numpy Generator or a seed, every random number of
+        the simulation is drawn from it so seeded runs are reproducible.
+
+        With a path the data array is a memory mapped .npy file on disk, for
+        runs larger than memory. The file can be opened again later with
+        numpy.load(path, mmap_mode = 'r').
+        """
+        shape = (trials,timesteps,len(network))
+        if path is None:
+            self.data = np.zeros(shape,dtype = dtype)
+        else:
+            self.data = np.lib.format.open_memmap(path,mode = 'w+',
+                                                  dtype = dtype,shape = shape)
         self.network = network
         self.timesteps = timesteps
         self.trials = trials
+        self.rng = np.random.default_rng(rng)
+
+    def trialBlocks(self):
+        """
+        Generates slices of the trials. The simulations advance one slice
+        through every timestep before starting the next, so a (trials, nodes)
+        array of floats for a slice takes about 32 MB however many trials
+        there are.
+        """
+        size = max(1,(1 << 22)//max(len(self.network),1))
+        for start in range(0,self.trials,size):
+            yield slice(start,min(start + size,self.trials))
+
+    def flush(self):
+        """Writes the data to disk when it is memory mapped."""
+        if isinstance(self.data,np.memmap):
+            self.data.flush()
 
     def sumOfNeighbors(self,trial,timestep,node):
         """
@@ -26,9 +60,54 @@ class AbstractSimulation(object):
             sum_of_states += self.data[trial,timestep,node]
         return sum_of_states
 
+    def neighborSums(self,timestep,trials = slice(None)):
+        """
+        Returns a (trials, nodes) array with the sum of the states of the
+        nearest neighbors of every node in every trial at once, or in the
+        slice of trials.
+        """
+        return self.network.neighborSums(self.data[trials,timestep])
+
+    def degrees(self):
+        """Returns the degree of every node as an array in node order."""
+        return self.network.degrees()
+
+    def densities(self,timestep,trials = slice(None)):
+        """
+        Returns the density at a timestep for every trial, or every trial in
+        the slice, as a column that broadcasts against a (trials, nodes)
+        array.
+        """
+        return self.data[trials,timestep].mean(axis = 1,keepdims = True)
+
+    def flip(self,timestep,probability,flipped,trials = slice(None)):
+        """
+        Advances every trial, or the slice of trials, to the timestep at
+        once. Draws one uniform number per node per trial and takes the
+        flipped state where it is at most the probability, otherwise the
+        state of the previous timestep.
+        """
+        previous = self.data[trials,timestep-1]
+        uniform = self.rng.random(previous.shape)
+        self.data[trials,timestep] = np.where(uniform <= probability,flipped,
+                                              previous)
+
     def density(self,trial,timestep):
         """
         Returns the density at a timestep at a particular trial. Meaning the
         number of non-zero elements in the timestep.
         """
         return np.sum(self.data[trial,timestep])/len(self.network)
+
+    def densityCurve(self,trial = None):
+        """
+        Returns the density at every timestep, of one trial or averaged over
+        every trial. The data is summed one slice of trials at a time, so a
+        memory mapped array is read from disk without being loaded whole.
+        """
+        if trial is not None:
+            return self.data[trial].mean(axis = 1)
+        total = np.zeros(self.timesteps)
+        for trials in self.trialBlocks():
+            total += self.data[trials].sum(axis = (0,2))
+        return total/(self.trials*len(self.network))
@@ -8,26 +8,22 @@ __author__ = "\n".join(['Justin Pusztay (pusztayj20@mail.wlu.edu)'])
 
 __all__ = ['CSAE_NN']
 
-from Cayley.classes.particlesimulation import *
-import random
+from Cayley.simulation.particlesimulation import *
 import numpy as np
 
 class CSAE_NN(ParticleSimulation):
 
-    def __init__(self,network,trials,timesteps):
-        ParticleSimulation.__init__(self,network,trials,timesteps)
+    def __init__(self,network,trials,timesteps,rng = None,path = None):
+        ParticleSimulation.__init__(self,network,trials,timesteps,rng,path)
 
     def simulate(self, alpha,beta,gamma):
-        for trial in range(self.trials):
+        """
+        Runs every timestep, advancing a slice of the trials at once with
+        array operations over the (trials, nodes) states.
+        """
+        for trials in self.trialBlocks():
             for timestep in range(1,self.timesteps):
-                for node in self.network:
-                    state = self.data[trial,timestep-1,node]
-                    neighbor_sum = self.sumOfNeighbors(trial,timestep-1,node)
-                    probability = gamma*state + (1-state)*alpha*(beta**neighbor_sum)
-                    random_num = random.uniform(0,1)
-                    if state == 0 and random_num <= probability:
-                        self.data[trial,timestep,node] = 1
-                    elif state == 1 and random_num <= probability:
-                        self.data[trial,timestep,node] = 0
-                    else:
-                        self.data[trial,timestep,node] = state
+                state = self.data[trials,timestep-1]
+                neighbor_sum = self.neighborSums(timestep-1,trials)
+                probability = gamma*state + (1-state)*alpha*(beta**neighbor_sum)
+                self.checkProbabilities(timestep,probability,trials)
@@ -8,25 +8,48 @@ __author__ = "\n".join(['Justin Pusztay (pusztayj20@mail.wlu.edu)'])
 
 __all__ = ['CSAE_POL']
 
-from Cayley.classes.particlesimulation import *
-import random
+from Cayley.simulation.particlesimulation import *
 import numpy as np
 
 class CSAE_POL(ParticleSimulation):
+    """
+    The voting rule of MonteCarlo.simulateVote run for many trials at once.
+    An empty senator fills with probability alpha*beta**(s/d) and a filled
+    one empties with probability gamma*phi**((d - s)/d), for s filled
+    neighbors out of d.
 
-    def __init__(self,network,trials,timesteps):
-        ParticleSimulation.__init__(self,network,trials,timesteps)
+    Notes
+    -----
+    -> The exponent is the fraction s/d. Earlier versions computed
+       beta**s/d, the power divided by the degree, which gave different
+       results, so runs from before the change will not be reproduced.
+    -> A senator without neighbors takes both fractions as 0, like in
+       MonteCarlo.
+    """
+
+    def __init__(self,network,trials,timesteps,rng = None,path = None):
+        ParticleSimulation.__init__(self,network,trials,timesteps,rng,path)
 
     def simulate(self, alpha,beta,gamma,beta_senator, phi_senator):
-        for trial in range(self.trials):
+        """
+        Runs every timestep, advancing a slice of the trials at once. The
+        beta and phi of every senator are dictionaries keyed by node.
+        """
+        nodes = self.network.getNodes()
+        phi = np.array([phi_senator[node] for node in nodes],dtype = float)
+        beta = np.array([beta_senator[node] for node in nodes],dtype = float)
+        degree = self.degrees()
+        for trials in self.trialBlocks():
             for timestep in range(1,self.timesteps):
-                for node in self.network:
-                    state = self.data[trial,timestep-1,node]
-                    opposite_state = self.sumOfEmptyNeighbors(node,timestep-1,trial)
-                    neighbor_sum = self.sumOfNeighbors(node,timestep-1,trial)
-                    phi = phi_senator[node]
-                    beta = beta_senator[node]
-                    probability = gamma*state*(phi**(opposite_state/ \
-                                  self.network.degree(node))) + (1-state)*\
-                                  alpha*(beta**neighbor_sum/self.network.degree(node)) 
-                    self.checkProbability(trial,timestep,node,probability,state)    
+                state = self.data[trials,timestep-1]
+                opposite_state = self.emptyNeighborSums(timestep-1,trials)
+                neighbor_sum = self.neighborSums(timestep-1,trials)
+                empty = np.divide(opposite_state,degree,
+                                  out = np.zeros(opposite_state.shape),
+                                  where = degree > 0)
+                filled = np.divide(neighbor_sum,degree,
+                                   out = np.zeros(neighbor_sum.shape),
+                                   where = degree > 0)
+                probability = gamma*state*(phi**empty) + \
+                              (1-state)*alpha*(beta**filled)
+                self.checkProbabilities(timestep,probability,trials)
@@ -8,27 +8,26 @@ __author__ = "\n".join(['Justin Pusztay (pusztayj20@mail.wlu.edu)'])
 
 __all__ = ['CSAE_TEMP']
 
-from Cayley.classes.spinsimulation import *
-import random
+from Cayley.simulation.spinsimulation import *
 import numpy as np
 
 class CSAE_TEMP(SpinSimulation):
 
-    def __init__(self,network,trials,timesteps):
-        SpinSimulation.__init__(self,network,trials,timesteps)
+    def __init__(self,network,trials,timesteps,rng = None,path = None):
+        SpinSimulation.__init__(self,network,trials,timesteps,rng,path)
 
     def simulate(self,j,k,temperatures):
-        for trial in range(self.trials):
+        """
+        Runs every timestep, advancing a slice of the trials at once. The
+        temperatures are a dictionary keyed by node, and beta is 1/(k T) as
+        in MonteCarlo.simulateTemp.
+        """
+        temps = np.array([temperatures[node] for node in self.network.getNodes()],
+                         dtype = float)
+        beta = 1/(k*temps)
+        for trials in self.trialBlocks():
             for timestep in range(1,self.timesteps):
-                for node in self.network:
-                    state = self.data[trial,timestep-1,node]
-                    beta = (1/temperatures[node])
-                    neighbor_sum = self.sumOfNeighbors(node,timestep-1,trial)
-                    probability = 0.5*(1-state*np.tanh(beta*J*neighbor_sum))
-                    random_num = random.uniform(0,1)
-                    if state == 1 and random_num <= probability:
-                        self.data[trial,timestep,node] = -1
-                    elif state == -1 and random_num <= probability:
-                        self.data[trial,timestep,node] = 1
-                    else:
-                        self.data[trial,timestep,node] = state
+                state = self.data[trials,timestep-1]
+                neighbor_sum = self.neighborSums(timestep-1,trials)
+                probability = 0.5*(1-state*np.tanh(beta*j*neighbor_sum))
+                self.checkProbabilities(timestep,probability,trials)
@@ -8,25 +8,71 @@ __author__ = "\n".join(['Justin Pusztay (pusztayj20@mail.wlu.edu)'])
 
 __all__ = ['CSAE_TL']
 
-from Cayley.classes.particlesimulation import *
-import random
+from Cayley.simulation.particlesimulation import *
 import numpy as np
 
 class CSAE_TL(ParticleSimulation):
 
-    def __init__(self,network,trials,timesteps):
-        ParticleSimulation.__init__(self,network,trials,timesteps)
+    def __init__(self,network,trials,timesteps,rng = None,path = None):
+        ParticleSimulation.__init__(self,network,trials,timesteps,rng,path)
 
-    def simulate(self,gamma,mu):
+    def simulate(self,gamma,mu,aggregate = False):
+        """
+        Runs every timestep, advancing a slice of the trials at once. Each
+        trial uses its own density from the previous timestep.
+
+        With aggregate each trial draws the number of nodes that fill and
+        that empty from binomial distributions and changes only that many
+        nodes, picked at random, instead of drawing a number for every node.
+        """
+        if aggregate:
+            return self.__simulateBinomial(gamma,mu)
+        for trials in self.trialBlocks():
+            for timestep in range(1,self.timesteps):
+                density = self.densities(timestep - 1,trials)
+                state = self.data[trials,timestep-1]
+                probability = gamma*state + (1 - state)*(1-density)*mu
+                self.checkProbabilities(timestep,probability,trials)
+
+
+    def __simulateBinomial(self,gamma,mu):
+        """Runs every timestep with the numbers of changes of every trial
+        drawn from binomial distributions."""
+        nodes = len(self.network)
         for trial in range(self.trials):
             for timestep in range(1,self.timesteps):
-                density = self.density(trial,timestep - 1)
-                for node in self.network:
-                    state = self.data[trial,timestep-1,node]
-                    neighbor_sum = self.sumOfNeighbors(node,timestep-1,trial)
-                    probability = gamma*state + (1 - state)*(1-density)*mu
-                    self.checkProbability(trial,timestep,node,probability,state)
+                state = self.data[trial,timestep-1]
+                filled = np.flatnonzero(state)
+                empty = np.flatnonzero(state == 0)
+                up = self.rng.binomial(len(empty),(1 - len(filled)/nodes)*mu)
+                down = self.rng.binomial(len(filled),gamma)
+                self.data[trial,timestep] = state
+                self.data[trial,timestep,self.rng.choice(empty,up,
+                                                         replace = False)] = 1
+                self.data[trial,timestep,self.rng.choice(filled,down,
+                                                         replace = False)] = 0
+
+    def simulateDensity(self,gamma,mu):
+        """
+        Runs every timestep of every trial keeping only the number of filled
+        nodes, drawn from binomial distributions, so a timestep has a runtime
+        of $O(trials)$ whatever the size of the network. The data array is
+        not filled past the initial states.
 
+        Returns
+        -------
+        A (trials, timesteps) array of densities.
+        """
+        nodes = len(self.network)
+        filled = np.count_nonzero(self.data[:,0],axis = 1)
+        densities = np.zeros((self.trials,self.timesteps))
+        densities[:,0] = filled/nodes
+        for timestep in range(1,self.timesteps):
+            density = filled/nodes
+            filled = filled + self.rng.binomial(nodes - filled,(1 - density)*mu) \
+                     - self.rng.binomial(filled,gamma)
+            densities[:,timestep] = filled/nodes
+        return densities
 
 def main():
     import Cayley as cy
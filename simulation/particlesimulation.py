@@ -9,13 +9,17 @@ __author__ = "\n".join(['Justin Pusztay (pusztayj20@mail.wlu.edu)'])
 __all__ = ['ParticleSimulation']
 
 import numpy as np
-import random
-from Cayley.classes.abstractsimulation import *
+from Cayley.simulation.abstractsimulation import *
 
 class ParticleSimulation(AbstractSimulation):
 
-    def __init__(self,network,trials,timesteps):
-        AbstractSimulation.__init__(self,network,trials,timesteps)
+    def __init__(self,network,trials,timesteps,rng = None,path = None):
+        """
+        Sets up the data array with int8 entries, see AbstractSimulation.
+        A path stores it as a memory mapped .npy file.
+        """
+        AbstractSimulation.__init__(self,network,trials,timesteps,rng,
+                                    np.int8,path)
 
     def startEmpty(self):
         """
@@ -27,7 +31,7 @@ class ParticleSimulation(AbstractSimulation):
         """
         Sets the initial states of the particles to 0 or 1.
         """
-        self.data[0:self.trials,0] = np.random.randint(2, size = len(self.network))
+        self.data[0:self.trials,0] = self.rng.integers(2, size = len(self.network))
 
     def startCentralFull(self):
         """
@@ -52,7 +56,7 @@ class ParticleSimulation(AbstractSimulation):
         Using the default trial at 0, it counts the number of zero elements
         in the vector representing the timestep.
         """
-        return self.data[timestep,trial].size - self.count_full(timestep,trial)
+        return len(self.network) - self.countFull(trial,timestep)
 
     def sumOfEmptyNeighbors(self,trial,timestep,node):
         """
@@ -63,8 +67,24 @@ class ParticleSimulation(AbstractSimulation):
             zero_sum += (1 - self.data[trial,timestep,item])
         return zero_sum
 
+    def emptyNeighborSums(self,timestep,trials = slice(None)):
+        """
+        Returns a (trials, nodes) array with the number of neighbors of every
+        node that have state 0.
+        """
+        return self.degrees() - self.neighborSums(timestep,trials)
+
+    def checkProbabilities(self,timestep,probability,trials = slice(None)):
+        """
+        Changes the state of every node in every trial, or the slice of
+        trials, whose random number is at most its probability, from 0 to 1
+        or from 1 to 0.
+        """
+        self.flip(timestep,probability,1 - self.data[trials,timestep-1],
+                  trials)
+
     def checkProbability(self,trial,timestep,node,probability,state):
-        random_num = random.uniform(0,1)
+        random_num = self.rng.random()
         if state == 0 and random_num <= probability:
             self.data[trial,timestep,node] = 1
         elif state == 1 and random_num <= probability:
@@ -5,7 +5,7 @@ simulations.
 """
 
 import numpy as np
-from Cayley.classes.abstractsimulation import *
+from Cayley.simulation.abstractsimulation import *
 
 __author__ = "\n".join(['Justin Pusztay (pusztayj20@mail.wlu.edu)'])
 
@@ -15,8 +15,13 @@ __all__ = ['SpinSimulation']
 
 class SpinSimulation(AbstractSimulation):
 
-    def __init__(self, network,trials,timesteps):
-        AbstractSimulation.__init__(self,network)
+    def __init__(self,network,trials,timesteps,rng = None,path = None):
+        """
+        Sets up the data array with int8 entries, see AbstractSimulation.
+        A path stores it as a memory mapped .npy file.
+        """
+        AbstractSimulation.__init__(self,network,trials,timesteps,rng,
+                                    np.int8,path)
         
     def startUp(self):
         """Sets the inital state of all nodes to 1 or spin up."""
@@ -30,7 +35,14 @@ class SpinSimulation(AbstractSimulation):
         """
         Sets the initial states of the particles to -1 or 1.
         """
-        self.data[0:self.trials,0] = np.random.choice([-1,1], size = len(self.network))
+        self.data[0:self.trials,0] = self.rng.choice([-1,1], size = len(self.network))
+
+    def checkProbabilities(self,timestep,probability,trials = slice(None)):
+        """
+        Flips the spin of every node in every trial, or the slice of trials,
+        whose random number is at most its probability.
+        """
+        self.flip(timestep,probability,-self.data[trials,timestep-1],trials)
 
     def countUp(self,timestep,trial):
         return np.count_nonzero(self.data[trial,timestep] == 1)
@@ -0,0 +1,48 @@
+"""
+Makes the repository importable as the Cayley package, the name its modules
+use for absolute imports, when the tests are run from a checkout, and holds
+the fixtures the tests share.
+"""
+
+import os
+import sys
+import types
+
+import numpy as np
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+if 'Cayley' not in sys.modules:
+    package = types.ModuleType('Cayley')
+    package.__path__ = [ROOT]
+    sys.modules['Cayley'] = package
+
+import Cayley.networks as cy
+
+@pytest.fixture
+def trialMeans():
+    """
+    Returns a function that runs seeded trials from the empty state and
+    averages what they recorded, to compare with the exact results of
+    MasterEquation.
+
+    The function takes the network, a function advancing a MonteCarlo, the
+    number of trials, the seed and the MonteCarlo parameters. It returns
+    the mean state of every node at every timestep and, for every pair of
+    positions in pairs, the mean product of their states at every timestep.
+    """
+    def trialMeans(network,advance,trials,seed,pairs = (),**params):
+        means = 0
+        products = 0
+        for rng in cy.spawnGenerators(trials,seed = seed):
+            monte = cy.MonteCarlo(network,rng = rng,**params)
+            monte.startEmpty()
+            advance(monte)
+            history = monte.history().astype(float)
+            means = means + history
+            products = products + np.array([history[:,i]*history[:,j]
+                                             for i,j in pairs]).reshape(
+                                                 len(pairs),len(history)).T
+        return means/trials, products/trials
+    return trialMeans
@@ -0,0 +1,34 @@
+"""
+Checks the binomial TL sampling, with node states and with the density
+only, against each other and against the exact first timestep.
+"""
+
+import numpy as np
+
+import Cayley.networks as cy
+
+TRIALS = 400
+STEPS = 4
+PARAMS = {'gamma': .1,'mu': .5}
+
+def test_aggregate_states_match_density_only(trialMeans):
+    tree = cy.CayleyTree(3,4)
+    states,_ = trialMeans(tree,lambda monte: monte.run(STEPS,'TL',
+                                                       aggregate = True),
+                          TRIALS,23,**PARAMS)
+    densities = np.zeros(STEPS+1)
+    for rng in cy.spawnGenerators(TRIALS,seed = 23):
+        monte = cy.MonteCarlo(tree,rng = rng,**PARAMS)
+        monte.startEmpty()
+        densities += monte.simulateTLDensity(STEPS)
+    densities /= TRIALS
+    assert np.allclose(states.mean(axis = 1),densities,atol = 0.02)
+    assert abs(densities[1] - PARAMS['mu']) < 0.02 #empty nodes fill at mu
+
+def test_density_only_keeps_the_history():
+    monte = cy.MonteCarlo(cy.CayleyTree(3,3),rng = 23,**PARAMS)
+    monte.startEmpty()
+    densities = monte.simulateTLDensity(10)
+    assert len(densities) == 11 and densities[0] == 0
+    assert ((densities >= 0) & (densities <= 1)).all()
+    assert monte.getTimesteps() == 1
@@ -0,0 +1,23 @@
+"""
+Checks that the numpy backend gives the same mean density at every timestep
+as the python backend, over seeded trials.
+"""
+
+import numpy as np
+import pytest
+
+import Cayley.networks as cy
+
+TRIALS = 400
+STEPS = 4
+
+@pytest.mark.parametrize('rule,params',[('NN',{'gamma': .2}),
+                                        ('TL',{'gamma': .1,'mu': .5}),
+                                        ('EI',{'gamma': .1})])
+def test_numpy_matches_python(trialMeans,rule,params):
+    tree = cy.CayleyTree(3,4)
+    fast,_ = trialMeans(tree,lambda monte: monte.run(STEPS,rule),TRIALS,2,
+                        backend = 'numpy',**params)
+    slow,_ = trialMeans(tree,lambda monte: monte.run(STEPS,rule),TRIALS,2,
+                        backend = 'python',**params)
+    assert np.allclose(fast.mean(axis = 1),slow.mean(axis = 1),atol = 0.02)
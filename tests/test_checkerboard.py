@@ -0,0 +1,57 @@
+"""
+Checks the checkerboard update of simulateTemp against a two colour sweep
+written out with whole-lattice neighbor sums, on open and periodic
+lattices, with and without z-slabs.
+"""
+
+import copy
+
+import numpy as np
+import pytest
+
+import Cayley.networks as cy
+
+def sweep(lattice,grid,beta,J,uniform):
+    """Updates the sites with an even x + y + z, then the odd ones, from the
+    states the even ones just took."""
+    parity = np.indices(lattice.shape).sum(axis = 0) % 2
+    for colour in (0,1):
+        probability = 0.5*(1 - grid*np.tanh(beta*J*lattice.neighborSums(grid)))
+        flip = (parity == colour) & (uniform <= probability)
+        grid = np.where(flip,-grid,grid)
+    return grid
+
+@pytest.mark.parametrize('threads',[1,3])
+@pytest.mark.parametrize('periodic',[False,True])
+def test_checkerboard_matches_sweep(periodic,threads):
+    lattice = cy.ImplicitLattice(4,2,6,periodic = periodic)
+    rng = np.random.default_rng(10)
+    temperature = rng.uniform(.5,3,size = lattice.shape)
+    lattice.setFeature('temperature',temperature)
+    monte = cy.MonteCarlo(lattice,rng = rng)
+    monte.randomSpins()
+    for _ in range(3):
+        grid = monte.history()[-1].reshape(lattice.shape).astype(np.int64)
+        uniform = copy.deepcopy(monte.rng).random(lattice.shape)
+        monte.simulateTemp(k = 1.5,J = 1,checkerboard = True,threads = threads)
+        expected = sweep(lattice,grid,1/(1.5*temperature),1,uniform)
+        assert np.array_equal(monte.history()[-1],expected.reshape(-1))
+
+def test_lattice_matches_implicit_lattice():
+    states = list()
+    for lattice in (cy.Lattice(4,3,2),cy.ImplicitLattice(4,3,2)):
+        lattice.addMultipleNodes(lattice,temperature = 2.0)
+        monte = cy.MonteCarlo(lattice,rng = 10)
+        monte.startUp()
+        for _ in range(3):
+            monte.simulateTemp(checkerboard = True)
+        states.append(monte.history())
+    assert np.array_equal(*states)
+
+def test_odd_periodic_side_is_rejected():
+    lattice = cy.ImplicitLattice(3,4,periodic = True)
+    lattice.setFeature('temperature',1.0)
+    monte = cy.MonteCarlo(lattice)
+    monte.startUp()
+    with pytest.raises(ValueError):
+        monte.simulateTemp(checkerboard = True)
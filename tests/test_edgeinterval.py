@@ -0,0 +1,47 @@
+"""
+Checks that a node picked by several links keeps the result of the first of
+them in the random order, in the python and numpy backends.
+"""
+
+import numpy as np
+import pytest
+
+import Cayley.networks as cy
+
+class FixedOrder(np.random.Generator):
+    """Generator that visits the links in a fixed order and picks fixed ends
+    of them, drawing the uniform numbers from a seeded stream."""
+
+    def __init__(self,order,ends):
+        super().__init__(np.random.PCG64(16))
+        self.order = order
+        self.ends = ends
+        self.calls = 0
+
+    def permutation(self,x): #numpy backend, the rank of every link
+        return np.argsort(self.order)
+
+    def shuffle(self,x): #python backend, the links in the order visited
+        x[:] = self.order
+
+    def integers(self,low,high = None,size = None):
+        if size is not None:
+            return np.array(self.ends)
+        end = self.ends[self.order[self.calls]]
+        self.calls += 1
+        return end
+
+#Node 1 is picked by link 0 to the filled node 0, which fills it, and by
+#link 2 to the empty node 3, which leaves it empty.
+ENDS = [1,1,0,1,1,1]
+
+@pytest.mark.parametrize('backend',['python','numpy'])
+@pytest.mark.parametrize('order,state',[([2,0,1,3,4,5],0),
+                                        ([0,2,1,3,4,5],1)])
+def test_first_link_wins(backend,order,state):
+    tree = cy.CayleyTree(3,2)
+    monte = cy.MonteCarlo(tree,gamma = 0,r1 = 1,r2 = 0,backend = backend,
+                          rng = FixedOrder(order,ENDS))
+    monte.zeroDictionary()
+    monte.simulateEI()
+    assert monte.history()[-1,1] == state
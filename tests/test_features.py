@@ -0,0 +1,34 @@
+"""
+Checks that feature columns keep their dtype for values that fit it and
+widen for values that do not.
+"""
+
+import numpy as np
+
+import Cayley.networks as cy
+
+def int8Graph():
+    """Returns a Graph of three nodes with an int8 'state' feature."""
+    graph = cy.Graph()
+    for node in range(3):
+        graph.add(node,state = np.int8(0))
+    return graph
+
+def test_python_int_that_fits_keeps_the_dtype():
+    graph = int8Graph()
+    states = graph.getFeature('state').array()
+    graph.add(1,state = 1)
+    graph.add(2,state = True)
+    assert states.dtype == np.int8
+    assert states.tolist() == [0,1,1] #the earlier array still follows
+    assert graph.getFeature('state')[1] == 1
+
+def test_values_that_do_not_fit_widen():
+    graph = int8Graph()
+    graph.add(0,state = 300)
+    assert graph.getFeature('state').array().tolist() == [300,0,0]
+    graph.add(1,state = 2.5)
+    assert graph.getFeature('state').array().dtype.kind == 'f'
+    assert graph.getFeature('state')[1] == 2.5
+    graph.add(2,state = 'up')
+    assert graph.getFeature('state').copy() == {0: 300,1: 2.5,2: 'up'}
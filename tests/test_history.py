@@ -0,0 +1,48 @@
+"""
+Checks the History array and its dictionary views through many appends.
+"""
+
+import numpy as np
+import pytest
+
+import Cayley.networks as cy
+from Cayley.networks.history import History
+
+def test_views_match_array_after_growing():
+    graph = cy.Graph()
+    for node in 'abcd':
+        graph.add(node)
+    history = History(graph,capacity = 2)
+    rng = np.random.default_rng(3)
+    rows = rng.integers(0,2,size = (9,4))
+    for row in rows[:5]:
+        history.append(row)
+    for row in rows[5:]: #the dictionary form the python backends record
+        history.appendDict(dict(zip('abcd',row.tolist())))
+    assert history.array().dtype == np.int8
+    assert np.array_equal(history.array(),rows)
+    assert np.array_equal(history.totals(),rows.sum(axis = 1))
+    assert history.total(-1) == rows[-1].sum()
+    assert history.view(4).copy() == dict(zip('abcd',rows[4].tolist()))
+    with pytest.raises(IndexError):
+        history.row(9)
+
+def test_keep_last():
+    history = History(cy.Lattice(2,2))
+    for t in range(3):
+        history.append(np.full(4,t))
+    history.keepLast()
+    assert len(history) == 1
+    assert history.total(0) == 8
+    assert np.array_equal(history.row(0),np.full(4,2))
+
+def test_montecarlo_views_follow_history():
+    monte = cy.MonteCarlo(cy.CayleyTree(3,2),rng = 3)
+    monte.startRandom()
+    monte.run(3,'NN')
+    history = monte.history()
+    for t,state_d in enumerate(monte.allData()):
+        assert [state_d[node] for node in range(history.shape[1])] == \
+               history[t].tolist()
+        assert monte.getOnes(t) == history[t].sum()
+        assert monte.density(t) == pytest.approx(history[t].mean())
@@ -0,0 +1,57 @@
+"""
+Checks the slice based neighbor sums of ImplicitLattice against Lattice and,
+for periodic boundaries, against a Graph linked from the coordinates.
+"""
+
+import numpy as np
+import pytest
+
+import Cayley.networks as cy
+
+SHAPES = [(4,3,1),(3,4,3),(5,1,1),(2,3,2)]
+
+def periodicGraph(x,y,z):
+    """Returns a Graph with the sites of a periodic lattice, linked to the
+    sites one step away along every axis, with wrap around."""
+    graph = cy.Graph()
+    for site in range(x*y*z):
+        graph.add(site)
+    for site in range(x*y*z):
+        i, j, k = site % x, (site // x) % y, site // (x*y)
+        for moved in (((i+1) % x,j,k),(i,(j+1) % y,k),(i,j,(k+1) % z)):
+            other = moved[0] + x*moved[1] + x*y*moved[2]
+            if other != site:
+                graph.addEdge(site,other)
+    return graph
+
+@pytest.mark.parametrize('shape',SHAPES)
+def test_matches_lattice(shape):
+    lattice = cy.Lattice(*shape)
+    implicit = cy.ImplicitLattice(*shape)
+    states = np.random.default_rng(0).integers(0,2,size = (3,len(lattice)))
+    assert np.array_equal(implicit.neighborSums(states),
+                          lattice.neighborSums(states))
+    assert np.array_equal(implicit.degrees(),lattice.degrees())
+    links = implicit.edgeArray() #same links, in axis order
+    assert np.array_equal(links[np.lexsort(links.T[::-1])],
+                          lattice.edgeArray())
+
+@pytest.mark.parametrize('shape',SHAPES)
+def test_periodic_matches_graph(shape):
+    graph = periodicGraph(*shape)
+    implicit = cy.ImplicitLattice(*shape,periodic = True)
+    states = np.random.default_rng(1).integers(0,2,size = len(graph))
+    assert np.array_equal(implicit.neighborSums(states),
+                          graph.neighborSums(states))
+    assert np.array_equal(implicit.degrees(),graph.degrees())
+    for site in graph.getNodes():
+        assert implicit.getNeighbors(site) == set(graph.getNeighbors(site))
+
+@pytest.mark.parametrize('periodic',[False,True])
+def test_slabs_match_whole_lattice(periodic):
+    implicit = cy.ImplicitLattice(3,4,5,periodic = periodic)
+    grid = np.random.default_rng(2).integers(0,2,size = implicit.shape)
+    whole = implicit.neighborSums(grid)
+    for z0,z1 in ((0,2),(2,3),(3,5)):
+        assert np.array_equal(implicit.slabNeighborSums(grid,z0,z1),
+                              whole[z0:z1])
@@ -0,0 +1,36 @@
+"""
+Checks the continuous time engine against the exact master equation on a
+tree small enough to solve, and the SumTree against brute force.
+"""
+
+import numpy as np
+import pytest
+
+import Cayley.networks as cy
+from Cayley.networks.kinetic import SumTree
+
+TRIALS = 1000
+STEPS = 3
+
+def test_sumtree_matches_running_sum():
+    rng = np.random.default_rng(0)
+    weights = rng.random(13)
+    tree = SumTree(weights)
+    for i,weight in zip(rng.integers(0,13,size = 20),rng.random(20)):
+        weights[i] = weight
+        tree.update(int(i),float(weight))
+    assert tree.total() == pytest.approx(weights.sum())
+    for value in rng.random(50)*weights.sum():
+        assert tree.find(value) == np.searchsorted(np.cumsum(weights),value,
+                                                   side = 'right')
+
+@pytest.mark.parametrize('rule,params',[('NN',{'gamma': .2}),
+                                        ('TL',{'gamma': .1,'mu': .5}),
+                                        ('EI',{'gamma': .1})])
+def test_kinetic_matches_master_equation(trialMeans,rule,params):
+    tree = cy.CayleyTree(2,3)
+    exact,_ = cy.MasterEquation(tree,rule,kinetic = True,
+                                **params).solve(np.zeros(len(tree)),STEPS)
+    means,_ = trialMeans(tree,lambda monte: monte.simulateKinetic(rule,STEPS),
+                         TRIALS,21,**params)
+    assert np.allclose(means.mean(axis = 1),exact.mean(axis = 1),atol = 0.02)
@@ -0,0 +1,35 @@
+"""
+Checks the rates of the master equation on networks small enough to write
+out by hand.
+"""
+
+import numpy as np
+import pytest
+
+import Cayley.networks as cy
+
+def directedPair():
+    """Returns two nodes with a single link from node 0 to node 1."""
+    graph = cy.Graph()
+    graph.add(0)
+    graph.add(1)
+    graph.directedLink(0,1)
+    return graph
+
+def test_directed_link_is_read_by_the_node_it_leaves():
+    equation = cy.MasterEquation(directedPair(),'NN',alpha = .5,beta = .8,
+                                 gamma = .1)
+    p = equation.pick(equation.distribution([1,0]),rate = 1)
+    assert p[3] == pytest.approx(.5) #node 1 reads no one
+    assert p[0] == pytest.approx(.1)
+    p = equation.pick(equation.distribution([0,1]),rate = 1)
+    assert p[3] == pytest.approx(.5*.8) #node 0 reads node 1
+
+def test_vote_degree_follows_directed_links():
+    graph = directedPair()
+    graph.add(0,beta = 2.0,phi = 1.5)
+    graph.add(1,beta = 2.0,phi = 1.5)
+    equation = cy.MasterEquation(graph,'VOTE',alpha = .3,gamma = .2)
+    p = equation.pick(equation.distribution([0,1]),rate = 1)
+    assert p[3] == pytest.approx(.3*2.0) #all of node 0's one neighbor
+    assert p[0] == pytest.approx(.2) #node 1 has no neighbors
@@ -0,0 +1,18 @@
+"""
+Checks the dense adjacency matrix and Laplacian, the defaults that work
+without scipy.
+"""
+
+import numpy as np
+
+import Cayley.networks as cy
+
+def test_dense_by_default():
+    network = cy.Lattice(3,2)
+    states = np.random.default_rng(0).integers(0,2,size = len(network))
+    adjacency = network.adjacencyMatrix()
+    assert isinstance(adjacency,np.ndarray)
+    assert np.array_equal(adjacency @ states,network.neighborSums(states))
+    laplacian = network.laplacian()
+    assert np.array_equal(laplacian.diagonal(),network.degrees())
+    assert not laplacian.sum(axis = 1).any()
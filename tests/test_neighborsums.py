@@ -0,0 +1,51 @@
+"""
+Checks the array neighbor sums against sums over the neighbor sets.
+"""
+
+import numpy as np
+import pytest
+
+import Cayley.networks as cy
+
+def setSums(network,states):
+    """Sums the states over the neighbor sets, one node at a time."""
+    index = network.nodeIndex()
+    return np.array([sum(states[index[x]] for x in network.getNeighbors(node))
+                     for node in network.getNodes()])
+
+@pytest.mark.parametrize('network',[cy.Lattice(4,3),cy.Lattice(3,4,3),
+                                    cy.CayleyTree(3,3)],
+                         ids = ['lattice2d','lattice3d','cayley'])
+def test_csr_matches_neighbor_sets(network):
+    rng = np.random.default_rng(0)
+    states = rng.integers(0,2,size = len(network))
+    assert np.array_equal(network.neighborSums(states),
+                          setSums(network,states))
+
+def test_csr_follows_new_links():
+    network = cy.Lattice(3,3)
+    states = np.arange(len(network))
+    network.neighborSums(states) #builds the cached arrays
+    network.addEdge(0,8)
+    assert network.addEdge(0,'missing') == "Node not in graph"
+    assert np.array_equal(network.neighborSums(states),
+                          setSums(network,states))
+
+def test_csr_keeps_leading_axes():
+    network = cy.Lattice(3,2)
+    states = np.random.default_rng(1).integers(0,2,size = (5,len(network)))
+    sums = network.neighborSums(states)
+    assert sums.shape == states.shape
+    for row,state in zip(sums,states):
+        assert np.array_equal(row,setSums(network,state))
+
+def test_links_can_be_added_while_iterating():
+    network = cy.Graph()
+    for node in range(4):
+        network.add(node)
+    states = np.arange(4)
+    network.neighborSums(states) #builds the cached arrays
+    for node in network:
+        network.addEdge(node,(node+1) % 4)
+    assert np.array_equal(network.neighborSums(states),
+                          setSums(network,states))
@@ -0,0 +1,54 @@
+"""
+Checks the running means and variances of the observers against the same
+quantities computed from stored histories, the way they were before.
+"""
+
+import numpy as np
+
+import Cayley.networks as cy
+
+TRIALS = 30
+STEPS = 5
+
+def runTrials(tree,observers):
+    """Runs seeded NN trials into the observers and returns the MonteCarlo
+    of every trial, with its history."""
+    trials = list()
+    for rng in cy.spawnGenerators(TRIALS,seed = 18):
+        monte = cy.MonteCarlo(tree,gamma = .2,rng = rng)
+        monte.startEmpty()
+        monte.run(STEPS,'NN',observers = observers)
+        trials.append(monte)
+    return trials
+
+def test_density_matches_history():
+    density = cy.Density()
+    trials = runTrials(cy.CayleyTree(3,3),[density])
+    densities = np.array([[monte.density(t) for t in range(STEPS+1)]
+                          for monte in trials])
+    assert np.allclose(density.mean(),densities.mean(axis = 0))
+    assert np.allclose(density.variance(ddof = 1),
+                       densities.var(axis = 0,ddof = 1))
+    assert np.array_equal(density.count(),[TRIALS]*(STEPS+1))
+
+def test_generational_density_matches_history():
+    tree = cy.CayleyTree(3,3)
+    generations = cy.GenerationalDensity()
+    trials = runTrials(tree,[generations])
+    sizes = [len(tree.nodesPerGen(gen)) for gen in range(tree.generations+1)]
+    densities = np.array([[[monte.generationalDensity(gen,monte.simData(t))/
+                            sizes[gen] for gen in range(len(sizes))]
+                           for t in range(STEPS+1)] for monte in trials])
+    assert np.allclose(generations.mean(),densities.mean(axis = 0))
+    assert np.allclose(generations.variance(),densities.var(axis = 0))
+
+def test_pair_correlation_matches_history():
+    pair = cy.PairCorrelation(0,1)
+    trials = runTrials(cy.CayleyTree(3,3),[pair])
+    n1 = np.array([[monte.simData(t)[0] for t in range(STEPS+1)]
+                   for monte in trials])
+    n2 = np.array([[monte.simData(t)[1] for t in range(STEPS+1)]
+                   for monte in trials])
+    correlation = (n1*n2).sum(axis = 0)/TRIALS - \
+                  (n1.sum(axis = 0)/TRIALS)*(n2.sum(axis = 0)/TRIALS)
+    assert np.allclose(pair.correlation(),correlation)
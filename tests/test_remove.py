@@ -0,0 +1,43 @@
+"""
+Checks that removing a node moves the last node into its place, with its
+features and links, and drops every link to the removed node.
+"""
+
+import numpy as np
+
+import Cayley.networks as cy
+
+def labelledGraph():
+    """Returns a Graph of five named nodes with a feature, some links and a
+    directed link into the node that is removed."""
+    graph = cy.Graph()
+    for weight,node in enumerate('abcde'):
+        graph.add(node,weight = weight)
+    graph.addEdge('a','b')
+    graph.addEdge('b','e')
+    graph.addEdge('d','e')
+    graph.directedLink('c','b')
+    return graph
+
+def test_last_node_takes_the_place():
+    graph = labelledGraph()
+    graph.remove('b')
+    assert graph.getNodes() == ['a','e','c','d']
+    assert graph.nodeIndex() == {'a': 0,'e': 1,'c': 2,'d': 3}
+    weights = graph.getFeature('weight')
+    assert [weights[node] for node in graph.getNodes()] == [0,4,2,3]
+    assert np.array_equal(weights.array(),[0,4,2,3])
+
+def test_links_follow_the_moved_node():
+    graph = labelledGraph()
+    graph.neighborSums(np.zeros(5)) #builds the cached arrays
+    graph.remove('b')
+    assert graph.getNeighbors('a') == set()
+    assert graph.getNeighbors('c') == set() #the directed link is gone
+    assert graph.getNeighbors('e') == {'d'}
+    states = np.arange(len(graph))
+    index = graph.nodeIndex()
+    expected = [sum(states[index[x]] for x in graph.getNeighbors(node))
+                for node in graph.getNodes()]
+    assert np.array_equal(graph.neighborSums(states),expected)
+    assert graph.edgeArray().tolist() == [[1,3]]
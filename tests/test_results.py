@@ -0,0 +1,50 @@
+"""
+Checks that Results written to a directory read back the same arrays,
+parameters and worksheet layouts.
+"""
+
+import os
+
+import numpy as np
+import pytest
+
+import Cayley.networks as cy
+
+def test_arrays_and_params_round_trip(tmp_path):
+    arrays = {'history': np.arange(12,dtype = np.int8).reshape(3,4),
+              'density': np.linspace(0,1,5)}
+    sheet = cy.Sheet("Data")
+    sheet.write(0,0,"Timestep")
+    sheet.table(1,0,'history',transpose = True)
+    path = str(tmp_path / "run")
+    cy.Results.save(path,arrays,{'alpha': np.float64(.5),'steps': range(3)},
+                    [sheet])
+    results = cy.Results(path,mmap_mode = None)
+    assert sorted(results) == ['density','history']
+    for name,array in arrays.items():
+        assert results[name].dtype == array.dtype
+        assert np.array_equal(results[name],array)
+    assert results.params == {'alpha': .5,'steps': [0,1,2]}
+    assert [loaded.spec() for loaded in results.sheets] == [sheet.spec()]
+    with pytest.raises(KeyError):
+        results['missing']
+
+def test_montecarlo_save_round_trip(tmp_path):
+    monte = cy.MonteCarlo(cy.CayleyTree(3,2),rng = 19)
+    monte.startEmpty()
+    monte.run(4,'NN')
+    results = monte.save(str(tmp_path / "run"),trial = 1)
+    assert np.array_equal(results['history'],monte.history())
+    assert np.allclose(results['density'],monte.history().mean(axis = 1))
+    assert np.array_equal(results['generations'],
+                          monte.generationalDensities())
+    assert results.params['trial'] == 1
+    assert results.params['network'] == "CayleyTree"
+
+def test_excel_from_saved_results(tmp_path):
+    pytest.importorskip('xlsxwriter')
+    monte = cy.MonteCarlo(cy.CayleyTree(3,2),rng = 19)
+    monte.startEmpty()
+    monte.run(2,'NN')
+    filename = cy.Results(monte.save(str(tmp_path / "run")).path).toExcel()
+    assert os.path.getsize(filename) > 0
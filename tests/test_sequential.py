@@ -0,0 +1,55 @@
+"""
+Checks the random sequential backend against the exact master equation on
+networks small enough to solve.
+"""
+
+import numpy as np
+import pytest
+
+import Cayley.networks as cy
+
+TRIALS = 1000
+STEPS = 3
+
+def voteTree():
+    """Returns a small tree with the features the voting rule reads."""
+    tree = cy.CayleyTree(2,3)
+    for node in tree.getNodes():
+        tree.add(node,beta = 2.0,phi = 1.5)
+    return tree
+
+def directedNetwork():
+    """Returns a small network with directed links, a node no one reads
+    and a node that reads no one."""
+    graph = cy.Graph()
+    for node in range(6):
+        graph.add(node,beta = 2.0,phi = 1.5)
+    for node,connection in ((0,1),(1,2),(2,0),(3,0),(4,3)):
+        graph.directedLink(node,connection)
+    graph.addEdge(1,4)
+    return graph
+
+@pytest.mark.parametrize('rule,params',[('NN',{'gamma': .2}),
+                                        ('TL',{'gamma': .1,'mu': .5}),
+                                        ('EI',{'gamma': .1}),
+                                        ('VOTE',{'alpha': .3,'gamma': .2})])
+def test_sequential_matches_master_equation(trialMeans,rule,params):
+    tree = voteTree() if rule == 'VOTE' else cy.CayleyTree(2,3)
+    exact,correlations = cy.MasterEquation(tree,rule,**params).solve(
+        np.zeros(len(tree)),STEPS,pairs = [(0,1)])
+    means,products = trialMeans(tree,lambda monte: monte.run(STEPS,rule),
+                                TRIALS,22,pairs = [(0,1)],
+                                backend = 'sequential',**params)
+    assert np.allclose(means.mean(axis = 1),exact.mean(axis = 1),atol = 0.02)
+    pair = correlations[:,0] + exact[:,0]*exact[:,1]
+    assert np.allclose(products[:,0],pair,atol = 0.04)
+
+@pytest.mark.parametrize('rule,params',[('NN',{'gamma': .2}),
+                                        ('VOTE',{'alpha': .3,'gamma': .2})])
+def test_sequential_follows_directed_links(trialMeans,rule,params):
+    graph = directedNetwork()
+    exact,_ = cy.MasterEquation(graph,rule,**params).solve(
+        np.zeros(len(graph)),STEPS)
+    means,_ = trialMeans(graph,lambda monte: monte.run(STEPS,rule),
+                         TRIALS,22,backend = 'sequential',**params)
+    assert np.allclose(means,exact,atol = 0.04)